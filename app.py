@@ -1,5 +1,7 @@
 import streamlit as st
 import pandas as pd
+from assets import assets_stale, build_assets, amcharts_script_tags
+from asset_server import start_asset_server
 
 # -----------------------------
 # Page Settings
@@ -68,6 +70,15 @@ st.markdown("""
 def load_data():
     return pd.read_excel("US&InternationStations-ClimateZones.xlsx")
 
+# Build and serve the self-hosted map assets once per process
+@st.cache_resource
+def start_static_assets():
+    if assets_stale():
+        build_assets()
+    return start_asset_server()
+
+start_static_assets()
+
 df = load_data()
 
 st.markdown("<br>", unsafe_allow_html=True)
@@ -222,10 +233,7 @@ def amcharts_world_map(df, lat_sel, lon_sel, location_name, climate_zone):
             }}
         </style>
 
-        <script src="https://cdn.amcharts.com/lib/5/index.js"></script>
-        <script src="https://cdn.amcharts.com/lib/5/map.js"></script>
-        <script src="https://cdn.amcharts.com/lib/5/geodata/worldLow.js"></script>
-        <script src="https://cdn.amcharts.com/lib/5/themes/Animated.js"></script>
+        {amcharts_script_tags("worldLow")}
     </head>
 
     <body>
@@ -0,0 +1,285 @@
+"""Minimal static file server for the fingerprinted build directory.
+
+Fingerprinted files are served with ``Cache-Control: immutable`` and a
+one-year max-age; the precompressed ``.br``/``.gz`` sibling is sent when the
+browser accepts it. Everything else is served with ``no-cache`` and an ETag
+so it is revalidated cheaply.
+
+The Streamlit apps start it in a background thread (``start_asset_server``)
+when ``CZF_ASSET_BASE_URL`` is set; it can also be run on its own. It binds
+``CZF_ASSET_HOST`` (loopback by default) and has no authentication, so a
+remote deployment exposes it through the reverse proxy that serves the app.
+``/_metrics`` returns the singleflight counters of the process serving it
+as JSON.
+
+Each encoding of a file has its own ETag (the hash of the bytes sent), so
+a cache never revalidates a gzip body against the brotli one.
+
+Generated reports are served from the report cache at
+``/reports/<key>.pdf?name=<file name>`` and streamed from disk in chunks
+as an attachment, so a download never holds the PDF in memory. The HTML
+NBC report is rendered per request at ``/reports/nbc.html?<query>`` (see
+html_report.py) with an ETag, and ``/reports/nbc.pdf?<query>`` builds its
+PDF into the report cache on first request.
+
+    python asset_server.py
+"""
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import shutil
+import threading
+import urllib.request
+from functools import lru_cache
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from assets import BUILD_DIR, ASSET_HOST, ASSET_PORT, ASSET_BASE_URL, set_asset_server_reachable
+from html_report import render_nbc_html_report, html_etag, parse_nbc_report_query, nbc_html_pdf_key
+from pdf_reports import compose_nbc_report
+from report_cache import ReportCache
+from singleflight import flight_stats
+
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+FINGERPRINT_RE = re.compile(r"\.[0-9a-f]{12}\.[A-Za-z0-9]+$")
+REPORT_PATH_RE = re.compile(r"^/reports/([0-9a-f]{64})\.pdf$")
+
+mimetypes.add_type("application/javascript", ".js")
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("image/avif", ".avif")
+
+_etag_cache = {}
+
+logger = logging.getLogger(__name__)
+
+
+def file_etag(path):
+    """Strong ETag from the file content, cached by (path, mtime, size)"""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    etag = _etag_cache.get(key)
+    if etag is None:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()[:20]}"'
+        _etag_cache[key] = etag
+    return etag
+
+
+def report_url(key, file_name):
+    """Browser URL that downloads the cached report key as file_name"""
+    return f"{ASSET_BASE_URL}/reports/{key}.pdf?name={quote(file_name)}"
+
+
+@lru_cache(maxsize=None)
+def report_cache():
+    """Report cache handle of the server, opened on the first download"""
+    return ReportCache()
+
+
+def resolve_path(root, url_path):
+    """Map a URL path onto a file inside root, or None if it escapes root"""
+    rel = unquote(url_path.split("?", 1)[0].split("#", 1)[0]).lstrip("/")
+    full = os.path.realpath(os.path.join(root, rel))
+    if not full.startswith(os.path.realpath(root) + os.sep) or not os.path.isfile(full):
+        return None
+    return full
+
+
+class AssetRequestHandler(SimpleHTTPRequestHandler):
+    """Serves BUILD_DIR with fingerprint-aware caching and precompressed variants"""
+
+    root = BUILD_DIR
+
+    def log_message(self, format, *args):
+        pass
+
+    def end_headers(self):
+        # Map payloads are fetched from srcdoc iframes, whose origin is "null"
+        self.send_header("Access-Control-Allow-Origin", "*")
+        super().end_headers()
+
+    def do_HEAD(self):
+        self.serve(send_body=False)
+
+    def do_GET(self):
+        route = self.path.split("?", 1)[0]
+        if route == "/_metrics":
+            self.serve_metrics()
+            return
+        if route == "/reports/nbc.html":
+            self.serve_html_report()
+            return
+        if route == "/reports/nbc.pdf":
+            self.serve_html_report_pdf()
+            return
+        if self.path.startswith("/reports/"):
+            self.serve_report()
+            return
+        self.serve(send_body=True)
+
+    def serve_html_report(self):
+        try:
+            args = parse_nbc_report_query(urlsplit(self.path).query)
+        except ValueError as exc:
+            self.send_error(400, str(exc))
+            return
+        except LookupError as exc:
+            # Only the dataset's stations have reports, so arbitrary queries build nothing
+            self.send_error(404, str(exc))
+            return
+        body = render_nbc_html_report(*args)
+        etag = html_etag(body)
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", REVALIDATE_CACHE)
+            self.end_headers()
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", REVALIDATE_CACHE)
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def serve_html_report_pdf(self):
+        try:
+            args = parse_nbc_report_query(urlsplit(self.path).query)
+        except ValueError as exc:
+            self.send_error(400, str(exc))
+            return
+        except LookupError as exc:
+            # Only the dataset's stations have reports, so arbitrary queries build nothing
+            self.send_error(404, str(exc))
+            return
+        # Built once per location into the report cache, then streamed like any report
+        path = report_cache().get_or_create_path(
+            nbc_html_pdf_key(*args), lambda f: compose_nbc_report(*args, output=f)
+        )
+        name = re.sub(r'[^\w\-. ]+', "_", f"Climate_Zone_Report_{args[0]}_{args[2]}.pdf")
+        self.send_report_file(path, name)
+
+    def serve_report(self):
+        url = urlsplit(self.path)
+        match = REPORT_PATH_RE.match(url.path)
+        # A download of a report already built, not a cache lookup, so it isn't counted as a hit
+        path = match and report_cache().get_path(match.group(1), count=False)
+        if not path:
+            self.send_error(404)
+            return
+        name = parse_qs(url.query).get("name", ["report.pdf"])[0]
+        self.send_report_file(path, re.sub(r'[^\w\-. ]+', "_", name) or "report.pdf")
+
+    def send_report_file(self, path, name):
+        """Stream a stored report as an attachment named name"""
+        # Opened before the headers, so an eviction in between cannot cut the body short
+        with open(path, "rb") as f:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+            self.send_header("Content-Disposition", f'attachment; filename="{name}"')
+            self.send_header("Cache-Control", "private, no-cache")
+            self.end_headers()
+            shutil.copyfileobj(f, self.wfile, 1 << 16)
+
+    def serve_metrics(self):
+        body = json.dumps({"pid": os.getpid(), "singleflight": flight_stats()}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def pick_variant(self, path):
+        """Return (file to send, Content-Encoding or None)"""
+        accepted = self.headers.get("Accept-Encoding", "")
+        accepted = {token.split(";")[0].strip() for token in accepted.split(",")}
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding in accepted and os.path.exists(path + suffix):
+                return path + suffix, encoding
+        return path, None
+
+    def serve(self, send_body):
+        path = resolve_path(self.root, self.path)
+        if path is None:
+            self.send_error(404)
+            return
+
+        body_path, encoding = self.pick_variant(path)
+        etag = file_etag(body_path)
+        cache_control = IMMUTABLE_CACHE if FINGERPRINT_RE.search(path) else REVALIDATE_CACHE
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", mimetypes.guess_type(path)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(os.path.getsize(body_path)))
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        if send_body:
+            with open(body_path, "rb") as f:
+                shutil.copyfileobj(f, self.wfile, 1 << 16)
+
+
+def probe_asset_server(host=ASSET_HOST, port=ASSET_PORT, timeout=1.0):
+    """True when an asset server answers /_metrics on host:port"""
+    if host in ("", "0.0.0.0"):
+        host = "127.0.0.1"
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/_metrics", timeout=timeout) as resp:
+            return "singleflight" in json.load(resp)
+    except (OSError, ValueError):
+        return False
+
+
+def start_asset_server(host=ASSET_HOST, port=ASSET_PORT):
+    """Serve the build directory from a daemon thread.
+
+    Returns None when CZF_ASSET_BASE_URL is not set or the port is taken.
+    A taken port is expected when another app worker on this host started
+    the server first, which answers the probe; otherwise the failure is
+    logged, and the apps inline their assets or load them from the CDN.
+    """
+    if not ASSET_BASE_URL:
+        logger.info("CZF_ASSET_BASE_URL is not set, not starting the asset server")
+        return None
+    try:
+        server = ThreadingHTTPServer((host, port), AssetRequestHandler)
+    except OSError as exc:
+        running = probe_asset_server(host, port)
+        if not running:
+            logger.warning("Asset server could not bind %s:%s (%s); serving assets inline", host, port, exc)
+        set_asset_server_reachable(running)
+        return None
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="asset-server", daemon=True)
+    thread.start()
+    set_asset_server_reachable(True)
+    return server
+
+
+if __name__ == "__main__":
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    print(f"Serving {BUILD_DIR} on {ASSET_HOST}:{ASSET_PORT}")
+    ThreadingHTTPServer((ASSET_HOST, ASSET_PORT), AssetRequestHandler).serve_forever()
@@ -0,0 +1,302 @@
+"""Self-hosted, fingerprinted static assets for the map components.
+
+The amCharts library and geodata bundles are vendored once (``fetch``) and
+then built (``build``) into content-hashed files with precompressed gzip and
+brotli variants. Generated content such as the station payloads is added to
+the same directory at runtime through ``publish_asset``, or inlined as a
+data URI when the server is not reachable. ``asset_server.py`` serves the
+build directory with long-lived immutable cache headers, so browsers
+download each bundle once.
+
+    python assets.py fetch    # on a machine with network access
+    python assets.py build    # fingerprint + precompress into static/build
+
+Browser URLs point at the asset server only when ``CZF_ASSET_BASE_URL`` is
+set and the server answers (see ``asset_server_reachable``). Otherwise, or
+when an asset has not been built, the helpers fall back to the public CDN
+URL or inline data, so a development checkout or a deployment without the
+server keeps working.
+
+The images in images/ (the logo and the strategy images) are fingerprinted
+into the same manifest by ``build_static_images``. ``static_asset_uri``
+returns a small file inline as a data URI and a larger one as its hashed
+URL. The data URI, hash and URL of each file are computed once per process
+and recomputed only when the file's mtime or size changes, so an app rerun
+does not read or encode any image.
+
+Environment:
+    CZF_ASSET_BASE_URL  URL the browser uses to reach the asset server, e.g.
+                        "/assets" behind a reverse proxy or
+                        "http://localhost:8765" on a single machine; the
+                        server is not started when it is unset
+    CZF_ASSET_HOST      address the server binds (default 127.0.0.1)
+    CZF_ASSET_PORT      port of the asset server (default 8765)
+"""
+import base64
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+import threading
+import urllib.request
+from urllib.parse import quote
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+VENDOR_DIR = os.path.join(STATIC_DIR, "vendor")
+BUILD_DIR = os.path.join(STATIC_DIR, "build")
+MANIFEST_PATH = os.path.join(BUILD_DIR, "manifest.json")
+
+ASSET_HOST = os.environ.get("CZF_ASSET_HOST", "127.0.0.1")
+ASSET_PORT = int(os.environ.get("CZF_ASSET_PORT", "8765"))
+ASSET_BASE_URL = os.environ.get("CZF_ASSET_BASE_URL", "").rstrip("/")
+
+CDN_BASE_URL = "https://cdn.amcharts.com/lib/5"
+
+# Logical asset name -> path under the amCharts CDN and the vendor directory
+AMCHARTS_BUNDLES = {
+    "amcharts/index.js": "index.js",
+    "amcharts/map.js": "map.js",
+    "amcharts/geodata/worldLow.js": "geodata/worldLow.js",
+    "amcharts/geodata/indiaLow.js": "geodata/indiaLow.js",
+    "amcharts/themes/Animated.js": "themes/Animated.js",
+}
+
+# Files at or above this size get precompressed variants
+COMPRESS_MIN_BYTES = 1024
+
+# Formats that are already compressed and gain nothing from gzip/brotli
+COMPRESSED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif")
+
+# Static source images, and the size up to which they are inlined as data URIs
+STATIC_IMAGES_DIR = "images"
+STATIC_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp")
+INLINE_MAX_BYTES = 16 * 1024
+
+_manifest_cache = {"mtime": None, "data": {}}
+_manifest_lock = threading.Lock()
+_static_assets = {}
+
+# Set by asset_server.start_asset_server once the server answers in this process
+_asset_server = {"reachable": False}
+
+
+def set_asset_server_reachable(reachable):
+    _asset_server["reachable"] = bool(reachable)
+
+
+def asset_server_reachable():
+    """True when browser URLs may point at the asset server: a base URL is configured and the server answers"""
+    return bool(ASSET_BASE_URL) and _asset_server["reachable"]
+
+
+def content_hash(data, length=12):
+    """Short sha256 hex digest used in fingerprinted file names"""
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def fingerprinted_name(name, digest):
+    """'amcharts/index.js' + digest -> 'amcharts/index.<digest>.js'"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{digest}{ext}"
+
+
+def write_atomic(path, data):
+    """Write data to path through a temp file unique to this process and thread"""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_precompressed(path, data):
+    """Write path plus .gz (and .br when brotli is installed) variants"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_atomic(path, data)
+    if len(data) < COMPRESS_MIN_BYTES or path.lower().endswith(COMPRESSED_EXTENSIONS):
+        return
+    write_atomic(path + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        write_atomic(path + ".br", brotli.compress(data, quality=11))
+
+
+def fetch_vendor(force=False):
+    """Download the amCharts bundles into the vendor directory"""
+    for name, cdn_path in AMCHARTS_BUNDLES.items():
+        target = os.path.join(VENDOR_DIR, name)
+        if os.path.exists(target) and not force:
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with urllib.request.urlopen(f"{CDN_BASE_URL}/{cdn_path}", timeout=60) as resp:
+            data = resp.read()
+        with open(target, "wb") as f:
+            f.write(data)
+        print(f"fetched {name} ({len(data):,} bytes)")
+
+
+def load_manifest():
+    """Logical name -> fingerprinted file name, reloaded when the manifest changes"""
+    try:
+        mtime = os.path.getmtime(MANIFEST_PATH)
+    except OSError:
+        return {}
+    if _manifest_cache["mtime"] != mtime:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            _manifest_cache["data"] = json.load(f)
+        _manifest_cache["mtime"] = mtime
+    return _manifest_cache["data"]
+
+
+def update_manifest(entries):
+    """Merge entries into the manifest on disk; serialized between the threads of a process"""
+    with _manifest_lock:
+        manifest = dict(load_manifest())
+        manifest.update(entries)
+        os.makedirs(BUILD_DIR, exist_ok=True)
+        write_atomic(MANIFEST_PATH, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+        # Cached here too, so a rewrite within the mtime resolution is not missed
+        _manifest_cache.update(mtime=os.path.getmtime(MANIFEST_PATH), data=manifest)
+        return manifest
+
+
+def build_assets():
+    """Fingerprint and precompress every vendored file into the build directory"""
+    entries = {}
+    for name in AMCHARTS_BUNDLES:
+        source = os.path.join(VENDOR_DIR, name)
+        if not os.path.exists(source):
+            continue
+        with open(source, "rb") as f:
+            data = f.read()
+        hashed = fingerprinted_name(name, content_hash(data))
+        target = os.path.join(BUILD_DIR, hashed)
+        if not os.path.exists(target):
+            write_precompressed(target, data)
+        entries[name] = hashed
+    if entries:
+        update_manifest(entries)
+    return entries
+
+
+def data_uri(name, data):
+    """data: URI of content, typed from its (logical) file name"""
+    mime = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def publish_asset(name, data):
+    """Write generated content under a content-hashed name and return its URL.
+
+    Without a reachable asset server nothing is written and the content is
+    returned inline as a data URI, which the page can use in the same places.
+    """
+    if not asset_server_reachable():
+        return data_uri(name, data)
+    hashed = fingerprinted_name(name, content_hash(data))
+    target = os.path.join(BUILD_DIR, hashed)
+    if not os.path.exists(target):
+        write_precompressed(target, data)
+    if load_manifest().get(name) != hashed:
+        update_manifest({name: hashed})
+    return f"{ASSET_BASE_URL}/{hashed}"
+
+
+def static_asset(path):
+    """Fingerprinted name, hash and data URI of a static file, recomputed when its mtime or size changes"""
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    entry = _static_assets.get(path)
+    if entry is None or entry["stamp"] != stamp:
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = content_hash(data)
+        entry = _static_assets[path] = {
+            "stamp": stamp,
+            "name": path.replace(os.sep, "/"),
+            "file": fingerprinted_name(path.replace(os.sep, "/"), digest),
+            "hash": digest,
+            "bytes": len(data),
+            "data_uri": data_uri(path, data),
+        }
+    return entry
+
+
+def build_static_images(paths=None):
+    """Fingerprint the static images into the build directory and the manifest"""
+    if paths is None:
+        paths = sorted(
+            os.path.join(STATIC_IMAGES_DIR, name) for name in os.listdir(STATIC_IMAGES_DIR)
+            if name.lower().endswith(STATIC_IMAGE_EXTENSIONS)
+        )
+    entries = {}
+    for path in paths:
+        entry = static_asset(path)
+        target = os.path.join(BUILD_DIR, entry["file"])
+        if not os.path.exists(target):
+            with open(path, "rb") as f:
+                write_precompressed(target, f.read())
+        entries[entry["name"]] = entry["file"]
+    manifest = load_manifest()
+    if any(manifest.get(name) != hashed for name, hashed in entries.items()):
+        update_manifest(entries)
+    return entries
+
+
+def static_asset_uri(path):
+    """Browser URL of a static file: its fingerprinted URL when large and served, else a data URI"""
+    entry = static_asset(path)
+    if (entry["bytes"] > INLINE_MAX_BYTES and asset_server_reachable()
+            and load_manifest().get(entry["name"]) == entry["file"]):
+        return f"{ASSET_BASE_URL}/{quote(entry['file'])}"
+    return entry["data_uri"]
+
+
+def assets_stale():
+    """True when a vendored file is missing from, or newer than, the manifest"""
+    manifest = load_manifest()
+    manifest_mtime = os.path.getmtime(MANIFEST_PATH) if manifest else 0
+    for name in AMCHARTS_BUNDLES:
+        source = os.path.join(VENDOR_DIR, name)
+        if os.path.exists(source) and (name not in manifest or os.path.getmtime(source) > manifest_mtime):
+            return True
+    return False
+
+
+def asset_url(name):
+    """Browser URL for a logical asset, falling back to the CDN when not built or not served"""
+    hashed = load_manifest().get(name) if asset_server_reachable() else None
+    if hashed:
+        return f"{ASSET_BASE_URL}/{hashed}"
+    if name in AMCHARTS_BUNDLES:
+        return f"{CDN_BASE_URL}/{AMCHARTS_BUNDLES[name]}"
+    raise KeyError(f"Unknown asset: {name}")
+
+
+def amcharts_script_tags(geodata):
+    """<script> tags for the amCharts core, map, theme and the given geodata (e.g. "worldLow")"""
+    names = [
+        "amcharts/index.js",
+        "amcharts/map.js",
+        f"amcharts/geodata/{geodata}.js",
+        "amcharts/themes/Animated.js",
+    ]
+    return "\n    ".join(f'<script src="{asset_url(n)}"></script>' for n in names)
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if command == "fetch":
+        fetch_vendor(force="--force" in sys.argv)
+        command = "build"
+    if command == "build":
+        for name, hashed in {**build_assets(), **build_static_images()}.items():
+            print(f"{name} -> {hashed}")
+    else:
+        sys.exit(f"usage: python {sys.argv[0]} [fetch [--force] | build]")
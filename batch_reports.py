@@ -0,0 +1,182 @@
+"""Batch generation of NBC climate zone reports into a ZIP archive.
+
+Reports are rendered across a process pool and written into the archive
+as they complete, with at most a few reports per worker in flight, so
+memory stays flat however many locations are requested. Every report goes
+through the shared report cache, so locations already downloaded in the
+app (or in an earlier batch) are copied rather than rendered.
+
+    python batch_reports.py --state Delhi -o delhi.zip
+    python batch_reports.py --locations portfolio.csv -o portfolio.zip
+    python batch_reports.py -o - > all.zip            # every station, to stdout
+    python batch_reports.py --locations portfolio.csv --portfolio -o portfolio.pdf
+
+A locations file is a CSV with State and Location columns. With
+--portfolio, the selection goes into one comparative PDF instead, with a
+row per station and one strategy section per distinct zone.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import pandas as pd
+
+from climate_data import CLIMATE_ZONE_DATA
+from map_snapshot import render_basemap, snapshot_png
+from pdf_reports import compose_nbc_report, compose_portfolio_report, nbc_report_key
+from report_cache import ReportCache
+from zone_catalog import normalize_zones, build_nbc_catalog, dataset_version
+
+
+NBC_DATA_PATH = "INDIA-WeatherMapping.xlsx"
+
+# Reports queued per worker; bounds how many finished PDFs wait in memory
+IN_FLIGHT_PER_WORKER = 2
+
+
+def load_stations(states=None, locations_file=None):
+    """NBC stations to report on, plus the dataset version used in cache keys"""
+    df = normalize_zones(pd.read_excel(NBC_DATA_PATH))
+    version = dataset_version(df)
+    if locations_file:
+        wanted = pd.read_csv(locations_file)[["State", "Location"]].astype(str)
+        df = df.merge(wanted.apply(lambda col: col.str.strip()), on=["State", "Location"])
+    if states:
+        df = df[df["State"].isin(states)]
+    df = df.dropna(subset=["Latitude", "Longitude"])
+    df = df[df["Climate Zone"].isin(CLIMATE_ZONE_DATA)]
+    return df.drop_duplicates(subset=["State", "Location"]), version
+
+
+_worker = {}
+
+
+def _init_worker(version):
+    """Per-process basemap and cache handle, set up once per worker"""
+    df = normalize_zones(pd.read_excel(NBC_DATA_PATH))
+    _worker["basemap"] = render_basemap("nbc", df, build_nbc_catalog(df))
+    _worker["cache"] = ReportCache()
+    _worker["version"] = version
+
+
+def _render(station):
+    """(archive name, PDF bytes, cache hit) for one station, run in a worker"""
+    location, state, zone, lat, lon = station
+    key = nbc_report_key(location, state, zone, _worker["version"], lat, lon)
+    cache = _worker["cache"]
+    pdf = cache.get(key)
+    hit = pdf is not None
+    if not hit:
+        def build():
+            map_png = snapshot_png("nbc", _worker["basemap"], lat, lon, location, "report")
+            return compose_nbc_report(location, state, zone, lat, lon, map_png)
+        # Shares the build when the app is rendering the same report right now
+        pdf = cache.create(key, build)
+    return archive_name(state, location, zone), pdf, hit
+
+
+def archive_name(state, location, zone):
+    """Path of a report inside the ZIP: <state>/<location>_<zone>.pdf"""
+    return f"{_safe_name(state)}/{_safe_name(location)}_{_safe_name(zone)}.pdf"
+
+
+def _safe_name(text):
+    return re.sub(r"[^\w\-.]+", "_", str(text)).strip("_")
+
+
+def generate_batch(stations, version, output, workers=None, progress=None):
+    """Render reports for stations (rows with Location, State, Climate Zone,
+    Latitude, Longitude) into a ZIP at output (path or binary file object).
+
+    progress, if given, is called with the running stats after each report.
+    Returns the final stats.
+    """
+    jobs = [
+        (r["Location"], r["State"], r["Climate Zone"], float(r["Latitude"]), float(r["Longitude"]))
+        for r in stations.to_dict("records")
+    ]
+    workers = workers or os.cpu_count() or 1
+    stats = {"total": len(jobs), "done": 0, "cache_hits": 0, "bytes": 0, "seconds": 0.0}
+    start = time.perf_counter()
+
+    # PDFs are already compressed, so they are stored as-is
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as archive, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(version,)) as pool:
+        pending = set()
+        queue = iter(jobs)
+        while True:
+            # Keep a bounded window of reports in flight
+            for job in queue:
+                pending.add(pool.submit(_render, job))
+                if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, pdf, hit = future.result()
+                archive.writestr(name, pdf)
+                stats["done"] += 1
+                stats["cache_hits"] += hit
+                stats["bytes"] += len(pdf)
+                stats["seconds"] = time.perf_counter() - start
+                if progress:
+                    progress(stats)
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def portfolio_sites(stations):
+    """Portfolio report rows of the selected stations"""
+    for r in stations.to_dict("records"):
+        epw = r.get("EPW File")
+        yield {
+            "location": r["Location"],
+            "region": r["State"],
+            "country": "India",
+            "zone": r["Climate Zone"],
+            "latitude": float(r["Latitude"]),
+            "longitude": float(r["Longitude"]),
+            "epw": bool(pd.notna(epw) and str(epw).strip() not in ("", "0")),
+        }
+
+
+def print_progress(stats):
+    rate = stats["done"] / stats["seconds"] if stats["seconds"] else 0.0
+    sys.stderr.write(
+        f"\r[{stats['done']}/{stats['total']}] {rate:.1f} reports/s, "
+        f"{stats['bytes'] / 1e6:.1f} MB, {stats['cache_hits']} from cache"
+    )
+    if stats["done"] == stats["total"]:
+        sys.stderr.write("\n")
+    sys.stderr.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate NBC climate zone reports into a ZIP archive")
+    parser.add_argument("--state", action="append", help="only stations in this state (repeatable)")
+    parser.add_argument("--locations", help="CSV file with State and Location columns")
+    parser.add_argument("--portfolio", action="store_true", help="one comparative PDF instead of a ZIP")
+    parser.add_argument("-o", "--output", help='ZIP/PDF path (reports.zip / portfolio.pdf), or "-" for stdout')
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    stations, version = load_stations(args.state, args.locations)
+    if stations.empty:
+        sys.exit("no stations with coordinates and strategy data match the selection")
+    output = args.output or ("portfolio.pdf" if args.portfolio else "reports.zip")
+    output = sys.stdout.buffer if output == "-" else output
+    if args.portfolio:
+        start = time.perf_counter()
+        compose_portfolio_report(portfolio_sites(stations), "nbc", output=output)
+        sys.stderr.write(f"portfolio of {len(stations)} stations in {time.perf_counter() - start:.1f}s\n")
+        sys.exit()
+    stats = generate_batch(stations, version, output, args.workers, print_progress)
+    sys.stderr.write(
+        f"{stats['done']} reports in {stats['seconds']:.1f}s "
+        f"({stats['done'] / stats['seconds']:.1f}/s, {stats['cache_hits']} from cache)\n"
+    )
@@ -0,0 +1,55 @@
+"""Per-request ASHRAE report latency across a sample of the global stations.
+
+Zone strategy sections are rendered once up front (as the app does on its
+first report per zone family); each request then lays out only the
+station's cover, optionally with its map snapshot. Prints median and p95
+against a single layout pass. Run from the repository root:
+
+    python -m benchmarks.ashrae_reports [sample size]
+"""
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+from map_snapshot import render_basemap, snapshot_png
+from pdf_reports import generate_ashrae_pdf_report, compose_ashrae_report, ashrae_zone_section, _ashrae_strategy_section
+from zone_catalog import normalize_zones, build_ashrae_catalog
+
+from benchmarks.report_composition import percentile, timed
+
+
+def report_args(row):
+    state = row.get("State/Province")
+    epw = row.get("EPW File")
+    return (
+        row["Location"], "" if pd.isna(state) else str(state), row["Country"], row["Climate Zone"],
+        row["Climate Zone Name"], float(row["Latitude"]), float(row["Longitude"]),
+        bool(pd.notna(epw) and str(epw).strip() not in ("", "0")),
+    )
+
+
+if __name__ == "__main__":
+    sample = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    df = normalize_zones(pd.read_excel("ASHRAE-ClimateZoneMapping.xlsx")).dropna(subset=["Latitude", "Longitude"])
+    rows = [report_args(r) for r in df.sample(min(sample, len(df)), random_state=0).to_dict("records")]
+
+    start = time.perf_counter()
+    for name in df["Climate Zone Name"].dropna().unique():
+        ashrae_zone_section(name)
+    print(f"pre-rendered {_ashrae_strategy_section.cache_info().currsize} zone sections for "
+          f"{df['Climate Zone Name'].nunique()} zone names in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    basemap = render_basemap("ashrae", df, build_ashrae_catalog(df))
+    print(f"basemap rendered in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    single = timed(lambda a: generate_ashrae_pdf_report(*a), rows)
+    composed = timed(lambda a: compose_ashrae_report(*a), rows)
+    with_map = timed(lambda a: compose_ashrae_report(*a, snapshot_png("ashrae", basemap, a[5], a[6], a[0], "report")), rows)
+
+    print(f"{len(rows)} of {len(df):,} stations")
+    for label, times in (("single pass", single), ("composed", composed), ("with map", with_map)):
+        print(f"  {label:<12} median {statistics.median(times):7.1f} ms   p95 {percentile(times, 0.95):7.1f} ms")
+    print(f"  all stations at the with-map p95: {percentile(with_map, 0.95) * len(df) / 1000:.0f} s single-threaded")
@@ -0,0 +1,47 @@
+"""NBC report latency and size: HTML page vs composed and single-pass PDF.
+
+Zone fragments and zone PDF sections are rendered once up front, as a
+running app has them after its first report per zone. Page sizes exclude
+the images, which the browser fetches (and caches) separately. Run from
+the repository root:
+
+    python -m benchmarks.html_report [sample size]
+"""
+import statistics
+import sys
+
+import pandas as pd
+
+from climate_data import CLIMATE_ZONE_DATA
+from html_report import render_nbc_html_report, nbc_zone_fragment
+from pdf_reports import generate_nbc_pdf_report, compose_nbc_report, nbc_zone_section
+from zone_catalog import normalize_zones
+
+from benchmarks.report_composition import percentile, timed
+
+
+if __name__ == "__main__":
+    sample = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    df = normalize_zones(pd.read_excel("INDIA-WeatherMapping.xlsx")).dropna(subset=["Latitude", "Longitude"])
+    df = df[df["Climate Zone"].isin(CLIMATE_ZONE_DATA)]
+    rows = [
+        (r["Location"], r["State"], r["Climate Zone"], float(r["Latitude"]), float(r["Longitude"]))
+        for r in df.sample(min(sample, len(df)), random_state=0).to_dict("records")
+    ]
+    for zone in CLIMATE_ZONE_DATA:
+        nbc_zone_fragment(zone)
+        nbc_zone_section(zone)
+
+    sizes = {}
+    cases = {
+        "HTML": lambda a: sizes.setdefault("HTML", []).append(len(render_nbc_html_report(*a).encode("utf-8"))),
+        "PDF composed": lambda a: sizes.setdefault("PDF composed", []).append(len(compose_nbc_report(*a))),
+        "PDF single pass": lambda a: sizes.setdefault("PDF single pass", []).append(
+            len(generate_nbc_pdf_report(*a, CLIMATE_ZONE_DATA[a[2]]).getvalue())
+        ),
+    }
+    print(f"{len(rows)} NBC stations")
+    for label, build in cases.items():
+        times = timed(build, rows)
+        print(f"  {label:<16} median {statistics.median(times):8.2f} ms   p95 {percentile(times, 0.95):8.2f} ms   "
+              f"{statistics.median(sizes[label]) / 1024:7.1f} KB")
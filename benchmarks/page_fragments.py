@@ -0,0 +1,80 @@
+"""Per-interaction latency of globe.py: fragment reruns vs a full page rerun.
+
+Drives the app with AppTest through the common interactions (location and
+state changes, the map toggles, Generate Report). Each interaction now
+reruns only the fragments that depend on the changed widget; before, every
+interaction re-executed the whole script, which is what a full rerun of
+the same state costs. Caches are warmed by a first pass. Run from the
+repository root:
+
+    python -m benchmarks.page_fragments [rounds]
+"""
+import os
+import statistics
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+
+APP = os.path.abspath("globe.py")
+
+
+def timed_run(action):
+    start = time.perf_counter()
+    action()
+    return (time.perf_counter() - start) * 1000
+
+
+def cycle(at, key):
+    """Action selecting the next option of a selectbox"""
+    def action():
+        widget = at.selectbox(key=key)
+        options = widget.options
+        widget.set_value(options[(options.index(widget.value) + 1) % len(options)]).run()
+    return action
+
+
+def flip(at, key):
+    def action():
+        widget = at.toggle(key=key)
+        widget.set_value(not widget.value).run()
+    return action
+
+
+def interactions(at, standard):
+    """(label, action) pairs for one standard; the app tree is refreshed with a full run between them"""
+    at.run()
+    if at.selectbox(key="standard").value != standard:
+        at.selectbox(key="standard").set_value(standard).run()
+    if standard == "NBC":
+        yield "NBC location", cycle(at, "nbc_location")
+        yield "NBC state", cycle(at, "state")
+    else:
+        yield "ASHRAE location", cycle(at, "location")
+        yield "ASHRAE country", cycle(at, "country")
+        yield "zone regions toggle", flip(at, "zone_regions")
+    yield "lite map toggle", flip(at, "lite_map")
+    yield "Generate Report", lambda: next(b for b in at.button if b.label == "Generate Report").click().run()
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    at = AppTest.from_file(APP, default_timeout=120).run()
+    results = {}
+    for round_ in range(rounds + 1):
+        for standard in ("ASHRAE-169 (2013)", "NBC"):
+            for label, action in interactions(at, standard):
+                scoped = timed_run(action)
+                full = timed_run(at.run)
+                if at.exception:
+                    sys.exit(f"{label}: {at.exception[0].message}")
+                if round_:
+                    results.setdefault(label, ([], []))
+                    results[label][0].append(full)
+                    results[label][1].append(scoped)
+    print(f"median of {rounds} rounds, ms")
+    print(f"  {'interaction':<20} {'full rerun':>11} {'fragments':>10}")
+    for label, (full, scoped) in results.items():
+        print(f"  {label:<20} {statistics.median(full):11.1f} {statistics.median(scoped):10.1f}"
+              f"   {statistics.median(full) / statistics.median(scoped):4.1f}x")
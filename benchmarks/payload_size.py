@@ -0,0 +1,77 @@
+"""Byte size of the map station payload: legacy per-row JSON vs the binary codec.
+
+Run from the repository root:
+
+    python -m benchmarks.payload_size
+"""
+import base64
+import gzip
+import json
+import time
+
+import pandas as pd
+
+from station_codec import encode_stations, decode_stations
+
+
+PALETTE = [
+    "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+    "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf",
+    "#005f99", "#cc5500", "#009933", "#990000", "#663399",
+    "#00b3b3", "#b30047", "#ff66b2", "#66ff66", "#ffd966"
+]
+
+
+def legacy_json(df, group_column, group_key, zone_color_map, zone_name_map):
+    """Per-row JSON exactly as the map components used to inline it"""
+    rows = []
+    for _, row in df.iterrows():
+        rec = {
+            "lat": float(row["Latitude"]),
+            "lon": float(row["Longitude"]),
+            "title": row["Location"],
+            group_key: row[group_column],
+            "zone": row["Climate Zone"],
+        }
+        if zone_name_map:
+            rec["zone_name"] = zone_name_map[row["Climate Zone"]]
+        rec["color"] = zone_color_map.get(row["Climate Zone"], "#444444")
+        rows.append(rec)
+    return json.dumps(rows).encode("utf-8")
+
+
+def measure(label, df, group_column, group_key, with_names):
+    df = df.dropna(subset=["Latitude", "Longitude"]).copy()
+    df["Climate Zone"] = df["Climate Zone"].astype(str).str.strip()
+    zone_list = sorted(df["Climate Zone"].unique())
+    zone_color_map = {z: PALETTE[i % len(PALETTE)] for i, z in enumerate(zone_list)}
+    zone_name_map = (
+        df.drop_duplicates("Climate Zone").set_index("Climate Zone")["Climate Zone Name"].to_dict()
+        if with_names else None
+    )
+
+    t0 = time.perf_counter()
+    js = legacy_json(df, group_column, group_key, zone_color_map, zone_name_map)
+    t_json = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    binary = encode_stations(df, group_column, zone_list, zone_color_map, zone_name_map)
+    t_bin = time.perf_counter() - t0
+
+    decoded = decode_stations(binary)
+    assert len(decoded) == len(df)
+    assert decoded["Location"].tolist() == df["Location"].astype(str).tolist()
+    assert (decoded["Latitude"] - df["Latitude"].values).abs().max() < 1e-5
+
+    b64 = base64.b64encode(binary)
+    print(f"{label} ({len(df)} stations)")
+    print(f"  {'format':<22}{'bytes':>12}{'gzip':>12}{'vs JSON':>10}")
+    for name, data in [("legacy JSON", js), ("binary", binary), ("binary as base64", b64)]:
+        print(f"  {name:<22}{len(data):>12,}{len(gzip.compress(data)):>12,}{len(data) / len(js):>10.1%}")
+    print(f"  encode time: JSON {t_json * 1000:.1f} ms, binary {t_bin * 1000:.1f} ms")
+    print()
+
+
+if __name__ == "__main__":
+    measure("ASHRAE world", pd.read_excel("ASHRAE-ClimateZoneMapping.xlsx"), "Country", "country", True)
+    measure("NBC India", pd.read_excel("INDIA-WeatherMapping.xlsx"), "State", "state", False)
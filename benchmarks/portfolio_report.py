@@ -0,0 +1,69 @@
+"""Portfolio report build time and peak memory as the site count grows.
+
+Compares the incremental assembly (table chunks appended one at a time,
+one strategy section per distinct zone) with laying out the whole
+portfolio in a single pass. Sites are drawn from the NBC stations, with
+repeats beyond the 729 available. Run from the repository root:
+
+    python -m benchmarks.portfolio_report [site counts...]
+"""
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from batch_reports import portfolio_sites
+from climate_data import CLIMATE_ZONE_DATA
+from pdf_reports import (
+    compose_portfolio_report, portfolio_summary_story, portfolio_table, nbc_strategy_story, footer_story,
+    render_story, report_styles, _portfolio_row, NBC_STANDARD,
+)
+from reportlab.platypus import Paragraph, PageBreak
+from zone_catalog import normalize_zones
+
+
+def single_pass(sites):
+    """The whole portfolio as one story: one long table, then every zone's strategies"""
+    sites = list(sites)
+    zones = {}
+    for site in sites:
+        z = zones.setdefault(site["zone"], {"sites": 0, "epw": 0, "section": site["zone"]})
+        z["sites"] += 1
+        z["epw"] += site["epw"]
+    story = portfolio_summary_story("Climate Portfolio", "nbc", zones, len(sites), sum(z["epw"] for z in zones.values()))
+    story += [PageBreak(), portfolio_table([_portfolio_row(i + 1, s, "nbc") for i, s in enumerate(sites)], "nbc")]
+    for zone in zones:
+        story += [PageBreak(), Paragraph(f"Climate Zone: {zone}", report_styles()["title"])]
+        story += nbc_strategy_story(CLIMATE_ZONE_DATA[zone])
+    story += [PageBreak()] + footer_story(NBC_STANDARD)
+    return render_story(story)
+
+
+def measure(build, sites):
+    tracemalloc.start()
+    start = time.perf_counter()
+    pdf = build(sites)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, len(pdf)
+
+
+if __name__ == "__main__":
+    counts = [int(n) for n in sys.argv[1:]] or [50, 200, 800, 2000]
+    df = normalize_zones(pd.read_excel("INDIA-WeatherMapping.xlsx")).dropna(subset=["Latitude", "Longitude"])
+    df = df[df["Climate Zone"].isin(CLIMATE_ZONE_DATA)]
+
+    # Warm the zone sections and image readers so both sides start equal
+    compose_portfolio_report(portfolio_sites(df))
+    single_pass(portfolio_sites(df))
+
+    print(f"{'sites':>6}  {'incremental':>22}  {'single pass':>22}")
+    for count in counts:
+        stations = pd.concat([df] * (count // len(df) + 1)).head(count)
+        inc = measure(lambda s: compose_portfolio_report(s), portfolio_sites(stations))
+        one = measure(single_pass, portfolio_sites(stations))
+        print(f"{count:>6}  " + "  ".join(
+            f"{s:6.2f}s {peak / 1e6:6.1f} MB peak" for s, peak, _ in (inc, one)
+        ))
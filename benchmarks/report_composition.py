@@ -0,0 +1,54 @@
+"""Per-request NBC report cost: single layout pass vs composed sections.
+
+Builds the report for a sample of stations both ways and prints median
+and p95 latency. Run from the repository root:
+
+    python -m benchmarks.report_composition [sample size]
+"""
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+from climate_data import CLIMATE_ZONE_DATA
+from pdf_reports import generate_nbc_pdf_report, compose_nbc_report, nbc_zone_section
+from zone_catalog import normalize_zones
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def timed(build, rows):
+    times = []
+    for row in rows:
+        start = time.perf_counter()
+        build(row)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+if __name__ == "__main__":
+    sample = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    df = normalize_zones(pd.read_excel("INDIA-WeatherMapping.xlsx")).dropna(subset=["Latitude", "Longitude"])
+    df = df[df["Climate Zone"].isin(CLIMATE_ZONE_DATA)]
+    rows = df.sample(min(sample, len(df)), random_state=0).to_dict("records")
+
+    start = time.perf_counter()
+    for zone in CLIMATE_ZONE_DATA:
+        nbc_zone_section(zone)
+    print(f"pre-rendered {len(CLIMATE_ZONE_DATA)} zone sections in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    single = timed(lambda r: generate_nbc_pdf_report(
+        r["Location"], r["State"], r["Climate Zone"], r["Latitude"], r["Longitude"],
+        CLIMATE_ZONE_DATA[r["Climate Zone"]]
+    ), rows)
+    composed = timed(lambda r: compose_nbc_report(
+        r["Location"], r["State"], r["Climate Zone"], r["Latitude"], r["Longitude"]
+    ), rows)
+
+    print(f"{len(rows)} locations")
+    for label, times in (("single pass", single), ("composed", composed)):
+        print(f"  {label:<12} median {statistics.median(times):7.1f} ms   p95 {percentile(times, 0.95):7.1f} ms")
@@ -0,0 +1,54 @@
+"""Peak Python memory of building a report into memory vs into the report store.
+
+"buffered" is the old delivery path: the PDF is built in an io.BytesIO and
+copied out with getvalue() for st.download_button. "streamed" writes it
+straight into the report cache file the asset server streams from. Run
+from the repository root:
+
+    python -m benchmarks.report_delivery [portfolio site count]
+"""
+import sys
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+from batch_reports import portfolio_sites
+from climate_data import CLIMATE_ZONE_DATA
+from pdf_reports import compose_nbc_report, compose_portfolio_report, nbc_zone_section
+from report_cache import ReportCache
+from zone_catalog import normalize_zones
+
+
+def peak(build):
+    tracemalloc.start()
+    build()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 729
+    df = normalize_zones(pd.read_excel("INDIA-WeatherMapping.xlsx")).dropna(subset=["Latitude", "Longitude"])
+    df = df[df["Climate Zone"].isin(CLIMATE_ZONE_DATA)].head(count)
+    cache = ReportCache(tempfile.mkdtemp())
+    for zone in CLIMATE_ZONE_DATA:
+        nbc_zone_section(zone)
+
+    cases = {
+        "station report": (
+            lambda: bytearray(compose_nbc_report("New Delhi", "Delhi", "Composite", 28.6, 77.2)),
+            lambda key: cache.create_path(key, lambda f: compose_nbc_report(
+                "New Delhi", "Delhi", "Composite", 28.6, 77.2, output=f)),
+        ),
+        f"portfolio ({len(df)} sites)": (
+            lambda: bytearray(compose_portfolio_report(portfolio_sites(df))),
+            lambda key: cache.create_path(key, lambda f: compose_portfolio_report(portfolio_sites(df), output=f)),
+        ),
+    }
+    # bytearray() stands in for the copy the download button made of the bytes
+    for i, (label, (buffered, streamed)) in enumerate(cases.items()):
+        before = peak(buffered)
+        after = peak(lambda: streamed(f"{i:064x}"))
+        print(f"{label:<24} buffered {before / 1e6:6.1f} MB   streamed {after / 1e6:6.1f} MB")
@@ -0,0 +1,49 @@
+"""PDF size and build time with the source images vs the optimized variants.
+
+Builds the image variants if needed, then renders the single-pass NBC
+report of every zone with the original PNGs and with the "pdf" variants
+(first with a cold image cache, then warm). Run from the repository root:
+
+    python -m benchmarks.report_images
+"""
+import os
+import statistics
+import time
+
+from climate_data import CLIMATE_ZONE_DATA
+from image_pipeline import build_images, load_image_manifest, _image_bytes
+from pdf_reports import generate_nbc_pdf_report
+
+
+ROUNDS = 5
+
+
+def build_reports(image_profile):
+    sizes, times = [], []
+    for zone, zone_info in CLIMATE_ZONE_DATA.items():
+        start = time.perf_counter()
+        pdf = generate_nbc_pdf_report("Sample", "Delhi", zone, 28.6, 77.2, zone_info, image_profile=image_profile)
+        times.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(pdf.getvalue()))
+    return sizes, times
+
+
+if __name__ == "__main__":
+    built, skipped = build_images()
+    print(f"variants: {built} built, {skipped} up to date")
+
+    manifest = load_image_manifest()
+    sources = sorted({p for info in CLIMATE_ZONE_DATA.values() for p in info["images"]})
+    print(f"\n{'image':<32}{'source':>10}{'pdf':>10}{'ui':>10}")
+    for source in sources:
+        entry = manifest.get(source, {})
+        print(f"{source:<32}{os.path.getsize(source):>10,}"
+              f"{entry.get('pdf', {}).get('bytes', 0):>10,}{entry.get('ui', {}).get('bytes', 0):>10,}")
+
+    print(f"\n{'images':<20}{'avg PDF bytes':>14}{'median ms':>12}")
+    for label, profile in (("source PNGs", None), ("pdf variants", "pdf")):
+        _image_bytes.cache_clear()
+        sizes, cold = build_reports(profile)
+        warm = [t for _ in range(ROUNDS) for t in build_reports(profile)[1]]
+        print(f"{label:<20}{statistics.mean(sizes):>14,.0f}{statistics.median(warm):>12.1f}"
+              f"   (first pass {statistics.median(cold):.1f} ms)")
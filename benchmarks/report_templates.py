@@ -0,0 +1,77 @@
+"""Report build time with and without the compiled template registry.
+
+"cold" clears the registry before every build, so styles, table styles and
+paragraphs are compiled again each time (as every report did before the
+registry); "warm" reuses them across builds, as a long-running app process
+does. Zone sections are pre-rendered in both cases, so the composed
+numbers are the per-request cover and closing page. Run from the
+repository root:
+
+    python -m benchmarks.report_templates [sample size]
+"""
+import statistics
+import sys
+
+import pandas as pd
+
+from climate_data import CLIMATE_ZONE_DATA
+from pdf_reports import (
+    generate_nbc_pdf_report, compose_nbc_report, nbc_zone_section,
+    generate_ashrae_pdf_report, compose_ashrae_report, ashrae_zone_section,
+)
+from report_templates import clear_templates, paragraph, report_styles, table_style
+from zone_catalog import normalize_zones
+
+from benchmarks.ashrae_reports import report_args as ashrae_args
+from benchmarks.report_composition import percentile, timed
+
+
+def cold(build):
+    def run(args):
+        clear_templates()
+        build(args)
+    return run
+
+
+def templates(_):
+    """Styles, the location table style and the static paragraphs of one report"""
+    report_styles()
+    table_style("location")
+    for text in ("Climate Analysis", "Project Information", "Climate Zone Designation", "Passive Design Strategies:"):
+        paragraph(text, "heading")
+    for description in CLIMATE_ZONE_DATA["Composite"]["descriptions"]:
+        paragraph(description)
+
+
+if __name__ == "__main__":
+    sample = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    nbc = normalize_zones(pd.read_excel("INDIA-WeatherMapping.xlsx")).dropna(subset=["Latitude", "Longitude"])
+    nbc = nbc[nbc["Climate Zone"].isin(CLIMATE_ZONE_DATA)]
+    nbc_rows = [
+        (r["Location"], r["State"], r["Climate Zone"], float(r["Latitude"]), float(r["Longitude"]))
+        for r in nbc.sample(min(sample, len(nbc)), random_state=0).to_dict("records")
+    ]
+    ashrae = normalize_zones(pd.read_excel("ASHRAE-ClimateZoneMapping.xlsx")).dropna(subset=["Latitude", "Longitude"])
+    ashrae_rows = [ashrae_args(r) for r in ashrae.sample(min(sample, len(ashrae)), random_state=0).to_dict("records")]
+
+    for zone in CLIMATE_ZONE_DATA:
+        nbc_zone_section(zone)
+    for name in ashrae["Climate Zone Name"].dropna().unique():
+        ashrae_zone_section(name)
+
+    cases = {
+        "templates only": templates,
+        "NBC single pass": lambda a: generate_nbc_pdf_report(*a, CLIMATE_ZONE_DATA[a[2]]),
+        "NBC composed": lambda a: compose_nbc_report(*a),
+        "ASHRAE single pass": lambda a: generate_ashrae_pdf_report(*a),
+        "ASHRAE composed": lambda a: compose_ashrae_report(*a),
+    }
+    print(f"{len(nbc_rows)} NBC and {len(ashrae_rows)} ASHRAE stations, median / p95 in ms")
+    for label, build in cases.items():
+        rows = ashrae_rows if label.startswith("ASHRAE") else nbc_rows
+        before = timed(cold(build), rows)
+        build(rows[0])
+        after = timed(build, rows)
+        print(f"  {label:<19} cold {statistics.median(before):7.2f} / {percentile(before, 0.95):7.2f}   "
+              f"warm {statistics.median(after):7.2f} / {percentile(after, 0.95):7.2f}   "
+              f"{statistics.median(before) / statistics.median(after):4.1f}x")
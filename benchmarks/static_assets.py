@@ -0,0 +1,47 @@
+"""Per-rerun cost of the app's image references: read-and-encode vs the static manifest.
+
+"encode" is what globe.py did on every rerun for the logo (read the file
+and base64-encode it), here applied to the logo and to every strategy
+image. "manifest" is static_asset_uri after the first call, which only
+checks the file's mtime and size. Run from the repository root:
+
+    python -m benchmarks.static_assets [rounds]
+"""
+import base64
+import os
+import statistics
+import sys
+import time
+
+from assets import build_static_images, static_asset_uri, STATIC_IMAGES_DIR, STATIC_IMAGE_EXTENSIONS
+
+
+def encode(path):
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode()
+
+
+def per_call_us(fn, paths, rounds):
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for path in paths:
+            fn(path)
+        times.append((time.perf_counter() - start) * 1e6 / len(paths))
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    logo = [os.path.join(STATIC_IMAGES_DIR, "EDSlogo.jpg")]
+    images = sorted(
+        os.path.join(STATIC_IMAGES_DIR, name) for name in os.listdir(STATIC_IMAGES_DIR)
+        if name.lower().endswith(STATIC_IMAGE_EXTENSIONS)
+    )
+    start = time.perf_counter()
+    build_static_images(images)
+    print(f"manifest of {len(images)} images built in {(time.perf_counter() - start) * 1000:.0f} ms")
+    for label, paths in (("logo", logo), ("all images", images)):
+        before = per_call_us(encode, paths, rounds)
+        after = per_call_us(static_asset_uri, paths, rounds)
+        print(f"  {label:<11} encode {before:8.1f} us   manifest {after:6.1f} us per image   {before / after:5.0f}x")
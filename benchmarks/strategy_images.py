@@ -0,0 +1,73 @@
+"""Strategy grid cost per rerun and bytes per page view: st.image vs <picture>.
+
+Builds the image variants if needed, then runs a Streamlit script that
+draws one NBC zone's three-image grid the old way (st.image on the source
+PNGs) and the new way (picture_html markup), timing repeated reruns with
+AppTest. Bytes are what a browser downloads for the grid: the source PNGs,
+or the AVIF variant it picks at 1x and 2x pixel density. The markup
+needs a public asset server, so the <picture> runs mark one reachable
+(the images themselves are never fetched). Run from the repository root:
+
+    python -m benchmarks.strategy_images [reruns]
+"""
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("CZF_ASSET_BASE_URL", "http://127.0.0.1:8765")
+
+from streamlit.testing.v1 import AppTest
+
+from assets import BUILD_DIR, set_asset_server_reachable
+from climate_data import CLIMATE_ZONE_DATA
+from image_pipeline import build_images, grid_variants, GRID_IMAGE_HEIGHT
+
+
+GRID_SCRIPT = """
+import streamlit as st
+from climate_data import CLIMATE_ZONE_DATA
+from image_pipeline import picture_html
+
+images = CLIMATE_ZONE_DATA[{zone!r}]["images"]
+for col, image in zip(st.columns(3), images):
+    with col:
+        if {picture}:
+            st.markdown(picture_html(image), unsafe_allow_html=True)
+        else:
+            st.image(image, use_container_width=True)
+"""
+
+
+def rerun_ms(zone, picture, reruns):
+    set_asset_server_reachable(picture)
+    at = AppTest.from_string(GRID_SCRIPT.format(zone=zone, picture=picture), default_timeout=60)
+    at.run()
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def picked_bytes(source, density):
+    """Bytes of the AVIF variant a browser picks for the 260 px display height at a pixel density"""
+    variants = grid_variants(source, "avif")
+    width, height = variants[-1][1:]
+    wanted = GRID_IMAGE_HEIGHT * width / height * density
+    file = next((file for file, w, _ in variants if w >= wanted), variants[-1][0])
+    return os.path.getsize(os.path.join(BUILD_DIR, file))
+
+
+if __name__ == "__main__":
+    reruns = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    built, _ = build_images()
+    print(f"{built} image variants built")
+    print(f"{'zone':<12} {'st.image':>10} {'picture':>10}   {'PNG KB':>7} {'1x KB':>6} {'2x KB':>6}")
+    for zone, zone_info in CLIMATE_ZONE_DATA.items():
+        source_kb = sum(os.path.getsize(p) for p in zone_info["images"]) / 1024
+        x1 = sum(picked_bytes(p, 1) for p in zone_info["images"]) / 1024
+        x2 = sum(picked_bytes(p, 2) for p in zone_info["images"]) / 1024
+        print(f"{zone:<12} {rerun_ms(zone, False, reruns):8.1f}ms {rerun_ms(zone, True, reruns):8.1f}ms   "
+              f"{source_kb:7.0f} {x1:6.0f} {x2:6.0f}")
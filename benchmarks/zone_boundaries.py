@@ -0,0 +1,48 @@
+"""Vertex counts and payload bytes of the zone region detail levels.
+
+Compares every level against the point-only globe, whose only geometry
+payload is the binary station file. Run from the repository root:
+
+    python -m benchmarks.zone_boundaries
+
+Client frame time has to be measured in a browser: start the app with
+CZF_FRAME_PROBE=1, toggle "Zone regions" on and off and compare the
+"[frame-probe]" lines the globe logs to the developer console.
+"""
+import gzip
+import time
+
+import pandas as pd
+import shapely
+
+from station_codec import encode_stations
+from zone_boundaries import build_zone_regions, simplify_regions, regions_geojson, DETAIL_LEVELS
+from zone_catalog import normalize_zones, build_ashrae_catalog, build_nbc_catalog
+
+
+def measure(label, df, catalog, group_column):
+    points = encode_stations(df.dropna(subset=["Latitude", "Longitude"]), group_column, catalog.zones, catalog.colors)
+
+    t0 = time.perf_counter()
+    regions = build_zone_regions(df, catalog)
+    t_build = time.perf_counter() - t0
+
+    print(f"{label}: regions dissolved in {t_build * 1000:.0f} ms")
+    print(f"  {'level':<28}{'vertices':>10}{'bytes':>12}{'gzip':>10}{'simplify ms':>13}")
+    print(f"  {'point-only (stations.bin)':<28}{'-':>10}{len(points):>12,}{len(gzip.compress(points)):>10,}{'-':>13}")
+    for i, (tolerance, decimals, min_zoom) in enumerate(DETAIL_LEVELS):
+        t0 = time.perf_counter()
+        simplified = simplify_regions(regions, tolerance, decimals)
+        geojson = regions_geojson(simplified, catalog).encode("utf-8")
+        elapsed = time.perf_counter() - t0
+        vertices = int(sum(shapely.get_num_coordinates(g) for g in simplified.values()))
+        name = f"lod{i} tol={tolerance} zoom>={min_zoom}"
+        print(f"  {name:<28}{vertices:>10,}{len(geojson):>12,}{len(gzip.compress(geojson)):>10,}{elapsed * 1000:>13.0f}")
+    print()
+
+
+if __name__ == "__main__":
+    ashrae = normalize_zones(pd.read_excel("ASHRAE-ClimateZoneMapping.xlsx"))
+    measure("ASHRAE world", ashrae, build_ashrae_catalog(ashrae), "Country")
+    nbc = normalize_zones(pd.read_excel("INDIA-WeatherMapping.xlsx"))
+    measure("NBC India", nbc, build_nbc_catalog(nbc), "State")
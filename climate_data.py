@@ -0,0 +1,262 @@
+"""Passive design strategies per climate zone (NBC and ASHRAE), shown in the apps and the PDF reports."""
+
+
+# Climate zone data for NBC
+CLIMATE_ZONE_DATA = {
+    "Cold": {
+        "images": [
+            "images/climate_zone_finder.png",
+            "images/sun_space.png",
+            "images/trombe_wall.png"
+        ],
+        "titles": ["Surface area to volume ratio", "Sun Space", "Trombe Wall"],
+        "descriptions": [
+            "In cold regions, building's shape needs to be compact to reduce heat gain and losses, respectively. The surface to volume(S/V) ratio of the building should be as low as possible to minimize heat loss.",
+            "The south facing sun space to catch maximum heat inside. The trapped heat keeps the indoor warm in the cold climate.",
+            "The hot air between the glazing and the wall gets heated up and enters inside to store sensible heat."
+        ]
+    },
+    "Composite": {
+        "images": [
+            "images/shading_windows.png",
+            "images/Cool_Roof.png",
+            "images/Light_shelf.png"
+        ],
+        "titles": ["Shading", "Cool Roof", "Light Shelf"],
+        "descriptions": [
+            "Extended roof, horizontal overhangs over the windows are effective in shading. These devices are designed to block the summer sun but allowing the winter sun.",
+            "Cool roofs reflect most of the solar radiation and efficiently emit some of the absorbed radiation back into the atmosphere, instead of conducting it to the building below.",
+            "The external light shelves to penetrate diffused light inside the space. They serve the dual purpose by acting as a shading device."
+        ]
+    },
+    "Hot-Dry": {
+        "images": [
+            "images/climate_zone_finder.png",
+            "images/Evaporative_Cooling.png",
+            "images/Cool_Roof.png"
+        ],
+        "titles": ["Surface area to volume ratio", "Evaporative Cooling", "Cool Roof"],
+        "descriptions": [
+            "In hot & dry regions, building's shape needs to be compact to reduce heat gain and losses, respectively. The surface to volume(S/V) ratio of the building should be as low as possible to minimize heat gain.",
+            "Evaporative cooling is mostly effective in hot and dry climate where the humidity is low. Water in pools and fountains can be used as a cooling element along with cross-ventilating arrangement of openings.",
+            "Cool roofs reflect most of the solar radiation and efficiently emit some of the absorbed radiation back into the atmosphere, instead of conducting it to the building below."
+        ]
+    },
+    "Temperate": {
+        "images": [
+            "images/natural_ventilation.png",
+            "images/Shaded_verandahs.png",
+            "images/orientation.png"
+        ],
+        "titles": ["Natural ventilation", "Shaded Verandahs", "Orientation"],
+        "descriptions": [
+            "Naturally ventilated buildings rely on wind that is naturally prevalent at the site. The fenestrations of the building should be designed to capture the breeze for effective ventilation.",
+            "Extended roof, horizontal overhangs over the windows are effective in shading. These devices can be designed to be fixed or moveable, so you can adjust them according.",
+            "By orienting the shorter sides of the building in the direction of strongest solar radiation, the thermal impact from solar radiation is minimised."
+        ]
+    },
+    "Warm-Humid": {
+        "images": [
+            "images/Siting_Prevailing_wind.png",
+            "images/Shaded_verandahs.png",
+            "images/natural_ventilation.png"
+        ],
+        "titles": ["Siting- Design for prevalent wind patterns", "Shaded Verandahs", "Natural ventilation"],
+        "descriptions": [
+            "In warm and humid climates, buildings are placed on site to catch maximum wind.\n The plantations help channelize and filter the wind.",
+            "Extended roof, horizontal overhangs over the windows are effective in shading. These devices can be designed to be fixed or moveable, so you can adjust them according.",
+            "In humid climates such as that prevailing in Coastal regions, ventilation can bring in much needed relief. Naturally ventilated buildings rely on wind that is naturally prevalent at the site."
+        ]
+    }
+}
+
+
+# Passive design strategies for ASHRAE climate zone names
+ASHRAE_STRATEGIES = {
+    "Hot Dry": {
+        "title": "Hot-Dry",
+        "color": "#dc3545",
+        "strategies": [
+            {
+                "name": "Surface area to volume ratio",
+                "image": "images/climate_zone_finder.png",
+                "description": "In hot & dry regions, building's shape needs to be compact to reduce heat gain and losses, respectively. The surface to volume(S/V) ratio of the building should be as low as possible to minimize heat gain."
+            },
+            {
+                "name": "Evaporative Cooling",
+                "image": "images/Evaporative_Cooling.png",
+                "description": "Evaporative cooling is mostly effective in hot and dry climate where the humidity is low. Water in pools and fountains can be used as a cooling element along with cross-ventilating arrangement of openings."
+            },
+            {
+                "name": "Cool Roof",
+                "image": "images/Cool_Roof.png",
+                "description": "Cool roofs reflect most of the solar radiation and efficiently emit some of the absorbed radiation back into the atmosphere, instead of conducting it to the building below."
+            }
+        ]
+    },
+    "Hot Humid": {
+        "title": "Hot-Humid",
+        "color": "#ff6b35",
+        "strategies": [
+            {
+                "name": "Natural Ventilation",
+                "image": "images/natural_ventilation.png",
+                "description": "In hot-humid climates, maximizing natural ventilation is crucial. Cross-ventilation and stack ventilation help remove excess humidity and heat from indoor spaces."
+            },
+            {
+                "name": "Shading Devices",
+                "image": "images/shading_windows.png",
+                "description": "External shading devices like overhangs, louvers, and vegetation prevent direct solar radiation while allowing natural light and ventilation."
+            },
+            {
+                "name": "Elevated Buildings",
+                "description": "Elevating buildings on stilts or pillars improves air circulation underneath, reduces ground moisture impact, and enhances cooling through natural ventilation."
+            }
+        ]
+    },
+    "Warm Humid": {
+        "title": "Warm-Humid",
+        "color": "#ffa500",
+        "strategies": [
+            {
+                "name": "Orientation and Layout",
+                "image": "images/orientation.png",
+                "description": "Building orientation should maximize exposure to prevailing breezes while minimizing direct solar exposure. Open floor plans facilitate air movement."
+            },
+            {
+                "name": "Thermal Mass Control",
+                "description": "Use lightweight construction with low thermal mass to prevent heat storage. Materials should cool quickly during night hours."
+            },
+            {
+                "name": "Moisture Management",
+                "description": "Design details should prevent moisture accumulation through proper drainage, vapor barriers, and moisture-resistant materials."
+            }
+        ]
+    },
+    "Mixed Dry": {
+        "title": "Mixed-Dry",
+        "color": "#28a745",
+        "strategies": [
+            {
+                "name": "Thermal Mass",
+                "image": "images/trombe_wall.png",
+                "description": "Use high thermal mass materials like concrete or masonry to store heat during day and release at night, moderating temperature swings."
+            },
+            {
+                "name": "Passive Solar Design",
+                "image": "images/sun_space.png",
+                "description": "South-facing windows with proper overhangs capture winter sun for heating while blocking summer sun to reduce cooling needs."
+            },
+            {
+                "name": "Night Ventilation",
+                "description": "Open windows during cool nights to flush out daytime heat and cool thermal mass for the next day."
+            }
+        ]
+    },
+    "Mixed Humid": {
+        "title": "Mixed-Humid",
+        "color": "#17a2b8",
+        "strategies": [
+            {
+                "name": "Dehumidification",
+                "description": "Incorporate passive dehumidification through proper ventilation design and moisture control strategies to maintain comfort."
+            },
+            {
+                "name": "Insulation Balance",
+                "description": "Moderate insulation levels balance heating and cooling needs while preventing condensation issues in varying humidity conditions."
+            },
+            {
+                "name": "Rainwater Management",
+                "description": "Effective gutters, downspouts, and drainage systems prevent water intrusion and manage high precipitation levels."
+            }
+        ]
+    },
+    "Cool Dry": {
+        "title": "Cool",
+        "color": "#6610f2",
+        "strategies": [
+            {
+                "name": "Solar Heat Gain",
+                "image": "images/trombe_wall.png",
+                "description": "Maximize south-facing glazing to capture solar heat. Use thermal storage walls or floors to store and redistribute heat."
+            },
+            {
+                "name": "Insulation",
+                "description": "High levels of insulation in walls, roof, and foundation minimize heat loss and reduce heating demands significantly."
+            },
+            {
+                "name": "Windbreaks",
+                "description": "Strategic placement of vegetation or structures on north and west sides reduce cold wind impact and heat loss."
+            }
+        ]
+    },
+    "Cold Dry": {
+        "title": "Cold",
+        "color": "#0d6efd",
+        "strategies": [
+            {
+                "name": "Compact Design",
+                "image": "images/climate_zone_finder.png",
+                "description": "Minimize surface area to volume ratio to reduce heat loss. Compact, clustered designs with minimal exposed surfaces work best."
+            },
+            {
+                "name": "Vestibules & Airlocks",
+                "description": "Entry vestibules create buffer zones that prevent direct cold air infiltration and reduce heat loss through doorways."
+            },
+            {
+                "name": "Super Insulation",
+                "description": "Extra-thick insulation (R-40+ walls, R-60+ roof) combined with triple-glazed windows minimizes heat loss in extreme cold."
+            }
+        ]
+    },
+    "Cool Marine": {
+        "title": "Marine",
+        "color": "#20c997",
+        "strategies": [
+            {
+                "name": "Moisture Protection",
+                "description": "Advanced water-resistant barriers and proper flashing details protect against persistent moisture and salt spray in marine climates."
+            },
+            {
+                "name": "Moderate Insulation",
+                "description": "Balanced insulation addresses mild winters and cool summers while managing high humidity levels typical of marine climates."
+            },
+            {
+                "name": "Daylighting",
+                "image": "images/Light_shelf.png",
+                "description": "Maximize natural light through windows and skylights to compensate for frequently overcast conditions in marine climates."
+            }
+        ]
+    }
+}
+
+
+# Zone names of the dataset without a strategy set of their own, and the
+# set of the nearest family they share (by temperature, or marine climate)
+ASHRAE_STRATEGY_ALIASES = {
+    "Warm Dry": "Mixed Dry",
+    "Warm Marine": "Cool Marine",
+    "Mixed Marine": "Cool Marine",
+    "Cool Humid": "Cool Dry",
+    "Cold Humid": "Cold Dry",
+    "Very Cold": "Cold Dry",
+    "Subarctic/Arctic": "Cold Dry",
+}
+
+
+def get_climate_strategies(zone_name):
+    """Returns passive design strategies based on climate zone name"""
+    for alias, key in ASHRAE_STRATEGY_ALIASES.items():
+        if alias.lower() == str(zone_name).lower().strip():
+            return ASHRAE_STRATEGIES[key]
+
+    # Match zone name to strategy (flexible matching)
+    zone_name_lower = str(zone_name).lower().strip()
+
+    for key in ASHRAE_STRATEGIES.keys():
+        key_lower = key.lower().strip()
+        if key_lower == zone_name_lower or key_lower in zone_name_lower or zone_name_lower in key_lower:
+            return ASHRAE_STRATEGIES[key]
+
+    # Default return if no match
+    return None
@@ -1,18 +1,29 @@
-from matplotlib.pylab import size
-from shapely import transform
 import streamlit as st
 import pandas as pd
 import json
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-import io
+import os
 from datetime import datetime
-from PIL import Image as PILImage
-import base64
+from station_codec import encode_stations, STATION_DECODER_JS, STATION_LOADER_JS
+from map_layers import point_render_mode, CANVAS_POINT_LAYER_JS
+from zone_catalog import (
+    normalize_zones, build_ashrae_catalog, build_nbc_catalog, NBC_ZONE_COLORS, DEFAULT_ZONE_COLOR
+)
+from assets import (
+    assets_stale, build_assets, build_static_images, static_asset_uri, amcharts_script_tags, publish_asset, content_hash,
+    data_uri
+)
+from asset_server import start_asset_server
+from html_report import html_report_url
+from tile_builder import tile_manifest_version, tile_mosaic
+from india_states import build_state_aggregates
+from zone_boundaries import build_detail_levels, ZONE_OVERLAY_JS
+from map_snapshot import render_basemap, snapshot_png
+from report_jobs import report_job_panel
+from report_builds import ashrae_report_job, nbc_report_job
+from singleflight import flight_group
+from climate_data import CLIMATE_ZONE_DATA
+from pdf_reports import ashrae_report_key, nbc_report_key
+from image_pipeline import build_images, picture_html
 
 st.set_page_config(
     page_title="Climate Zone Finder",
@@ -21,11 +32,8 @@ st.set_page_config(
 )
 
 
-def get_base64_image(image_path):
-    with open(image_path, "rb") as img_file:
-        return base64.b64encode(img_file.read()).decode()
-
-logo_base64 = get_base64_image("images/EDSlogo.jpg")
+# Precomputed once per process (and when the file changes), so a rerun does not read the logo
+logo_uri = static_asset_uri("images/EDSlogo.jpg")
 
 # CSS for Header
 st.markdown(
@@ -62,7 +70,7 @@ st.markdown(
     </style>
 
     <div class="app-header">
-        <img src="data:image/png;base64,{logo_base64}" />
+        <img src="{logo_uri}" />
         <h2 class="header-title">CLIMATE ZONE FINDER</h2>
         <div></div>
     </div>
@@ -211,165 +219,160 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# store the dataset in cache to reduce load time
-@st.cache_data
+# store the dataset in cache to reduce load time; shared rather than copied
+# on every call, as each page section loads it and only reads it
+@st.cache_resource
 def load_ashrae_data():
     df = pd.read_excel("ASHRAE-ClimateZoneMapping.xlsx")
-    return df
+    return normalize_zones(df)
 
 
-@st.cache_data
+@st.cache_resource
 def load_nbc_data():
     df = pd.read_excel("INDIA-WeatherMapping.xlsx")
-    return df
-
-
-# Climate zone data for NBC
-CLIMATE_ZONE_DATA = {
-    "Cold": {
-        "images": [
-            "images/climate_zone_finder.png",
-            "images/sun_space.png",
-            "images/trombe_wall.png"
-        ],
-        "titles": ["Surface area to volume ratio", "Sun Space", "Trombe Wall"],
-        "descriptions": [
-            "In cold regions, building's shape needs to be compact to reduce heat gain and losses, respectively. The surface to volume(S/V) ratio of the building should be as low as possible to minimize heat loss.",
-            "The south facing sun space to catch maximum heat inside. The trapped heat keeps the indoor warm in the cold climate.",
-            "The hot air between the glazing and the wall gets heated up and enters inside to store sensible heat."
-        ]
-    },
-    "Composite": {
-        "images": [
-            "images/shading_windows.png",
-            "images/Cool_Roof.png",
-            "images/Light_shelf.png"
-        ],
-        "titles": ["Shading", "Cool Roof", "Light Shelf"],
-        "descriptions": [
-            "Extended roof, horizontal overhangs over the windows are effective in shading. These devices are designed to block the summer sun but allowing the winter sun.",
-            "Cool roofs reflect most of the solar radiation and efficiently emit some of the absorbed radiation back into the atmosphere, instead of conducting it to the building below.",
-            "The external light shelves to penetrate diffused light inside the space. They serve the dual purpose by acting as a shading device."
-        ]
-    },
-    "Hot-Dry": {
-        "images": [
-            "images/climate_zone_finder.png",
-            "images/Evaporative_Cooling.png",
-            "images/Cool_Roof.png"
-        ],
-        "titles": ["Surface area to volume ratio", "Evaporative Cooling", "Cool Roof"],
-        "descriptions": [
-            "In hot & dry regions, building's shape needs to be compact to reduce heat gain and losses, respectively. The surface to volume(S/V) ratio of the building should be as low as possible to minimize heat gain.",
-            "Evaporative cooling is mostly effective in hot and dry climate where the humidity is low. Water in pools and fountains can be used as a cooling element along with cross-ventilating arrangement of openings.",
-            "Cool roofs reflect most of the solar radiation and efficiently emit some of the absorbed radiation back into the atmosphere, instead of conducting it to the building below."
-        ]
-    },
-    "Temperate": {
-        "images": [
-            "images/natural_ventilation.png",
-            "images/Shaded_verandahs.png",
-            "images/orientation.png"
-        ],
-        "titles": ["Natural ventilation", "Shaded Verandahs", "Orientation"],
-        "descriptions": [
-            "Naturally ventilated buildings rely on wind that is naturally prevalent at the site. The fenestrations of the building should be designed to capture the breeze for effective ventilation.",
-            "Extended roof, horizontal overhangs over the windows are effective in shading. These devices can be designed to be fixed or moveable, so you can adjust them according.",
-            "By orienting the shorter sides of the building in the direction of strongest solar radiation, the thermal impact from solar radiation is minimised."
-        ]
-    },
-    "Warm-Humid": {
-        "images": [
-            "images/Siting_Prevailing_wind.png",
-            "images/Shaded_verandahs.png",
-            "images/natural_ventilation.png"
-        ],
-        "titles": ["Siting- Design for prevalent wind patterns", "Shaded Verandahs", "Natural ventilation"],
-        "descriptions": [
-            "In warm and humid climates, buildings are placed on site to catch maximum wind.\n The plantations help channelize and filter the wind.",
-            "Extended roof, horizontal overhangs over the windows are effective in shading. These devices can be designed to be fixed or moveable, so you can adjust them according.",
-            "In humid climates such as that prevailing in Coastal regions, ventilation can bring in much needed relief. Naturally ventilated buildings rely on wind that is naturally prevalent at the site."
-        ]
-    }
-}
+    return normalize_zones(df)
 
-# Manual color mapping for aligning with climate zone nams
-def get_ashrae_zone_color(df, climate_zone):
-    """Get color for ASHRAE climate zone"""
-    df["Climate Zone"] = df["Climate Zone"].astype(str).str.strip()
-    climate_zone = str(climate_zone).strip()
-    
-    zone_list = sorted(df["Climate Zone"].unique())
-    
-    palette = [
-        "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
-        "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf",
-        "#005f99", "#cc5500", "#009933", "#990000", "#663399",
-        "#00b3b3", "#b30047", "#ff66b2", "#66ff66", "#ffd966"
+
+# Zone catalogs are immutable, so they are shared rather than copied per rerun
+@st.cache_resource
+def load_ashrae_catalog():
+    return build_ashrae_catalog(load_ashrae_data())
+
+
+@st.cache_resource
+def load_nbc_catalog():
+    return build_nbc_catalog(load_nbc_data())
+
+
+# Build and serve the self-hosted map assets once per process
+@st.cache_resource
+def start_static_assets():
+    if assets_stale():
+        build_assets()
+    build_static_images()
+    build_images()
+    return start_asset_server()
+
+
+start_static_assets()
+
+
+@st.cache_resource
+def map_helpers_url():
+    """Publish the browser-side station decoder and canvas layer as one cached script (inline without the server)"""
+    return publish_asset(
+        "czf/map_helpers.js", (STATION_DECODER_JS + CANVAS_POINT_LAYER_JS + ZONE_OVERLAY_JS).encode("utf-8")
+    )
+
+
+@st.cache_data(show_spinner=False)
+def publish_zone_levels(_df, _catalog, dataset_version):
+    """Publish the zone region geometries at every detail level; returns [{minZoom, url}]"""
+    return [
+        {"minZoom": min_zoom, "url": publish_asset(f"boundaries/{_catalog.standard.lower()}.lod{i}.json", geojson.encode("utf-8"))}
+        for i, (min_zoom, geojson, _) in enumerate(build_detail_levels(_df, _catalog))
     ]
-    
-    while len(palette) < len(zone_list):
-        palette = palette + palette
-    
-    zone_color_map = {z: palette[i] for i, z in enumerate(zone_list)}
-    return zone_color_map.get(climate_zone, "#444444")
+
+
+@st.cache_data(show_spinner=False)
+def publish_station_payload(_df, _catalog, group_column, asset_name, with_zone_names, dataset_version):
+    """Encode the stations and publish them at a content-hashed URL; returns (url, version).
+
+    The URL is a data URI when there is no asset server. Cached per
+    dataset_version, so the DataFrame itself is never hashed.
+    """
+    payload = encode_stations(
+        _df, group_column, _catalog.zones, _catalog.colors,
+        _catalog.names if with_zone_names else None, DEFAULT_ZONE_COLOR
+    )
+    return publish_asset(asset_name, payload), content_hash(payload)
+
+
+# The India map switches from the state choropleth to stations past this zoom level
+STATE_DETAIL_ZOOM = 3
+
+
+@st.cache_resource
+def load_nbc_state_aggregates():
+    return build_state_aggregates(load_nbc_data(), load_nbc_catalog())
+
+
+@st.cache_data(show_spinner=False)
+def publish_state_payloads(_df, _catalog, dataset_version):
+    """Publish one station payload per state; returns {map polygon id: {url, version}}"""
+    payloads = {}
+    for aggregate in load_nbc_state_aggregates():
+        state_df = _df[_df["State"] == aggregate["state"]]
+        payload = encode_stations(state_df, "State", _catalog.zones, _catalog.colors, None, DEFAULT_ZONE_COLOR)
+        payloads[aggregate["id"]] = {
+            "url": publish_asset(f"stations/nbc/{aggregate['id']}.bin", payload),
+            "version": content_hash(payload),
+        }
+    return payloads
+
+
+@st.cache_data(show_spinner=False)
+def lite_map_image(dataset, tiles_version, lat, lon):
+    """Prebuilt-tile map around the selected station; tiles_version keys it to one tile build"""
+    return tile_mosaic(dataset, lat, lon, zoom=5 if dataset == "nbc" else 3, width=900, height=620)
+
+
+# Static snapshots: the basemap layer is rendered once per dataset version,
+# each snapshot is a crop of it cached by (dataset version, station, size)
+@st.cache_resource(show_spinner=False)
+def load_basemap(dataset, dataset_version):
+    if dataset == "nbc":
+        return render_basemap(dataset, load_nbc_data(), load_nbc_catalog())
+    return render_basemap(dataset, load_ashrae_data(), load_ashrae_catalog())
+
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def station_snapshot(dataset, dataset_version, location_name, lat, lon, size="preview"):
+    """Snapshot of the selected station on the dataset basemap (JPEG)"""
+    return snapshot_png(dataset, load_basemap(dataset, dataset_version), lat, lon, location_name, size)
+
+
+# Previews are a few tens of KB and differ per station, so they are inlined in
+# the map page rather than written to the asset directory on every selection
+@st.cache_data(show_spinner=False, max_entries=512)
+def snapshot_uri(dataset, dataset_version, location_name, lat, lon):
+    """data: URI of the preview snapshot, shown behind a map until it has drawn"""
+    return data_uri("snapshot.jpg", station_snapshot(dataset, dataset_version, location_name, lat, lon))
+
+
+# Zone colors come from the catalogs built when the datasets are loaded
+def get_ashrae_zone_color(climate_zone):
+    """Get color for ASHRAE climate zone"""
+    return load_ashrae_catalog().color(climate_zone)
 
 
 def get_nbc_zone_color(climate_zone):
     """Get color for NBC climate zone"""
-    climate_zone = str(climate_zone).strip()
-    
-    nbc_colors = {
-        "Cold": "#02a0c5",
-        "Composite": "#dec45e",
-        "Hot-Dry": "#c60102",
-        "Temperate": "#f89cc9",
-        "Warm-Humid": "#e59704",
-    }
-    
-    return nbc_colors.get(climate_zone, "#444444")
+    return NBC_ZONE_COLORS.get(str(climate_zone).strip(), DEFAULT_ZONE_COLOR)
+
 
+def world_globe_html(df, lat_sel, lon_sel, location_name, country_name, climate_zone, climate_zone_name,
+                     render_mode="auto", zone_regions=False, frame_probe=False):
+    """Globe visualization for ASHRAE (World), as the component's HTML
 
-def amcharts_world_globe(df, lat_sel, lon_sel, location_name, country_name, climate_zone, climate_zone_name):
-    """Globe visualization for ASHRAE (World)"""
-    # Normalize zone values
-    df["Climate Zone"] = df["Climate Zone"].astype(str).str.strip()
+    render_mode picks the station layer: "sprites" (one amCharts bullet per
+    station), "canvas" (single canvas layer) or "auto" (by dataset size).
+    zone_regions overlays the derived zone regions at a zoom-dependent level
+    of detail; frame_probe logs the average frame time to the browser console.
+    """
     climate_zone = str(climate_zone).strip()
 
-    # Generate color map and zone name mapping
-    zone_list = sorted(df["Climate Zone"].unique())
-    
-    zone_name_map = {}
-    for zone in zone_list:
-        zone_data = df[df["Climate Zone"] == zone].iloc[0]
-        zone_name_map[zone] = zone_data["Climate Zone Name"]
-
-    palette = [
-        "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
-        "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf",
-        "#005f99", "#cc5500", "#009933", "#990000", "#663399",
-        "#00b3b3", "#b30047", "#ff66b2", "#66ff66", "#ffd966"
-    ]
+    # Colors, names and legend markup are precomputed in the zone catalog
+    catalog = load_ashrae_catalog()
 
-    while len(palette) < len(zone_list):
-        palette = palette + palette
-
-    zone_color_map = {z: palette[i] for i, z in enumerate(zone_list)}
-    default_color = "#444444"
-
-    # Build JS dataset
-    df_js = json.dumps([
-        {
-            "lat": float(row["Latitude"]),
-            "lon": float(row["Longitude"]),
-            "title": row["Location"],
-            "country": row["Country"],
-            "zone": row["Climate Zone"],
-            "zone_name": row["Climate Zone Name"],
-            "color": zone_color_map.get(row["Climate Zone"], default_color)
-        }
-        for _, row in df.iterrows()
-    ])
+    # Publish the compact binary station payload (fetched and decoded in the browser)
+    stations_url, stations_version = publish_station_payload(
+        df, catalog, "Country", "stations/ashrae.bin", True, catalog.version
+    )
+    point_mode = point_render_mode(int(df[["Latitude", "Longitude"]].notna().all(axis=1).sum()), render_mode)
+    zone_levels_js = json.dumps(publish_zone_levels(df, catalog, catalog.version) if zone_regions else [])
+    probe_label = f"globe points={point_mode} regions={zone_regions}" if frame_probe else ""
+    snapshot_url = snapshot_uri("ashrae", catalog.version, location_name, float(lat_sel), float(lon_sel))
 
     selected_js = json.dumps({
         "lat": float(lat_sel),
@@ -396,6 +399,8 @@ def amcharts_world_globe(df, lat_sel, lon_sel, location_name, country_name, clim
             flex: 1;
             height: 700px;
             min-height: 700px;
+            /* Static snapshot shown until the chart draws its first frame */
+            background: url("{snapshot_url}") center / contain no-repeat;
         }}
         #legend {{
             width: 200px;
@@ -457,32 +462,29 @@ def amcharts_world_globe(df, lat_sel, lon_sel, location_name, country_name, clim
         }}
     </style>
 
-    <script src="https://cdn.amcharts.com/lib/5/index.js"></script>
-    <script src="https://cdn.amcharts.com/lib/5/map.js"></script>
-    <script src="https://cdn.amcharts.com/lib/5/geodata/worldLow.js"></script>
-    <script src="https://cdn.amcharts.com/lib/5/themes/Animated.js"></script>
+    {amcharts_script_tags("worldLow")}
 
     <div id="container">
         <div id="chartdiv"></div>
         <div id="legend">
             <h4>Climate Zone</h4>
             <div class="legend-grid">
-                {''.join([
-                    f'<div class="legend-item">'
-                    f'<div class="legend-color" style="background:{zone_color_map.get(z, default_color)};"></div>'
-                    f'<span class="legend-text">{z} - {zone_name_map.get(z, "")}</span>'
-                    f'</div>'
-                    for z in zone_list
-                ])}
+                {catalog.legend_html}
             </div>
         </div>
     </div>
 
+    <script>{STATION_LOADER_JS}</script>
+    <script src="{map_helpers_url()}"></script>
+
     <script>
     (function() {{
         if (window.globeChart && window.globeRoot) {{
             var selectedData = [{selected_js}];
             window.selectedSeries.data.setAll(selectedData);
+            if (window.stationLayer) {{
+                window.stationLayer.setSelected({selected_js});
+            }}
             
             window.globeChart.animate({{
                 key: "rotationX",
@@ -501,6 +503,9 @@ def amcharts_world_globe(df, lat_sel, lon_sel, location_name, country_name, clim
             am5.ready(function() {{
                 var root = am5.Root.new("chartdiv");
                 root.setThemes([ am5themes_Animated.new(root) ]);
+                root.events.once("frameended", function() {{
+                    document.getElementById("chartdiv").style.background = "none";
+                }});
 
                 var chart = root.container.children.push(
                     am5map.MapChart.new(root, {{
@@ -522,28 +527,52 @@ def amcharts_world_globe(df, lat_sel, lon_sel, location_name, country_name, clim
                     strokeWidth: 0.5
                 }});
 
-                var pointSeries = chart.series.push(am5map.MapPointSeries.new(root, {{
-                    latitudeField: "lat",
-                    longitudeField: "lon"
-                }}));
+                var zoneLevels = {zone_levels_js};
+                if (zoneLevels.length && typeof ZoneOverlay === "function") {{
+                    window.zoneOverlay = new ZoneOverlay(root, chart, zoneLevels);
+                }}
+                if ("{probe_label}") {{
+                    probeFrameTime(root, "{probe_label}", 5);
+                }}
+
+                var pointSeries = null;
+                if ("{point_mode}" !== "canvas") {{
+                    pointSeries = chart.series.push(am5map.MapPointSeries.new(root, {{
+                        latitudeField: "lat",
+                        longitudeField: "lon"
+                    }}));
 
-                pointSeries.bullets.push(function(root, series, dataItem) {{
-                    return am5.Bullet.new(root, {{
-                        sprite: am5.Circle.new(root, {{
-                            radius: 5,
-                            fill: am5.color(dataItem.dataContext.color),
-                            stroke: am5.color("#ffffff"),
-                            strokeWidth: 1.3,
-                            tooltipText:
-                                "[bold]{{title}}[/]\\n" +
-                                "{{country}}\\n" +
-                                "Zone: {{zone}}\\n" +
-                                "{{zone_name}}"
-                        }})
+                    pointSeries.bullets.push(function(root, series, dataItem) {{
+                        return am5.Bullet.new(root, {{
+                            sprite: am5.Circle.new(root, {{
+                                radius: 5,
+                                fill: am5.color(dataItem.dataContext.color),
+                                stroke: am5.color("#ffffff"),
+                                strokeWidth: 1.3,
+                                tooltipText:
+                                    "[bold]{{title}}[/]\\n" +
+                                    "{{country}}\\n" +
+                                    "Zone: {{zone}}\\n" +
+                                    "{{zone_name}}"
+                            }})
+                        }});
                     }});
-                }});
-
-                pointSeries.data.setAll({df_js});
+                }}
+
+                // The station payload is kept in IndexedDB and only fetched when its version changes
+                loadStations("stations/ashrae", "{stations_version}", "{stations_url}")
+                    .then(function(stations) {{
+                        if (pointSeries) {{
+                            pointSeries.data.setAll(stationRecords(stations, "country"));
+                        }} else {{
+                            // One canvas for all stations, hover handled by the layer's grid index
+                            window.stationLayer = new StationCanvasLayer(
+                                root, chart, document.getElementById("chartdiv"), stations, {{ radius: 5, globe: true }}
+                            );
+                            window.stationLayer.setSelected({selected_js});
+                        }}
+                    }})
+                    .catch(showStationError);
 
                 var selectedSeries = chart.series.push(am5map.MapPointSeries.new(root, {{
                     latitudeField: "lat",
@@ -590,44 +619,39 @@ def amcharts_world_globe(df, lat_sel, lon_sel, location_name, country_name, clim
     </script>
     """
 
-    st.components.v1.html(html_code, height=730, scrolling=False)
+    return html_code
 
 
-def amcharts_india_map(df, lat_sel, lon_sel, location_name, state_name, climate_zone):
-    """India Map visualization for NBC"""
-    # Normalize zone values
-    df["Climate Zone"] = df["Climate Zone"].astype(str).str.strip()
-    climate_zone = str(climate_zone).strip()
+def india_map_html(df, lat_sel, lon_sel, location_name, state_name, climate_zone, render_mode="auto", state_view=True):
+    """India Map visualization for NBC as the component's HTML (render_mode as in world_globe_html)
 
-    # Get unique climate zones for nbc
-    zone_list = sorted(df["Climate Zone"].unique())
-    
-    # nbc Climate Zone Colors
-    nbc_colors = {
-        "Cold": "#02a0c5",
-        "Composite": "#dec45e",
-        "Hot-Dry": "#c60102",
-        "Temperate": "#f89cc9",
-        "Warm-Humid": "#e59704",
-    }
+    With state_view the map opens as a choropleth of each state's majority
+    zone and only loads a state's stations when it is selected or zoomed
+    into; otherwise every station is drawn up front.
+    """
+    climate_zone = str(climate_zone).strip()
 
-    zone_color_map = {z: nbc_colors.get(z, "#444444") for z in zone_list}
-    default_color = "#444444"
+    # Colors and legend markup are precomputed in the zone catalog
+    catalog = load_nbc_catalog()
 
     # Filter out rows with missing coordinates
     df_valid = df.dropna(subset=['Latitude', 'Longitude'])
     
-    # Build JS dataset
-    df_js = json.dumps([
-        {
-            "lat": float(row["Latitude"]),
-            "lon": float(row["Longitude"]),
-            "title": row["Location"],
-            "state": row["State"],
-            "zone": row["Climate Zone"],
-            "color": zone_color_map.get(row["Climate Zone"], default_color)
-        }
-        for _, row in df_valid.iterrows()
+    # Publish the compact binary station payload (fetched and decoded in the browser)
+    stations_url, stations_version = "", ""
+    if not state_view:
+        stations_url, stations_version = publish_station_payload(
+            df_valid, catalog, "State", "stations/nbc.bin", False, catalog.version
+        )
+    point_mode = "sprites" if state_view else point_render_mode(len(df_valid), render_mode)
+
+    # State choropleth data and per-state station payloads for lazy loading
+    state_aggregates = load_nbc_state_aggregates() if state_view else []
+    state_payloads = publish_state_payloads(df_valid, catalog, catalog.version) if state_view else {}
+    selected_state_id = next((a["id"] for a in state_aggregates if a["state"] == state_name), "")
+    snapshot_url = snapshot_uri("nbc", catalog.version, location_name, float(lat_sel), float(lon_sel))
+    states_js = json.dumps([
+        {k: a[k] for k in ("id", "count", "zone", "color", "mix", "lat", "lon")} for a in state_aggregates
     ])
 
     selected_js = json.dumps({
@@ -652,6 +676,8 @@ def amcharts_india_map(df, lat_sel, lon_sel, location_name, state_name, climate_
             flex: 1;
             height: 700px;
             min-height: 700px;
+            /* Static snapshot shown until the chart draws its first frame */
+            background: url("{snapshot_url}") center / contain no-repeat;
         }}
         #legend-nbc {{
             width: 220px;
@@ -715,32 +741,29 @@ def amcharts_india_map(df, lat_sel, lon_sel, location_name, state_name, climate_
         }}
     </style>
 
-    <script src="https://cdn.amcharts.com/lib/5/index.js"></script>
-    <script src="https://cdn.amcharts.com/lib/5/map.js"></script>
-    <script src="https://cdn.amcharts.com/lib/5/geodata/indiaLow.js"></script>
-    <script src="https://cdn.amcharts.com/lib/5/themes/Animated.js"></script>
+    {amcharts_script_tags("indiaLow")}
 
     <div id="container">
         <div id="chartdiv"></div>
         <div id="legend-nbc">
             <h4>NBC Climate Zones</h4>
             <div class="legend-grid">
-                {''.join([
-                    f'<div class="legend-item">'
-                    f'<div class="legend-color" style="background:{zone_color_map.get(z, default_color)};"></div>'
-                    f'<span class="legend-text">{z}</span>'
-                    f'</div>'
-                    for z in zone_list
-                ])}
+                {catalog.legend_html}
             </div>
         </div>
     </div>
 
+    <script>{STATION_LOADER_JS}</script>
+    <script src="{map_helpers_url()}"></script>
+
     <script>
     (function() {{
         if (window.indiaChart && window.indiaRoot) {{
             var selectedData = [{selected_js}];
             window.indiaSelectedSeries.data.setAll(selectedData);
+            if (window.indiaStationLayer) {{
+                window.indiaStationLayer.setSelected({selected_js});
+            }}
             
             // Animate to the selected location
             window.indiaChart.animate({{
@@ -753,6 +776,9 @@ def amcharts_india_map(df, lat_sel, lon_sel, location_name, state_name, climate_
             am5.ready(function() {{
                 var root = am5.Root.new("chartdiv");
                 root.setThemes([ am5themes_Animated.new(root) ]);
+                root.events.once("frameended", function() {{
+                    document.getElementById("chartdiv").style.background = "none";
+                }});
 
                 var chart = root.container.children.push(
                     am5map.MapChart.new(root, {{
@@ -780,33 +806,112 @@ def amcharts_india_map(df, lat_sel, lon_sel, location_name, state_name, climate_
                     fill: am5.color("#c7e6cc")
                 }});
 
-                var pointSeries = chart.series.push(am5map.MapPointSeries.new(root, {{
-                    latitudeField: "lat",
-                    longitudeField: "lon"
-                }}));
+                var stateView = {json.dumps(state_view)};
+                var stateAggregates = {states_js};
+                var statePayloads = {json.dumps(state_payloads)};
 
-                pointSeries.bullets.push(function(root, series, dataItem) {{
-                    var circle = am5.Circle.new(root, {{
-                        radius: 7,
-                        fill: am5.color(dataItem.dataContext.color),
-                        stroke: am5.color("#ffffff"),
-                        strokeWidth: 2,
+                if (stateView) {{
+                    // Choropleth: each state filled with its majority climate zone
+                    polygonSeries.mapPolygons.template.setAll({{
+                        templateField: "polygonSettings",
+                        cursorOverStyle: "pointer",
                         tooltipText:
-                            "[bold]{{title}}[/]\\n" +
-                            "State: {{state}}\\n" +
-                            "Climate Zone: {{zone}}"
+                            "[bold]{{name}}[/]\\n" +
+                            "Majority zone: {{zone}}\\n" +
+                            "Stations: {{count}}\\n" +
+                            "{{mix}}"
                     }});
-                    
-                    circle.states.create("hover", {{
-                        scale: 1.3
+                    polygonSeries.data.setAll(stateAggregates.map(function(a) {{
+                        return {{
+                            id: a.id, zone: a.zone, count: a.count, mix: a.mix,
+                            polygonSettings: {{ fill: am5.color(a.color), fillOpacity: 0.75 }}
+                        }};
+                    }}));
+                }}
+
+                var pointSeries = null;
+                if ("{point_mode}" !== "canvas") {{
+                    pointSeries = chart.series.push(am5map.MapPointSeries.new(root, {{
+                        latitudeField: "lat",
+                        longitudeField: "lon"
+                    }}));
+
+                    pointSeries.bullets.push(function(root, series, dataItem) {{
+                        var circle = am5.Circle.new(root, {{
+                            radius: 7,
+                            fill: am5.color(dataItem.dataContext.color),
+                            stroke: am5.color("#ffffff"),
+                            strokeWidth: 2,
+                            tooltipText:
+                                "[bold]{{title}}[/]\\n" +
+                                "State: {{state}}\\n" +
+                                "Climate Zone: {{zone}}"
+                        }});
+                        
+                        circle.states.create("hover", {{
+                            scale: 1.3
+                        }});
+                        
+                        return am5.Bullet.new(root, {{
+                            sprite: circle
+                        }});
                     }});
-                    
-                    return am5.Bullet.new(root, {{
-                        sprite: circle
+                }}
+
+                // Stations of one state, fetched the first time it is selected or zoomed into
+                var loadedStates = {{}};
+                function loadState(id) {{
+                    if (loadedStates[id] || !statePayloads[id]) {{ return; }}
+                    loadedStates[id] = true;
+                    loadStations("stations/nbc/" + id, statePayloads[id].version, statePayloads[id].url)
+                        .then(function(stations) {{
+                            pointSeries.data.pushAll(stationRecords(stations, "state"));
+                        }})
+                        .catch(function(err) {{
+                            // Retried the next time the state is selected or zoomed into
+                            loadedStates[id] = false;
+                            showStationError(err);
+                        }});
+                }}
+
+                // Past national zoom, load every state whose centre is in view
+                function loadVisibleStates() {{
+                    if (chart.get("zoomLevel", 1) < {STATE_DETAIL_ZOOM}) {{ return; }}
+                    var topLeft = chart.invert({{ x: 0, y: 0 }});
+                    var bottomRight = chart.invert({{ x: chart.width(), y: chart.height() }});
+                    stateAggregates.forEach(function(a) {{
+                        if (a.lat <= topLeft.latitude && a.lat >= bottomRight.latitude &&
+                            a.lon >= topLeft.longitude && a.lon <= bottomRight.longitude) {{
+                            loadState(a.id);
+                        }}
                     }});
-                }});
+                }}
 
-                pointSeries.data.setAll({df_js});
+                if (stateView) {{
+                    polygonSeries.mapPolygons.template.events.on("click", function(ev) {{
+                        loadState(ev.target.dataItem.get("id"));
+                        polygonSeries.zoomToDataItem(ev.target.dataItem);
+                    }});
+                    chart.on("zoomLevel", loadVisibleStates);
+                    chart.on("translateX", loadVisibleStates);
+                    chart.on("translateY", loadVisibleStates);
+                    loadState("{selected_state_id}");
+                }} else {{
+                    // The station payload is kept in IndexedDB and only fetched when its version changes
+                    loadStations("stations/nbc", "{stations_version}", "{stations_url}")
+                        .then(function(stations) {{
+                            if (pointSeries) {{
+                                pointSeries.data.setAll(stationRecords(stations, "state"));
+                            }} else {{
+                                // One canvas for all stations, hover handled by the layer's grid index
+                                window.indiaStationLayer = new StationCanvasLayer(
+                                    root, chart, document.getElementById("chartdiv"), stations, {{ radius: 7, globe: false }}
+                                );
+                                window.indiaStationLayer.setSelected({selected_js});
+                            }}
+                        }})
+                        .catch(showStationError);
+                }}
 
                 var selectedSeries = chart.series.push(am5map.MapPointSeries.new(root, {{
                     latitudeField: "lat",
@@ -876,156 +981,31 @@ def amcharts_india_map(df, lat_sel, lon_sel, location_name, state_name, climate_
     </script>
     """
 
-    st.components.v1.html(html_code, height=730, scrolling=False)
+    return html_code
 
-def generate_nbc_pdf_report(location_name, state_name, climate_zone, latitude, longitude, zone_info):
-    """Generate a comprehensive PDF report for NBC climate zone"""
-    
-    pdf_buffer = io.BytesIO()
-    
-    doc = SimpleDocTemplate(
-        pdf_buffer,
-        pagesize=letter,
-        rightMargin=0.5*inch,
-        leftMargin=0.5*inch,
-        topMargin=0.5*inch,
-        bottomMargin=0.5*inch
-    )
-    
-    # Container for PDF elements
-    story = []
-    
-    # Define styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=28,
-        textColor=colors.black,
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=18,
-        textColor=colors.HexColor('#1f1f1f'),
-        spaceAfter=10,
-        spaceBefore=10,
-        fontName='Helvetica-Bold'
-    )
-    
-    section_heading_style = ParagraphStyle(
-        'SectionHeading',
-        parent=styles['Heading3'],
-        fontSize=14,
-        textColor=colors.HexColor('#333333'),
-        spaceAfter=8,
-        spaceBefore=8,
-        fontName='Helvetica-Bold'
-    )
-    
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['BodyText'],
-        fontSize=11,
-        alignment=TA_JUSTIFY,
-        spaceAfter=8,
-        leading=14
-    )
-    
-    # Title
-    story.append(Paragraph("Climate Analysis", title_style))
-    story.append(Spacer(1, 0.2*inch))
 
-    # Report Header
-    story.append(Paragraph("Project Information", heading_style))
-    
-    
-    # Table
-    location_data = [
-        ['Property', 'Value'],
-        ['Location', location_name],
-        ['State', state_name],
-        ['Country', 'India'],
-        ['Latitude', f'{latitude:.2f}'],
-        ['Longitude', f'{longitude:.2f}'],
-        ['Climate Zone', climate_zone]
-    ]
-    
-    location_table = Table(location_data, colWidths=[2*inch, 3.5*inch])
-    location_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.whitesmoke),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')]),
-        ('BOX', (0,0), (-1,-1), 2, colors.grey)
-    ]))
-    
-    story.append(location_table)
-    story.append(Spacer(1, 0.3*inch))
-    
-    # Climate Zone Information
-    story.append(Paragraph("Climate Zone Designation", heading_style))
-    
-    zone_info_text = f"""
-    This location falls under the <b>{climate_zone}</b> climate classification as per the 
-    National Building Code (NBC) of India. Understanding the climatic characteristics 
-    of this zone is essential for designing energy-efficient buildings by following the Passive Design Strategies.
-    """
-    story.append(Paragraph(zone_info_text, body_style))
-    story.append(Spacer(1, 0.3*inch))
-    
-    story.append(Paragraph("Passive Design Strategies:", heading_style))
+# Sessions opening the same station at the same moment share one map build
+def amcharts_world_globe(df, lat_sel, lon_sel, location_name, country_name, climate_zone, climate_zone_name,
+                         render_mode="auto", zone_regions=False, frame_probe=False):
+    """Render the ASHRAE globe for the selected station"""
+    key = ("ashrae", load_ashrae_catalog().version, float(lat_sel), float(lon_sel), location_name, country_name,
+           str(climate_zone), str(climate_zone_name), render_mode, zone_regions, frame_probe)
+    html_code, _ = flight_group("map_html").do(key, lambda: world_globe_html(
+        df, lat_sel, lon_sel, location_name, country_name, climate_zone, climate_zone_name,
+        render_mode, zone_regions, frame_probe
+    ))
+    st.components.v1.html(html_code, height=730, scrolling=False)
 
 
-    # Strategy images and descriptions
-    if zone_info and 'images' in zone_info:
-        for i, (img_path, title, description) in enumerate(zip(
-            zone_info['images'], 
-            zone_info['titles'], 
-            zone_info['descriptions']
-        )):
-            story.append(Paragraph(f"{title}", section_heading_style))
-            
-            try:
-                img = Image(img_path, width=3.5*inch, height=2.5*inch)
-                story.append(img)
-                story.append(Spacer(1, 0.10*inch))
-            except:
-                story.append(Paragraph("[Image not available]", body_style))
-                story.append(Spacer(1, 0.1*inch))
-            
-            # Description
-            story.append(Paragraph(description, body_style))
-            story.append(Spacer(1, 0.3*inch))
-    
-    story.append(PageBreak())
-    
-    # Footer information
-    footer_text = f"""
-    <b>Report Generated On:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>
-    <b>Classification Standard:</b> National Building Code (NBC)<br/>
-    <br/>
-    <i>This report provides climate-specific design strategies for sustainable and energy-efficient buildings. 
-    For more information, visit the Climate Zone Finder dashboard.</i>
-    """
-    story.append(Paragraph(footer_text, body_style))
-    
-    # Build PDF
-    doc.build(story)
-    pdf_buffer.seek(0)
-    
-    return pdf_buffer
+def amcharts_india_map(df, lat_sel, lon_sel, location_name, state_name, climate_zone, render_mode="auto", state_view=True):
+    """Render the NBC India map for the selected station"""
+    key = ("nbc", load_nbc_catalog().version, float(lat_sel), float(lon_sel), location_name, state_name,
+           str(climate_zone), render_mode, state_view)
+    html_code, _ = flight_group("map_html").do(key, lambda: india_map_html(
+        df, lat_sel, lon_sel, location_name, state_name, climate_zone, render_mode, state_view
+    ))
+    st.components.v1.html(html_code, height=730, scrolling=False)
+
 
 # Climate zone strategy images and descriptions only for NBC
 def display_climate_zone_images(climate_zone):
@@ -1064,6 +1044,23 @@ def display_climate_zone_images(climate_zone):
                 max-width: 100% !important;
                 object-fit: contain !important;
             }
+
+            .strategy-image {
+                display: flex;
+                justify-content: center;
+                align-items: center;
+                min-height: 300px;
+                background: #ffffff;
+                padding: 10px;
+                margin: 15px 0;
+            }
+
+            .strategy-image img {
+                height: 260px;
+                width: auto;
+                max-width: 100%;
+                object-fit: contain;
+            }
             
             .nbc-image-title {
                 font-size: 20px !important;
@@ -1084,35 +1081,54 @@ def display_climate_zone_images(climate_zone):
             </style>
         """, unsafe_allow_html=True)
         
-        img_col1, img_col2, img_col3 = st.columns(3)
-        
-        with img_col1:
-            st.markdown(f'<div class="nbc-image-title">{zone_info["titles"][0]}</div>', unsafe_allow_html=True)
-            st.image(zone_info["images"][0], use_container_width=True)
-            st.markdown(f'<div class="nbc-image-description">{zone_info["descriptions"][0]}</div>', unsafe_allow_html=True)
-        
-        with img_col2:
-            st.markdown(f'<div class="nbc-image-title">{zone_info["titles"][1]}</div>', unsafe_allow_html=True)
-            st.image(zone_info["images"][1], use_container_width=True)
-            st.markdown(f'<div class="nbc-image-description">{zone_info["descriptions"][1]}</div>', unsafe_allow_html=True)
-        
-        with img_col3:
-            st.markdown(f'<div class="nbc-image-title">{zone_info["titles"][2]}</div>', unsafe_allow_html=True)
-            st.image(zone_info["images"][2], use_container_width=True)
-            st.markdown(f'<div class="nbc-image-description">{zone_info["descriptions"][2]}</div>', unsafe_allow_html=True)
+        img_cols = st.columns(3)
 
+        for img_col, image, title, description in zip(
+            img_cols, zone_info["images"], zone_info["titles"], zone_info["descriptions"]
+        ):
+            with img_col:
+                st.markdown(f'<div class="nbc-image-title">{title}</div>', unsafe_allow_html=True)
+                # Responsive AVIF/WebP variants from the asset server, loaded as they scroll into view
+                picture = picture_html(image, title)
+                if picture:
+                    st.markdown(f'<div class="strategy-image">{picture}</div>', unsafe_allow_html=True)
+                else:
+                    st.image(image, use_container_width=True)
+                st.markdown(f'<div class="nbc-image-description">{description}</div>', unsafe_allow_html=True)
 
 
 
-left_col, right_col = st.columns([1, 2.5])
 
-with left_col:
-    st.markdown('<div class="label-text">Climate Classification Standard</div>', unsafe_allow_html=True)
-    standard_options = ["ASHRAE-169 (2013)", "NBC"]
-    select_standard = st.selectbox("Select Standard", standard_options, key="standard", label_visibility="collapsed", width=250)
 
+
+# The page is split into fragments that rerun on their own: the location
+# selectors ("selection"), the report and EPW buttons ("report"), the map
+# ("map") and the NBC strategy grid ("strategies"). A widget's on_change
+# names the sections that depend on it, so changing it reruns only those
+# instead of the whole script; the selected station is handed between them
+# through st.session_state["station"]. Only the standard selector reruns
+# the full page.
+def rerun_sections(*sections):
+    """on_change callback rerunning only the named fragments"""
+    return lambda: st.rerun(list(sections))
+
+
+def nbc_location_changed():
+    """A new NBC location needs a new strategy grid only when its zone differs"""
+    df = load_nbc_data()
+    result = df[(df["State"] == st.session_state["state"]) & (df["Location"] == st.session_state["nbc_location"])]
+    climate_zone = result.iloc[0]["Climate Zone"] if not result.empty else None
+    sections = ["selection", "report", "map"]
+    if climate_zone != st.session_state.get("station", {}).get("zone"):
+        sections.append("strategies")
+    st.rerun(sections)
+
+
+@st.fragment(key="selection")
+def selection_panel(standard):
+    """Location selectors and the zone of the selected station, stored as st.session_state["station"]"""
     # ASHRAE Standard
-    if select_standard == "ASHRAE-169 (2013)":
+    if standard == "ASHRAE-169 (2013)":
         df = load_ashrae_data()
 
         st.markdown('<div class="section-title">Location Selection</div>', unsafe_allow_html=True)
@@ -1120,19 +1136,25 @@ with left_col:
         # Country
         st.markdown('<div class="label-text">Country</div>', unsafe_allow_html=True)
         countries = sorted(df["Country"].unique())
-        selected_country = st.selectbox("Country", countries, key="country", label_visibility="collapsed", width=250)
+        selected_country = st.selectbox(
+            "Country", countries, key="country", label_visibility="collapsed", width=250,
+            on_change=rerun_sections("selection", "report", "map")
+        )
 
         # Location
         st.markdown('<div class="label-text">Location</div>', unsafe_allow_html=True)
         locations = sorted(df[df["Country"] == selected_country]["Location"].unique())
-        selected_location = st.selectbox("Location", locations, key="location", label_visibility="collapsed", width=250)
+        selected_location = st.selectbox(
+            "Location", locations, key="location", label_visibility="collapsed", width=250,
+            on_change=rerun_sections("selection", "report", "map")
+        )
 
         # Climate Zone
         result = df[(df["Country"] == selected_country) & (df["Location"] == selected_location)]
         st.markdown('<div class="label-text">Climate Zone:</div>', unsafe_allow_html=True)
         if not result.empty:
             climate_zone = result.iloc[0]["Climate Zone"]
-            zone_color = get_ashrae_zone_color(df, climate_zone)
+            zone_color = get_ashrae_zone_color(climate_zone)
             st.markdown(
                 f'<p style="font-size: 28px; font-weight: bold; color: {zone_color}; margin: 10px 0;">{climate_zone}</p>',
                 unsafe_allow_html=True,
@@ -1146,7 +1168,7 @@ with left_col:
         st.markdown('<div class="label-text">Climate Zone Name:</div>', unsafe_allow_html=True)
         if not result.empty:
             climate_zone_name = result.iloc[0]["Climate Zone Name"]
-            zone_color = get_ashrae_zone_color(df, climate_zone)
+            zone_color = get_ashrae_zone_color(climate_zone)
             st.markdown(
                 f'<p style="font-size: 18px; font-weight: 500; color: {zone_color}; margin: 10px 0;">{climate_zone_name}</p>',
                 unsafe_allow_html=True,
@@ -1156,37 +1178,14 @@ with left_col:
             st.markdown('<p style="font-size: 18px; font-weight: 500; color: #dc3545; margin: 10px 0;">-</p>',
                         unsafe_allow_html=True)
 
-        # Buttons
-
-        # st.markdown("""
-        # <style>
-        # div.stButton > button:first-child {
-        #     background-color: #a85c42;
-        #     color: white;
-        #     height: 3em;
-        #     font-size: 16px;
-        # }
-        # div.stButton > button:first-child:hover {
-        #     background-color: #E63E3E;
-        #     color: white;
-        # }
-        # </style>
-        # """, unsafe_allow_html=True)
-
-        report_clicked = st.button("Generate Report", type="secondary", width=200)
-        if not result.empty and pd.notna(result.iloc[0].get("EPW File", None)):
-            epw_url = result.iloc[0]["EPW File"]
-            if epw_url and str(epw_url).strip() != "" and str(epw_url) != "0":
-                st.button("Download EPW ", epw_url, type="secondary", width=200)
-            else:
-                st.button("Download EPW", type="secondary", disabled=True, width=200)
-        else:
-            st.button("Download EPW", type="secondary", disabled=True, width=200)    
-        if report_clicked and not result.empty:
-            st.info("Report generation for ASHRAE is under development. Please check back soon.")
+        st.session_state["station"] = {
+            "standard": standard, "location": selected_location, "country": selected_country,
+            "zone": climate_zone, "zone_name": climate_zone_name,
+            "row": result.iloc[0].to_dict() if not result.empty else None,
+        }
 
     # NBC Standard (India)
-    elif select_standard == "NBC":
+    elif standard == "NBC":
         df = load_nbc_data()
         
         st.markdown('<div class="section-title">Location Selection</div>', unsafe_allow_html=True)
@@ -1204,11 +1203,17 @@ with left_col:
         default_state = "Delhi"        
         default_index = states.index(default_state) if default_state in states else 0
 
-        selected_state = st.selectbox("State", states, index=default_index, key="state", label_visibility="collapsed", width=300)
+        selected_state = st.selectbox(
+            "State", states, index=default_index, key="state", label_visibility="collapsed", width=300,
+            on_change=rerun_sections("selection", "report", "map", "strategies")
+        )
         
         st.markdown('<div class="label-text">Location</div>', unsafe_allow_html=True)
         locations = sorted(df[df["State"] == selected_state]["Location"].unique())
-        selected_location = st.selectbox("Location", locations, key="nbc_location", label_visibility="collapsed", width=300)
+        selected_location = st.selectbox(
+            "Location", locations, key="nbc_location", label_visibility="collapsed", width=300,
+            on_change=nbc_location_changed
+        )
         
         result = df[(df["State"] == selected_state) & (df["Location"] == selected_location)]
         
@@ -1224,10 +1229,77 @@ with left_col:
             climate_zone = None
             st.markdown('<p style="font-size: 28px; font-weight: bold; color: #dc3545; margin: 10px 0;">-</p>',
                         unsafe_allow_html=True)
-        
+
+        st.session_state["station"] = {
+            "standard": standard, "location": selected_location, "state": selected_state,
+            "zone": climate_zone, "row": result.iloc[0].to_dict() if not result.empty else None,
+        }
+
+
+@st.fragment(key="report")
+def report_panel(standard):
+    """Report and EPW buttons of the selected station"""
+    station = st.session_state["station"]
+    row = station["row"]
+
+    if standard == "ASHRAE-169 (2013)":
+        # Buttons
+
+        # st.markdown("""
+        # <style>
+        # div.stButton > button:first-child {
+        #     background-color: #a85c42;
+        #     color: white;
+        #     height: 3em;
+        #     font-size: 16px;
+        # }
+        # div.stButton > button:first-child:hover {
+        #     background-color: #E63E3E;
+        #     color: white;
+        # }
+        # </style>
+        # """, unsafe_allow_html=True)
+
+        if row is not None:
+            epw_url = row.get("EPW File", None)
+            epw_available = pd.notna(epw_url) and str(epw_url).strip() not in ("", "0")
+            state_province = row.get("State/Province", "")
+            filename = f"Climate_Zone_Report_{station['location']}_{station['zone']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+
+            report_args = (
+                station["location"],
+                "" if pd.isna(state_province) else str(state_province),
+                station["country"],
+                station["zone"],
+                station["zone_name"],
+                load_ashrae_catalog().version,
+                float(row["Latitude"]),
+                float(row["Longitude"]),
+                bool(epw_available),
+            )
+            # Built in the background from the station's cover and the cached zone pages
+            if st.button("Generate Report", type="secondary", width=200, on_click=rerun_sections("report")):
+                st.session_state["report_job"] = ashrae_report_job(
+                    *report_args, basemap=load_basemap("ashrae", report_args[5])
+                )
+            report_job_panel(ashrae_report_key(*report_args), filename)
+        else:
+            st.button("Generate Report", type="secondary", disabled=True, width=200)
+        if row is not None and pd.notna(row.get("EPW File", None)):
+            epw_url = row["EPW File"]
+            if epw_url and str(epw_url).strip() != "" and str(epw_url) != "0":
+                st.button("Download EPW ", epw_url, type="secondary", width=200)
+            else:
+                st.button("Download EPW", type="secondary", disabled=True, width=200)
+        else:
+            st.button("Download EPW", type="secondary", disabled=True, width=200)    
+
+    elif standard == "NBC":
+        climate_zone = station["zone"]
+
         # report_clicked = st.button("Generate Report", type="primary", use_container_width=False)
-        if not result.empty and pd.notna(result.iloc[0].get("EPW File", None)):
-            epw_url = result.iloc[0]["EPW File"]
+        if row is not None and pd.notna(row.get("EPW File", None)):
+            epw_url = row["EPW File"]
             if epw_url and str(epw_url).strip() != "" and str(epw_url) != "0":
                 st.link_button("Download EPW", epw_url, type="secondary", use_container_width=False, width=200)
             else:
@@ -1235,80 +1307,105 @@ with left_col:
         else:
             st.button("Download EPW", type="secondary", disabled=True, use_container_width=False, width=200)
         
-        # report_clicked and not result.empty:
-        epw_file = result.iloc[0].get("EPW File", "Not Available")
-        lat_selected = result.iloc[0]["Latitude"]
-        lon_selected = result.iloc[0]["Longitude"]
-        
         # Use the CLIMATE_ZONE_DATA to display the image and discriptions
-        if climate_zone in CLIMATE_ZONE_DATA:
-            zone_info = CLIMATE_ZONE_DATA[climate_zone]
+        if row is not None and climate_zone in CLIMATE_ZONE_DATA:
+            lat_selected = row["Latitude"]
+            lon_selected = row["Longitude"]
+            filename = f"Climate_Zone_Report_{station['location']}_{climate_zone}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
             
-            # Generate PDF
-            pdf_buffer = generate_nbc_pdf_report(
-                selected_location,
-                selected_state,
+            report_args = (
+                station["location"],
+                station["state"],
                 climate_zone,
-                lat_selected,
-                lon_selected,
-                zone_info
-            )
-            
-            pdf_buffer.seek(0)
-            pdf_data = pdf_buffer.getvalue()
-            filename = f"Climate_Zone_Report_{selected_location}_{climate_zone}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            
-            st.download_button(
-            label="Generate Report",
-            data=pdf_data,
-            file_name=filename,
-            mime="application/pdf",
-            type="primary",
-            use_container_width=False
+                load_nbc_catalog().version,
+                float(lat_selected),
+                float(lon_selected)
             )
+            # The PDF is built in the background when the button is clicked
+            if st.button("Generate Report", type="primary", use_container_width=False,
+                         on_click=rerun_sections("report")):
+                st.session_state["report_job"] = nbc_report_job(
+                    *report_args, basemap=load_basemap("nbc", report_args[3])
+                )
+            report_job_panel(nbc_report_key(*report_args), filename)
+            # On-screen report, rendered by the asset server from the cached zone fragment
+            view_url = html_report_url(station["location"], station["state"])
+            if view_url:
+                st.link_button("View Report", view_url, type="secondary", width=200)
 
             
         else:
             st.error("Climate zone data not available for PDF generation.")
 
 
-# Right Column - Map Display
-with right_col:
-    if select_standard == "ASHRAE-169 (2013)":
-        if not result.empty:
-            lat_selected = result.iloc[0]["Latitude"]
-            lon_selected = result.iloc[0]["Longitude"]
+@st.fragment(key="map")
+def map_panel(standard):
+    """Interactive map (or the lite map) of the selected station"""
+    station = st.session_state["station"]
+    row = station["row"]
+    selected_location = station["location"]
+
+    # Static map for low-bandwidth clients: prebuilt tiles when available, else a snapshot
+    tile_dataset = "ashrae" if standard == "ASHRAE-169 (2013)" else "nbc"
+    lite_map = st.toggle(
+        "Lite map", key="lite_map", help="Show a static map instead of the interactive globe",
+        on_change=rerun_sections("map")
+    )
+
+    if lite_map and row is not None and pd.notna(row["Latitude"]) and pd.notna(row["Longitude"]):
+        lite_lat, lite_lon = float(row["Latitude"]), float(row["Longitude"])
+        tiles_version = tile_manifest_version(tile_dataset)
+        if tiles_version is not None:
+            st.image(lite_map_image(tile_dataset, tiles_version, lite_lat, lite_lon), use_container_width=True)
+        else:
+            # No tile pyramid built: fall back to the matplotlib snapshot
+            tile_catalog = load_nbc_catalog() if tile_dataset == "nbc" else load_ashrae_catalog()
+            st.image(
+                station_snapshot(tile_dataset, tile_catalog.version, selected_location, lite_lat, lite_lon, "report"),
+                use_container_width=True
+            )
+
+    elif standard == "ASHRAE-169 (2013)":
+        if row is not None:
+            lat_selected = row["Latitude"]
+            lon_selected = row["Longitude"]
                 
             # Check if coordinates are valid
             if pd.notna(lat_selected) and pd.notna(lon_selected):
+                show_regions = st.toggle(
+                    "Zone regions", key="zone_regions", help="Shade the regions covered by each climate zone",
+                    on_change=rerun_sections("map")
+                )
                 amcharts_world_globe(
-                    df,
+                    load_ashrae_data(),
                     lat_selected,
                     lon_selected,
                     selected_location,
-                    selected_country,
-                    climate_zone,
-                    climate_zone_name
+                    station["country"],
+                    station["zone"],
+                    station["zone_name"],
+                    zone_regions=show_regions,
+                    frame_probe=bool(os.environ.get("CZF_FRAME_PROBE"))
                 )
             else:
                 st.warning(f"⚠️ Coordinates not available for {selected_location}. Please select a different location.")
         else:
             st.info("Please select a location to view on the map.")
     
-    elif select_standard == "NBC":
-        if not result.empty:
-            lat_selected = result.iloc[0]["Latitude"]
-            lon_selected = result.iloc[0]["Longitude"]
+    elif standard == "NBC":
+        if row is not None:
+            lat_selected = row["Latitude"]
+            lon_selected = row["Longitude"]
             
             # Check if coordinates are valid
             if pd.notna(lat_selected) and pd.notna(lon_selected):
                 amcharts_india_map(
-                    df,
+                    load_nbc_data(),
                     lat_selected,
                     lon_selected,
                     selected_location,
-                    selected_state,
-                    climate_zone
+                    station["state"],
+                    station["zone"]
                 )
             else:
                 st.warning(f"⚠️ Coordinates not available for {selected_location}. Please select a different location.")
@@ -1316,11 +1413,34 @@ with right_col:
             st.info("Please select a location to view on the map.")
 
 
+@st.fragment(key="strategies")
+def strategy_panel():
+    """NBC strategy grid of the selected station's zone"""
+    station = st.session_state["station"]
+    if station["row"] is not None and station["zone"]:
+        display_climate_zone_images(station["zone"])
+
+
+left_col, right_col = st.columns([1, 2.5])
+
+with left_col:
+    st.markdown('<div class="label-text">Climate Classification Standard</div>', unsafe_allow_html=True)
+    standard_options = ["ASHRAE-169 (2013)", "NBC"]
+    select_standard = st.selectbox("Select Standard", standard_options, key="standard", label_visibility="collapsed", width=250)
+
+    selection_panel(select_standard)
+    report_panel(select_standard)
+
+
+# Right Column - Map Display
+with right_col:
+    map_panel(select_standard)
+
+
 # Images Section - Display below the map (outside columns)
 if select_standard == "NBC":
-    if not result.empty and climate_zone:
-        display_climate_zone_images(climate_zone)
+    strategy_panel()
 
 
 # Adding extra space at the bottom
-st.markdown("<br><br>", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("<br><br>", unsafe_allow_html=True)
@@ -0,0 +1,180 @@
+"""On-screen HTML version of the NBC climate zone report.
+
+Most visitors only read the report in the browser, so the asset server
+also serves it as HTML. Like the composed PDF, the passive design strategy
+part depends only on the climate zone: each zone's strategy fragment is
+rendered once per process from CLIMATE_ZONE_DATA, and a report is a small
+per-location header in front of it. The page has no generation time, so
+the same inputs always give the same bytes and the server can answer
+revalidations with 304 from the ETag (a hash of the page).
+
+    /reports/nbc.html?location=..&state=..   the report
+    /reports/nbc.pdf?<same query>             its PDF, built on demand
+
+The station is looked up in the NBC dataset, which supplies its zone and
+coordinates, so only the dataset's stations have reports; anything else
+is rejected before a page or PDF is built. The PDF is the composed NBC
+report (without the station map), stored in the report cache like the
+app's downloads.
+"""
+import html
+import os
+from functools import lru_cache
+from urllib.parse import parse_qs, urlencode
+
+import pandas as pd
+
+from assets import ASSET_BASE_URL, BUILD_DIR, asset_server_reachable, content_hash, static_asset
+from climate_data import CLIMATE_ZONE_DATA
+from image_pipeline import variant_path
+from pdf_reports import NBC_REPORT_TEMPLATE_VERSION, NBC_STANDARD
+from report_cache import report_key
+from zone_catalog import normalize_zones
+
+
+NBC_DATASET = "INDIA-WeatherMapping.xlsx"
+
+
+REPORT_CSS = """
+body { font-family: Helvetica, Arial, sans-serif; color: #1f1f1f; max-width: 820px; margin: 32px auto; padding: 0 16px; }
+h1 { text-align: center; font-size: 32px; margin-bottom: 24px; }
+h2 { font-size: 22px; margin-top: 28px; }
+h3 { font-size: 17px; color: #333; margin: 24px 0 8px; }
+table { border-collapse: collapse; width: 100%; max-width: 520px; border: 2px solid grey; }
+th, td { border: 1px solid black; padding: 6px 10px; text-align: left; font-size: 14px; }
+th { background: whitesmoke; font-size: 15px; }
+td:first-child { font-weight: bold; }
+tr:nth-child(even) td { background: #f0f0f0; }
+.strategy img { display: block; max-width: 100%; height: 260px; object-fit: contain; margin: 8px 0; }
+p { line-height: 1.45; text-align: justify; }
+.actions { text-align: right; }
+.actions a { color: #fff; background: #a85c42; padding: 8px 14px; text-decoration: none; border-radius: 4px; }
+footer { margin-top: 40px; font-size: 14px; color: #555; }
+@media print { .actions { display: none; } .strategy { break-inside: avoid; } }
+"""
+
+
+def strategy_image_url(source):
+    """URL of a strategy image relative to /reports/: the UI variant, or the source inlined when not built"""
+    path = variant_path(source, "ui")
+    if path != source:
+        return "../" + os.path.relpath(path, BUILD_DIR).replace(os.sep, "/")
+    if not os.path.exists(source):
+        return None
+    return static_asset(source)["data_uri"]
+
+
+@lru_cache(maxsize=None)
+def _zone_fragment(climate_zone, image_urls):
+    zone_info = CLIMATE_ZONE_DATA[climate_zone]
+    parts = ['<section class="strategies">', "<h2>Passive Design Strategies</h2>"]
+    for url, title, description in zip(image_urls, zone_info["titles"], zone_info["descriptions"]):
+        image = (
+            f'<img src="{html.escape(url)}" alt="{html.escape(title)}" loading="lazy">'
+            if url else "<p>[Image not available]</p>"
+        )
+        parts.append(
+            f'<div class="strategy"><h3>{html.escape(title)}</h3>{image}<p>{html.escape(description)}</p></div>'
+        )
+    parts.append("</section>")
+    return "\n".join(parts)
+
+
+def nbc_zone_fragment(climate_zone):
+    """HTML of a zone's strategies, rendered once per zone (and image build)"""
+    zone_info = CLIMATE_ZONE_DATA[climate_zone]
+    return _zone_fragment(climate_zone, tuple(strategy_image_url(path) for path in zone_info["images"]))
+
+
+def nbc_header_html(location_name, state_name, climate_zone, latitude, longitude):
+    """Project information table and zone designation of one location"""
+    rows = [
+        ("Location", location_name),
+        ("State", state_name),
+        ("Country", "India"),
+        ("Latitude", f"{latitude:.2f}"),
+        ("Longitude", f"{longitude:.2f}"),
+        ("Climate Zone", climate_zone),
+    ]
+    table = "".join(f"<tr><td>{name}</td><td>{html.escape(str(value))}</td></tr>" for name, value in rows)
+    return (
+        "<h1>Climate Analysis</h1>"
+        "<h2>Project Information</h2>"
+        f"<table><tr><th>Property</th><th>Value</th></tr>{table}</table>"
+        "<h2>Climate Zone Designation</h2>"
+        f"<p>This location falls under the <b>{html.escape(climate_zone)}</b> climate classification as per the "
+        "National Building Code (NBC) of India. Understanding the climatic characteristics of this zone is "
+        "essential for designing energy-efficient buildings by following the Passive Design Strategies.</p>"
+    )
+
+
+def render_nbc_html_report(location_name, state_name, climate_zone, latitude, longitude):
+    """Complete HTML page of an NBC report: header, the zone's cached fragment, footer"""
+    query = html.escape(nbc_report_query(location_name, state_name))
+    return (
+        "<!DOCTYPE html>\n<html lang=\"en\"><head><meta charset=\"utf-8\">"
+        "<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">"
+        f"<title>Climate Analysis - {html.escape(location_name)}</title><style>{REPORT_CSS}</style></head><body>\n"
+        f'<div class="actions"><a href="nbc.pdf?{query}">Download PDF</a></div>\n'
+        f"{nbc_header_html(location_name, state_name, climate_zone, latitude, longitude)}\n"
+        f"{nbc_zone_fragment(climate_zone)}\n"
+        f"<footer><b>Classification Standard:</b> {NBC_STANDARD}<br><br><i>This report provides "
+        "climate-specific design strategies for sustainable and energy-efficient buildings. For more "
+        "information, visit the Climate Zone Finder dashboard.</i></footer>\n</body></html>\n"
+    )
+
+
+def html_etag(body):
+    """Strong ETag of a rendered page"""
+    return f'"{content_hash(body.encode("utf-8"), 20)}"'
+
+
+@lru_cache(maxsize=1)
+def nbc_stations():
+    """{(state, location): (zone, latitude, longitude)} of the NBC stations that have a report"""
+    df = normalize_zones(pd.read_excel(NBC_DATASET))
+    df = df[df["Climate Zone"].isin(CLIMATE_ZONE_DATA) & df["Latitude"].notna() & df["Longitude"].notna()]
+    return {
+        (state, location): (zone, round(float(lat), 4), round(float(lon), 4))
+        for state, location, zone, lat, lon in zip(
+            df["State"], df["Location"], df["Climate Zone"], df["Latitude"], df["Longitude"]
+        )
+    }
+
+
+def nbc_report_query(location_name, state_name):
+    """Query string identifying an NBC report"""
+    return urlencode({"location": location_name, "state": state_name})
+
+
+def parse_nbc_report_query(query):
+    """Report arguments of the station a query names, from the NBC dataset.
+
+    ValueError when location or state is missing, LookupError when the
+    dataset has no reportable station of that name.
+    """
+    params = {name: values[0] for name, values in parse_qs(query).items()}
+    try:
+        location_name, state_name = params["location"], params["state"]
+    except KeyError:
+        raise ValueError("location and state are required")
+    station = nbc_stations().get((state_name, location_name))
+    if station is None:
+        raise LookupError(f"no NBC station {location_name!r} in {state_name!r}")
+    return (location_name, state_name) + station
+
+
+def html_report_url(location_name, state_name):
+    """Browser URL of a location's HTML report, or None when it has no report or no asset server is reachable"""
+    if not asset_server_reachable() or (state_name, location_name) not in nbc_stations():
+        return None
+    return f"{ASSET_BASE_URL}/reports/nbc.html?" + nbc_report_query(location_name, state_name)
+
+
+def nbc_html_pdf_key(location_name, state_name, climate_zone, latitude, longitude):
+    """Report cache key of the on-demand PDF of an HTML report (no station map)"""
+    return report_key(
+        "nbc-html", NBC_REPORT_TEMPLATE_VERSION, location=location_name, state=state_name, zone=climate_zone,
+        latitude=latitude, longitude=longitude,
+        strategies=CLIMATE_ZONE_DATA.get(climate_zone)
+    )
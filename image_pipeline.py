@@ -0,0 +1,227 @@
+"""Build-time variants of the strategy images for the PDF reports and the UI.
+
+The source PNGs in images/ are around 1000 px wide with an alpha channel,
+while the reports print them at 3.5 x 2.5 inches. Each profile resizes a
+source to its target box and recompresses it (JPEG for the reports, which
+ReportLab embeds as-is instead of re-encoding; WebP for the browser);
+variants get content-hashed names under static/build/images and are
+listed in a manifest, so unchanged sources are skipped on a rebuild.
+
+The strategy grids of the apps show the images 260 px high. They get
+AVIF and WebP variants at a few widths, and picture_html() returns a lazy
+<picture> element whose srcset lets the browser pick the format and the
+width for its screen. The asset server serves the variants as immutable
+files, so a rerun sends a few hundred bytes of markup instead of the
+source PNGs. Without a reachable public asset server picture_html()
+returns None and the apps fall back to st.image.
+
+    python image_pipeline.py            # build missing variants
+    python image_pipeline.py --force    # rebuild everything
+
+Lookups fall back to the source file when no variant has been built.
+"""
+import hashlib
+import html
+import io
+import json
+import os
+import sys
+from functools import lru_cache
+
+from PIL import Image
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Flowable
+
+from assets import ASSET_BASE_URL, BUILD_DIR, asset_server_reachable
+
+
+SOURCE_DIR = "images"
+IMAGES_DIR = os.path.join(BUILD_DIR, "images")
+IMAGE_MANIFEST_PATH = os.path.join(IMAGES_DIR, "manifest.json")
+
+# Profile -> target box in pixels, output format and encoder settings.
+# "pdf" covers the largest report placement (4 x 3 inches) at 150 DPI.
+IMAGE_PROFILES = {
+    "pdf": {"box": (600, 450), "format": "JPEG", "ext": ".jpg", "options": {"quality": 85, "optimize": True}},
+    "ui": {"box": (800, 800), "format": "WEBP", "ext": ".webp", "options": {"quality": 80, "method": 4}},
+}
+
+# Responsive variants for the strategy grids: 1x and 2x of the 260 px display height, plus one between
+GRID_IMAGE_HEIGHT = 260
+GRID_WIDTHS = (320, 480, 640)
+GRID_FORMATS = {
+    "avif": {"format": "AVIF", "ext": ".avif", "options": {"quality": 55, "speed": 8}},
+    "webp": {"format": "WEBP", "ext": ".webp", "options": {"quality": 78, "method": 4}},
+}
+for _name, _spec in GRID_FORMATS.items():
+    for _width in GRID_WIDTHS:
+        IMAGE_PROFILES[f"grid-{_name}-{_width}"] = dict(_spec, box=(_width, _width))
+
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+_manifest_cache = {"mtime": None, "data": {}}
+
+
+def _profile_digest(profile):
+    return hashlib.sha256(json.dumps(IMAGE_PROFILES[profile], sort_keys=True).encode()).hexdigest()[:8]
+
+
+def render_variant(source, profile):
+    """Encoded bytes and pixel size of one source image in one profile"""
+    spec = IMAGE_PROFILES[profile]
+    with Image.open(source) as im:
+        im.thumbnail(spec["box"], Image.LANCZOS)
+        if spec["format"] == "JPEG" and im.mode != "RGB":
+            # JPEG has no alpha: flatten onto the white page background
+            flat = Image.new("RGB", im.size, "white")
+            flat.paste(im, mask=im.convert("RGBA").split()[-1])
+            im = flat
+        out = io.BytesIO()
+        im.save(out, format=spec["format"], **spec["options"])
+        return out.getvalue(), im.size
+
+
+def load_image_manifest():
+    """Source path -> {profile: variant record}, reloaded when the manifest changes"""
+    try:
+        mtime = os.path.getmtime(IMAGE_MANIFEST_PATH)
+    except OSError:
+        return {}
+    if _manifest_cache["mtime"] != mtime:
+        with open(IMAGE_MANIFEST_PATH, encoding="utf-8") as f:
+            _manifest_cache["data"] = json.load(f)
+        _manifest_cache["mtime"] = mtime
+    return _manifest_cache["data"]
+
+
+def build_images(sources=None, profiles=None, force=False):
+    """Build the variants of every source image; returns (built, skipped) counts"""
+    if sources is None:
+        sources = sorted(
+            os.path.join(SOURCE_DIR, name) for name in os.listdir(SOURCE_DIR)
+            if name.lower().endswith(SOURCE_EXTENSIONS)
+        )
+    profiles = profiles or list(IMAGE_PROFILES)
+    manifest = {} if force else dict(load_image_manifest())
+    built = skipped = 0
+
+    for source in sources:
+        with open(source, "rb") as f:
+            source_hash = hashlib.sha256(f.read()).hexdigest()[:12]
+        entry = manifest.setdefault(source, {})
+        # Records of profiles that no longer exist are dropped
+        for stale in set(entry) - set(IMAGE_PROFILES):
+            del entry[stale]
+        for profile in profiles:
+            record = entry.get(profile)
+            if (record and record["source"] == source_hash and record["profile"] == _profile_digest(profile)
+                    and os.path.exists(os.path.join(BUILD_DIR, record["file"]))):
+                skipped += 1
+                continue
+            data, (width, height) = render_variant(source, profile)
+            stem = os.path.splitext(os.path.basename(source))[0].replace(" ", "_")
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            name = f"images/{stem}.{profile}.{digest}{IMAGE_PROFILES[profile]['ext']}"
+            path = os.path.join(BUILD_DIR, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            entry[profile] = {
+                "file": name,
+                "source": source_hash,
+                "profile": _profile_digest(profile),
+                "width": width,
+                "height": height,
+                "bytes": len(data),
+            }
+            built += 1
+
+    os.makedirs(IMAGES_DIR, exist_ok=True)
+    tmp = f"{IMAGE_MANIFEST_PATH}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, IMAGE_MANIFEST_PATH)
+    return built, skipped
+
+
+def variant_path(source, profile):
+    """File path of a source image's variant, or the source itself when not built"""
+    record = load_image_manifest().get(source, {}).get(profile)
+    if record:
+        path = os.path.join(BUILD_DIR, record["file"])
+        if os.path.exists(path):
+            return path
+    return source
+
+
+def grid_variants(source, fmt):
+    """(file, width, height) of the built grid variants of a source in one format, smallest first"""
+    entry = load_image_manifest().get(source, {})
+    records = [entry.get(f"grid-{fmt}-{width}") for width in GRID_WIDTHS]
+    return [(r["file"], r["width"], r["height"]) for r in records if r]
+
+
+def picture_html(source, alt=""):
+    """Lazy-loaded <picture> of a strategy image, or None when its grid variants are not built.
+
+    Also None without a reachable public asset server, since nothing would serve the variants.
+    """
+    if not asset_server_reachable():
+        return None
+    webp = grid_variants(source, "webp")
+    if not webp:
+        return None
+    _, width, height = webp[-1]
+    # Shown at a fixed height, so the displayed width follows from the aspect ratio
+    sizes = f"{round(GRID_IMAGE_HEIGHT * width / height)}px"
+    sources = "".join(
+        f'<source type="image/{fmt}" srcset="{", ".join(f"{ASSET_BASE_URL}/{file} {w}w" for file, w, _ in variants)}" '
+        f'sizes="{sizes}">'
+        for fmt, variants in (("avif", grid_variants(source, "avif")), ("webp", webp)) if variants
+    )
+    return (
+        f'<picture class="strategy-picture">{sources}'
+        f'<img src="{ASSET_BASE_URL}/{webp[0][0]}" alt="{html.escape(alt)}" width="{width}" height="{height}" '
+        f'loading="lazy" decoding="async"></picture>'
+    )
+
+
+# The encoded bytes are shared; ImageReader is not thread-safe, so each
+# report (report job threads, batch builds) gets its own reader over them
+@lru_cache(maxsize=128)
+def _image_bytes(path, mtime):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def report_image_reader(source, profile="pdf"):
+    """New ImageReader of the variant, over bytes read once per process"""
+    path = variant_path(source, profile)
+    return ImageReader(io.BytesIO(_image_bytes(path, os.path.getmtime(path))))
+
+
+class ReportImage(Flowable):
+    """Image flowable drawn from an ImageReader over cached bytes instead of re-reading the file"""
+
+    def __init__(self, reader, width, height):
+        super().__init__()
+        self.reader = reader
+        self.width, self.height = width, height
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        self.canv.drawImage(self.reader, 0, 0, self.width, self.height, mask="auto")
+
+
+def report_image(source, width, height, profile="pdf"):
+    """ReportImage of a source image's variant"""
+    return ReportImage(report_image_reader(source, profile), width, height)
+
+
+if __name__ == "__main__":
+    built, skipped = build_images(force="--force" in sys.argv)
+    print(f"{built} variants built, {skipped} up to date -> {IMAGES_DIR}")
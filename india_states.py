@@ -0,0 +1,50 @@
+"""Per-state aggregation of the NBC India station dataset.
+
+Used by the India map's state choropleth: each state is drawn in the color
+of its majority climate zone, and its stations are only sent to the browser
+when the user selects or zooms into it.
+"""
+from collections import Counter
+
+
+# The dataset's state codes mostly follow ISO 3166-2:IN, which is what the
+# amCharts indiaLow polygons use as ids; these are the exceptions.
+STATE_CODE_FIXES = {
+    "CG": "CH",   # Chandigarh
+    "Leh": "LA",  # Ladakh
+    "LK": "LD",   # Lakshadweep
+    "MG": "ML",   # Meghalaya
+}
+
+STATE_CODE_COLUMN = "Unnamed: 2"
+
+
+def state_geo_id(code):
+    """Map polygon id ("IN-DL") for a dataset state code"""
+    code = str(code).strip()
+    return "IN-" + STATE_CODE_FIXES.get(code, code)
+
+
+def build_state_aggregates(df, catalog):
+    """One record per state: majority zone, zone mix, station count and centre"""
+    df_valid = df.dropna(subset=["Latitude", "Longitude"])
+    zone_order = {z: i for i, z in enumerate(catalog.zones)}
+    aggregates = []
+    for (state, code), group in df_valid.groupby(["State", STATE_CODE_COLUMN], sort=True):
+        counts = Counter(group["Climate Zone"])
+        # Most stations wins; ties go to the zone listed first in the catalog
+        mix = sorted(counts.items(), key=lambda item: (-item[1], zone_order.get(item[0], len(zone_order))))
+        majority = mix[0][0]
+        total = len(group)
+        aggregates.append({
+            "id": state_geo_id(code),
+            "state": state,
+            "count": total,
+            "zone": majority,
+            "color": catalog.color(majority),
+            "zones": {z: n for z, n in mix},
+            "mix": ", ".join(f"{z} {n * 100 // total}%" for z, n in mix),
+            "lat": round(float(group["Latitude"].mean()), 4),
+            "lon": round(float(group["Longitude"].mean()), 4),
+        })
+    return aggregates
@@ -1,5 +1,8 @@
 import streamlit as st
 import pandas as pd
+from climate_data import get_climate_strategies
+from asset_server import start_asset_server
+from image_pipeline import build_images, picture_html
 
 # Page configuration
 st.set_page_config(
@@ -46,6 +49,16 @@ st.markdown("""
         background-color: white;
         border: 1px solid #ddd;
     }
+    .strategy-image {
+        text-align: center;
+        margin-bottom: 15px;
+    }
+    .strategy-image img {
+        height: 260px;
+        width: auto;
+        max-width: 100%;
+        object-fit: contain;
+    }
     /* make the REPORT button style a bit nicer */
     .stButton>button {
         background-color: #dc3545;
@@ -72,198 +85,21 @@ st.markdown("""
     </div>
 """, unsafe_allow_html=True)
 
+# Strategy image variants are built once per process and served by the asset server
+@st.cache_resource
+def start_image_assets():
+    build_images()
+    return start_asset_server()
+
+
+start_image_assets()
+
 # Load data function
 @st.cache_data
 def load_data():
     df = pd.read_excel("US&InternationStations-ClimateZones.xlsx")
     return df
 
-# Climate zone strategy mapping
-def get_climate_strategies(zone_name):
-    """Returns passive design strategies based on climate zone name"""
-    strategies = {
-        "Hot Dry": {
-            "title": "Hot-Dry",
-            "color": "#dc3545",
-            "strategies": [
-                {
-                    "name": "Surface area to volume ratio",
-                    "image": "images/surface_ratio.png",
-                    "description": "In hot & dry regions, building's shape needs to be compact to reduce heat gain and losses, respectively. The surface to volume(S/V) ratio of the building should be as low as possible to minimize heat gain."
-                },
-                {
-                    "name": "Evaporative Cooling",
-                    "image": "images/evaporative_cooling.png",
-                    "description": "Evaporative cooling is mostly effective in hot and dry climate where the humidity is low. Water in pools and fountains can be used as a cooling element along with cross-ventilating arrangement of openings."
-                },
-                {
-                    "name": "Cool Roof",
-                    "image": "images/cool_roof.png",
-                    "description": "Cool roofs reflect most of the solar radiation and efficiently emit some of the absorbed radiation back into the atmosphere, instead of conducting it to the building below."
-                }
-            ]
-        },
-        "Hot Humid": {
-            "title": "Hot-Humid",
-            "color": "#ff6b35",
-            "strategies": [
-                {
-                    "name": "Natural Ventilation",
-                    "image": "images/natural_ventilation.png",
-                    "description": "In hot-humid climates, maximizing natural ventilation is crucial. Cross-ventilation and stack ventilation help remove excess humidity and heat from indoor spaces."
-                },
-                {
-                    "name": "Shading Devices",
-                    "image": "images/shading_devices.png",
-                    "description": "External shading devices like overhangs, louvers, and vegetation prevent direct solar radiation while allowing natural light and ventilation."
-                },
-                {
-                    "name": "Elevated Buildings",
-                    "image": "images/elevated_buildings.png",
-                    "description": "Elevating buildings on stilts or pillars improves air circulation underneath, reduces ground moisture impact, and enhances cooling through natural ventilation."
-                }
-            ]
-        },
-        "Warm Humid": {
-            "title": "Warm-Humid",
-            "color": "#ffa500",
-            "strategies": [
-                {
-                    "name": "Orientation and Layout",
-                    "image": "images/orientation_layout.png",
-                    "description": "Building orientation should maximize exposure to prevailing breezes while minimizing direct solar exposure. Open floor plans facilitate air movement."
-                },
-                {
-                    "name": "Thermal Mass Control",
-                    "image": "images/thermal_mass_control.png",
-                    "description": "Use lightweight construction with low thermal mass to prevent heat storage. Materials should cool quickly during night hours."
-                },
-                {
-                    "name": "Moisture Management",
-                    "image": "images/moisture_management.png",
-                    "description": "Design details should prevent moisture accumulation through proper drainage, vapor barriers, and moisture-resistant materials."
-                }
-            ]
-        },
-        "Mixed Dry": {
-            "title": "Mixed-Dry",
-            "color": "#28a745",
-            "strategies": [
-                {
-                    "name": "Thermal Mass",
-                    "image": "images/thermal_mass.png",
-                    "description": "Use high thermal mass materials like concrete or masonry to store heat during day and release at night, moderating temperature swings."
-                },
-                {
-                    "name": "Passive Solar Design",
-                    "image": "images/passive_solar.png",
-                    "description": "South-facing windows with proper overhangs capture winter sun for heating while blocking summer sun to reduce cooling needs."
-                },
-                {
-                    "name": "Night Ventilation",
-                    "image": "images/night_ventilation.png",
-                    "description": "Open windows during cool nights to flush out daytime heat and cool thermal mass for the next day."
-                }
-            ]
-        },
-        "Mixed Humid": {
-            "title": "Mixed-Humid",
-            "color": "#17a2b8",
-            "strategies": [
-                {
-                    "name": "Dehumidification",
-                    "image": "images/dehumidification.png",
-                    "description": "Incorporate passive dehumidification through proper ventilation design and moisture control strategies to maintain comfort."
-                },
-                {
-                    "name": "Insulation Balance",
-                    "image": "images/insulation_balance.png",
-                    "description": "Moderate insulation levels balance heating and cooling needs while preventing condensation issues in varying humidity conditions."
-                },
-                {
-                    "name": "Rainwater Management",
-                    "image": "images/rainwater_management.png",
-                    "description": "Effective gutters, downspouts, and drainage systems prevent water intrusion and manage high precipitation levels."
-                }
-            ]
-        },
-        "Cool Dry": {
-            "title": "Cool",
-            "color": "#6610f2",
-            "strategies": [
-                {
-                    "name": "Solar Heat Gain",
-                    "image": "images/solar_heat_gain.png",
-                    "description": "Maximize south-facing glazing to capture solar heat. Use thermal storage walls or floors to store and redistribute heat."
-                },
-                {
-                    "name": "Insulation",
-                    "image": "images/insulation.png",
-                    "description": "High levels of insulation in walls, roof, and foundation minimize heat loss and reduce heating demands significantly."
-                },
-                {
-                    "name": "Windbreaks",
-                    "image": "images/windbreaks.png",
-                    "description": "Strategic placement of vegetation or structures on north and west sides reduce cold wind impact and heat loss."
-                }
-            ]
-        },
-        "Cold Dry": {
-            "title": "Cold",
-            "color": "#0d6efd",
-            "strategies": [
-                {
-                    "name": "Compact Design",
-                    "image": "images/compact_design.png",
-                    "description": "Minimize surface area to volume ratio to reduce heat loss. Compact, clustered designs with minimal exposed surfaces work best."
-                },
-                {
-                    "name": "Vestibules & Airlocks",
-                    "image": "images/vestibules_airlocks.png",
-                    "description": "Entry vestibules create buffer zones that prevent direct cold air infiltration and reduce heat loss through doorways."
-                },
-                {
-                    "name": "Super Insulation",
-                    "image": "images/super_insulation.png",
-                    "description": "Extra-thick insulation (R-40+ walls, R-60+ roof) combined with triple-glazed windows minimizes heat loss in extreme cold."
-                }
-            ]
-        },
-        "Cool Marine": {
-            "title": "Marine",
-            "color": "#20c997",
-            "strategies": [
-                {
-                    "name": "Moisture Protection",
-                    "image": "images/moisture_protection.png",
-                    "description": "Advanced water-resistant barriers and proper flashing details protect against persistent moisture and salt spray in marine climates."
-                },
-                {
-                    "name": "Moderate Insulation",
-                    "image": "images/moderate_insulation.png",
-                    "description": "Balanced insulation addresses mild winters and cool summers while managing high humidity levels typical of marine climates."
-                },
-                {
-                    "name": "Daylighting",
-                    "image": "images/daylighting.png",
-                    "description": "Maximize natural light through windows and skylights to compensate for frequently overcast conditions in marine climates."
-                }
-            ]
-        }
-    }
-    
-    
-    # Match zone name to strategy (flexible matching)
-    zone_name_lower = zone_name.lower().strip()
-    
-    for key in strategies.keys():
-        key_lower = key.lower().strip()
-        if key_lower == zone_name_lower or key_lower in zone_name_lower or zone_name_lower in key_lower:
-            return strategies[key]
-    
-    # Default return if no match
-    return None
-
 # Load the data
 df = load_data()
 
@@ -372,7 +208,12 @@ if 'report_clicked' in locals() and report_clicked and result is not None and no
                 # Try to load actual image if image key exists
                 if 'image' in strategy:
                     try:
-                        st.image(strategy['image'], use_container_width=True)
+                        # Responsive AVIF/WebP variants, loaded as they scroll into view
+                        picture = picture_html(strategy['image'], strategy['name'])
+                        if picture:
+                            st.markdown(f'<div class="strategy-image">{picture}</div>', unsafe_allow_html=True)
+                        else:
+                            st.image(strategy['image'], use_container_width=True)
                     except Exception as e:
                         # Image placeholder if file doesn't exist
                         st.markdown(f"""
@@ -1,15 +1,21 @@
 import streamlit as st
 import pandas as pd
 import json
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table
 import io
 from datetime import datetime
-from PIL import Image as PILImage
+from report_cache import report_key
+from report_jobs import load_report_cache, load_report_jobs, report_job_panel
+from report_builds import ashrae_report_job
+from assets import assets_stale, build_assets, amcharts_script_tags
+from asset_server import start_asset_server
+from image_pipeline import report_image
+from map_snapshot import render_basemap
+from pdf_reports import ashrae_report_key
+from report_templates import report_styles, table_style, paragraph
+from zone_catalog import normalize_zones, build_ashrae_catalog, build_nbc_catalog
 
 
 st.set_page_config(
@@ -193,40 +199,25 @@ def load_ecbc_data():
     return df
 
 
-# Function to get color for a climate zone (ASHRAE)
-def get_ashrae_zone_color(df, climate_zone):
-    df["Climate Zone"] = df["Climate Zone"].astype(str).str.strip()
-    climate_zone = str(climate_zone).strip()
-    
-    zone_list = sorted(df["Climate Zone"].unique())
-    
-    palette = [
-        "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
-        "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf",
-        "#005f99", "#cc5500", "#009933", "#990000", "#663399",
-        "#00b3b3", "#b30047", "#ff66b2", "#66ff66", "#ffd966"
-    ]
-    
-    while len(palette) < len(zone_list):
-        palette = palette + palette
-    
-    zone_color_map = {z: palette[i] for i, z in enumerate(zone_list)}
-    return zone_color_map.get(climate_zone, "#444444")
+# Zone catalogs are immutable, so they are shared rather than copied per rerun
+@st.cache_resource
+def load_ashrae_catalog():
+    return build_ashrae_catalog(normalize_zones(load_ashrae_data()))
+
+
+@st.cache_resource
+def load_ecbc_catalog():
+    return build_nbc_catalog(normalize_zones(load_ecbc_data()))
+
+
+def get_ashrae_zone_color(climate_zone):
+    """Get color for ASHRAE climate zone"""
+    return load_ashrae_catalog().color(climate_zone)
 
 
-# Function to get color for a climate zone (ECBC)
 def get_ecbc_zone_color(climate_zone):
-    climate_zone = str(climate_zone).strip()
-    
-    ecbc_colors = {
-        "Cold": "#02a0c5",
-        "Composite": "#dec45e",
-        "Hot-Dry": "#c60102",
-        "Temperate": "#f89cc9",
-        "Warm-Humid": "#e59704",
-    }
-    
-    return ecbc_colors.get(climate_zone, "#444444")
+    """Get color for ECBC climate zone"""
+    return load_ecbc_catalog().color(climate_zone)
 
 
 # Globe visualization for ASHRAE (World)
@@ -235,26 +226,8 @@ def amcharts_world_globe(df, lat_sel, lon_sel, location_name, climate_zone, clim
     df["Climate Zone"] = df["Climate Zone"].astype(str).str.strip()
     climate_zone = str(climate_zone).strip()
 
-    # Generate color map and zone name mapping
-    zone_list = sorted(df["Climate Zone"].unique())
-    
-    zone_name_map = {}
-    for zone in zone_list:
-        zone_data = df[df["Climate Zone"] == zone].iloc[0]
-        zone_name_map[zone] = zone_data["Climate Zone Name"]
-
-    palette = [
-        "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
-        "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf",
-        "#005f99", "#cc5500", "#009933", "#990000", "#663399",
-        "#00b3b3", "#b30047", "#ff66b2", "#66ff66", "#ffd966"
-    ]
-
-    while len(palette) < len(zone_list):
-        palette = palette + palette
-
-    zone_color_map = {z: palette[i] for i, z in enumerate(zone_list)}
-    default_color = "#444444"
+    # Colors and names come from the catalog shared with the other maps
+    catalog = load_ashrae_catalog()
 
     # Build JS dataset
     df_js = json.dumps([
@@ -265,7 +238,7 @@ def amcharts_world_globe(df, lat_sel, lon_sel, location_name, climate_zone, clim
             "country": row["Country"],
             "zone": row["Climate Zone"],
             "zone_name": row["Climate Zone Name"],
-            "color": zone_color_map.get(row["Climate Zone"], default_color)
+            "color": catalog.color(row["Climate Zone"])
         }
         for _, row in df.iterrows()
     ])
@@ -361,23 +334,14 @@ def amcharts_world_globe(df, lat_sel, lon_sel, location_name, climate_zone, clim
         }}
     </style>
 
-    <script src="https://cdn.amcharts.com/lib/5/index.js"></script>
-    <script src="https://cdn.amcharts.com/lib/5/map.js"></script>
-    <script src="https://cdn.amcharts.com/lib/5/geodata/worldLow.js"></script>
-    <script src="https://cdn.amcharts.com/lib/5/themes/Animated.js"></script>
+    {amcharts_script_tags("worldLow")}
 
     <div id="container">
         <div id="chartdiv"></div>
         <div id="legend">
             <h4>Climate Zone Legend</h4>
             <div class="legend-grid">
-                {''.join([
-                    f'<div class="legend-item">'
-                    f'<div class="legend-color" style="background:{zone_color_map.get(z, default_color)};"></div>'
-                    f'<span class="legend-text">{z} - {zone_name_map.get(z, "")}</span>'
-                    f'</div>'
-                    for z in zone_list
-                ])}
+                {catalog.legend_html}
             </div>
         </div>
     </div>
@@ -503,20 +467,7 @@ def amcharts_india_map(df, lat_sel, lon_sel, location_name, state_name, climate_
     df["Climate Zone"] = df["Climate Zone"].astype(str).str.strip()
     climate_zone = str(climate_zone).strip()
 
-    # Get unique climate zones for ECBC
-    zone_list = sorted(df["Climate Zone"].unique())
-    
-    # ECBC Climate Zone Colors
-    ecbc_colors = {
-        "Cold": "#02a0c5",
-        "Composite": "#dec45e",
-        "Hot-Dry": "#c60102",
-        "Temperate": "#f89cc9",
-        "Warm-Humid": "#e59704",
-    }
-
-    zone_color_map = {z: ecbc_colors.get(z, "#444444") for z in zone_list}
-    default_color = "#444444"
+    catalog = load_ecbc_catalog()
 
     # Filter out rows with missing coordinates
     df_valid = df.dropna(subset=['Latitude', 'Longitude'])
@@ -529,7 +480,7 @@ def amcharts_india_map(df, lat_sel, lon_sel, location_name, state_name, climate_
             "title": row["Location"],
             "state": row["State"],
             "zone": row["Climate Zone"],
-            "color": zone_color_map.get(row["Climate Zone"], default_color)
+            "color": catalog.color(row["Climate Zone"])
         }
         for _, row in df_valid.iterrows()
     ])
@@ -616,23 +567,14 @@ def amcharts_india_map(df, lat_sel, lon_sel, location_name, state_name, climate_
         }}
     </style>
 
-    <script src="https://cdn.amcharts.com/lib/5/index.js"></script>
-    <script src="https://cdn.amcharts.com/lib/5/map.js"></script>
-    <script src="https://cdn.amcharts.com/lib/5/geodata/indiaLow.js"></script>
-    <script src="https://cdn.amcharts.com/lib/5/themes/Animated.js"></script>
+    {amcharts_script_tags("indiaLow")}
 
     <div id="container">
         <div id="chartdiv"></div>
         <div id="legend-ecbc">
             <h4>ECBC Climate Zones</h4>
             <div class="legend-grid">
-                {''.join([
-                    f'<div class="legend-item">'
-                    f'<div class="legend-color" style="background:{zone_color_map.get(z, default_color)};"></div>'
-                    f'<span class="legend-text">{z}</span>'
-                    f'</div>'
-                    for z in zone_list
-                ])}
+                {catalog.legend_html}
             </div>
         </div>
     </div>
@@ -781,6 +723,58 @@ def amcharts_india_map(df, lat_sel, lon_sel, location_name, state_name, climate_
 
 
 # PDF Generation Function for ECBC Report
+# Bump when generate_ecbc_pdf_report's output changes, so cached reports are not reused
+ECBC_REPORT_TEMPLATE_VERSION = 2
+
+
+# The asset server serves the self-hosted map scripts and streams finished reports from the store
+@st.cache_resource
+def start_static_assets():
+    if assets_stale():
+        build_assets()
+    return start_asset_server()
+
+
+start_static_assets()
+
+
+# Matches the map app's dataset version, so both apps share stored reports
+@st.cache_data
+def ashrae_dataset_version():
+    return load_ashrae_catalog().version
+
+
+# ASHRAE station map for the reports, rendered once per process
+@st.cache_resource(show_spinner=False)
+def load_ashrae_basemap():
+    return render_basemap("ashrae", normalize_zones(load_ashrae_data()), load_ashrae_catalog())
+
+
+def ecbc_report_key(location_name, state_name, climate_zone, latitude, longitude, zone_info):
+    return report_key(
+        "ecbc", ECBC_REPORT_TEMPLATE_VERSION, location=location_name, state=state_name,
+        zone=climate_zone, latitude=latitude, longitude=longitude, strategies=zone_info
+    )
+
+
+def ecbc_report_job(location_name, state_name, climate_zone, latitude, longitude, zone_info):
+    """Queue (or join) the ECBC report build for a location and return its key"""
+    key = ecbc_report_key(location_name, state_name, climate_zone, latitude, longitude, zone_info)
+    cache = load_report_cache()
+
+    def build(job):
+        def write(f):
+            job.update(0.3, "Laying out report")
+            # getbuffer() hands over the PDF without another copy
+            f.write(generate_ecbc_pdf_report(
+                location_name, state_name, climate_zone, latitude, longitude, zone_info
+            ).getbuffer())
+        return cache.get_or_create_path(key, write)
+
+    load_report_jobs().submit(key, build, location_name)
+    return key
+
+
 def generate_ecbc_pdf_report(location_name, state_name, climate_zone, latitude, longitude, zone_info):
     """Generate a comprehensive PDF report for ECBC climate zone"""
     
@@ -800,53 +794,12 @@ def generate_ecbc_pdf_report(location_name, state_name, climate_zone, latitude,
     # Container for PDF elements
     story = []
     
-    # Define styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=28,
-        textColor=colors.HexColor('#02a0c5'),
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=18,
-        textColor=colors.HexColor('#1f1f1f'),
-        spaceAfter=10,
-        spaceBefore=10,
-        fontName='Helvetica-Bold'
-    )
-    
-    section_heading_style = ParagraphStyle(
-        'SectionHeading',
-        parent=styles['Heading3'],
-        fontSize=14,
-        textColor=colors.HexColor('#333333'),
-        spaceAfter=8,
-        spaceBefore=8,
-        fontName='Helvetica-Bold'
-    )
-    
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['BodyText'],
-        fontSize=11,
-        alignment=TA_JUSTIFY,
-        spaceAfter=8,
-        leading=14
-    )
-    
     # Title
-    story.append(Paragraph("CLIMATE ZONE FINDER REPORT", title_style))
+    story.append(paragraph("CLIMATE ZONE FINDER REPORT", "title", "ecbc"))
     story.append(Spacer(1, 0.2*inch))
 
     # Report Header - Project Information
-    story.append(Paragraph("PROJECT INFORMATION", heading_style))
+    story.append(paragraph("PROJECT INFORMATION", "heading", "ecbc"))
     
     # Create location info table
     location_data = [
@@ -860,25 +813,13 @@ def generate_ecbc_pdf_report(location_name, state_name, climate_zone, latitude,
     ]
     
     location_table = Table(location_data, colWidths=[2*inch, 3.5*inch])
-    location_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#02a0c5')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
-    ]))
+    location_table.setStyle(table_style("location", "ecbc"))
     
     story.append(location_table)
     story.append(Spacer(1, 0.3*inch))
     
     # Climate Zone Information
-    story.append(Paragraph("CLIMATE ZONE DESIGNATION", heading_style))
+    story.append(paragraph("CLIMATE ZONE DESIGNATION", "heading", "ecbc"))
     
     zone_info_text = f"""
     <b>Climate Zone:</b> {climate_zone}<br/>
@@ -886,7 +827,7 @@ def generate_ecbc_pdf_report(location_name, state_name, climate_zone, latitude,
     Energy Conservation Building Code (ECBC) of India. Understanding the climatic characteristics 
     of this zone is essential for designing energy-efficient buildings.
     """
-    story.append(Paragraph(zone_info_text, body_style))
+    story.append(paragraph(zone_info_text, theme="ecbc"))
     story.append(Spacer(1, 0.3*inch))
     
     # Strategies Section
@@ -901,20 +842,20 @@ def generate_ecbc_pdf_report(location_name, state_name, climate_zone, latitude,
             zone_info['descriptions']
         )):
             # Strategy sub-heading
-            story.append(Paragraph(f"{title}", section_heading_style))
+            story.append(paragraph(f"{title}", "section_heading", "ecbc"))
             
             # Try to add image
             try:
                 # Resize image to fit in PDF
-                img = Image(img_path, width=4*inch, height=3*inch)
+                img = report_image(img_path, 4*inch, 3*inch)
                 story.append(img)
                 story.append(Spacer(1, 0.15*inch))
             except:
-                story.append(Paragraph("[Image not available]", body_style))
+                story.append(paragraph("[Image not available]", theme="ecbc"))
                 story.append(Spacer(1, 0.1*inch))
             
             # Strategy description
-            story.append(Paragraph(description, body_style))
+            story.append(paragraph(description, theme="ecbc"))
             story.append(Spacer(1, 0.3*inch))
     
     story.append(PageBreak())
@@ -927,7 +868,8 @@ def generate_ecbc_pdf_report(location_name, state_name, climate_zone, latitude,
     <i>This report provides climate-specific design strategies for sustainable and energy-efficient buildings. 
     For more information, visit the Climate Zone Finder dashboard.</i>
     """
-    story.append(Paragraph(footer_text, body_style))
+    # Timestamped, so not parsed into the paragraph registry
+    story.append(Paragraph(footer_text, report_styles("ecbc")["body"]))
     
     # Build PDF
     doc.build(story)
@@ -965,7 +907,7 @@ if select_standard == "ASHRAE-2013":
         st.markdown('<div class="label-text">Climate Zone:</div>', unsafe_allow_html=True)
         if not result.empty:
             climate_zone = result.iloc[0]["Climate Zone"]
-            zone_color = get_ashrae_zone_color(df, climate_zone)
+            zone_color = get_ashrae_zone_color(climate_zone)
             st.markdown(
                 f'<p style="font-size: 28px; font-weight: bold; color: {zone_color}; margin: 10px 0;">{climate_zone}</p>',
                 unsafe_allow_html=True,
@@ -978,7 +920,7 @@ if select_standard == "ASHRAE-2013":
         st.markdown('<div class="label-text">Climate Zone Name:</div>', unsafe_allow_html=True)
         if not result.empty:
             climate_zone_name = result.iloc[0]["Climate Zone Name"]
-            zone_color = get_ashrae_zone_color(df, climate_zone)
+            zone_color = get_ashrae_zone_color(climate_zone)
             st.markdown(
                 f'<p style="font-size: 18px; font-weight: 500; color: {zone_color}; margin: 10px 0;">{climate_zone_name}</p>',
                 unsafe_allow_html=True,
@@ -998,8 +940,29 @@ if select_standard == "ASHRAE-2013":
         else:
             st.button("DOWNLOAD EPW", type="secondary", disabled=True, use_container_width=False, width=300)
         
-        if report_clicked and not result.empty:
-            st.info("Report generation for ASHRAE is under development. Please check back soon.")
+        if not result.empty:
+            row = result.iloc[0]
+            epw_url = row.get("EPW File", None)
+            state_province = row.get("State/Province", "")
+            report_args = (
+                selected_location,
+                "" if pd.isna(state_province) else str(state_province),
+                selected_country,
+                str(climate_zone).strip(),
+                climate_zone_name,
+                ashrae_dataset_version(),
+                float(row["Latitude"]),
+                float(row["Longitude"]),
+                bool(pd.notna(epw_url) and str(epw_url).strip() not in ("", "0")),
+            )
+            if report_clicked:
+                with st.spinner("Preparing the station map..."):
+                    basemap = load_ashrae_basemap()
+                st.session_state["report_job"] = ashrae_report_job(*report_args, basemap=basemap)
+            key = ashrae_report_key(*report_args)
+            filename = f"Climate_Zone_Report_{selected_location}_{climate_zone}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            report_job_panel(key, filename, "Download PDF Report", 300,
+                             "✅ PDF report generated! Click the button above to download.")
             
 
     with right_col:
@@ -1211,7 +1174,7 @@ elif select_standard == "NBC":
         else:
             st.button("DOWNLOAD EPW", type="secondary", disabled=True, use_container_width=False, width=300)
         
-        if report_clicked and not result.empty:
+        if not result.empty:
             epw_file = result.iloc[0].get("EPW File", "Not Available")
             lat_selected = result.iloc[0]["Latitude"]
             lon_selected = result.iloc[0]["Longitude"]
@@ -1288,35 +1251,14 @@ elif select_standard == "NBC":
             if climate_zone in ecbc_zone_data:
                 zone_info = ecbc_zone_data[climate_zone]
                 
-                # Generate PDF
-                pdf_buffer = generate_ecbc_pdf_report(
-                    selected_location,
-                    selected_state,
-                    climate_zone,
-                    lat_selected,
-                    lon_selected,
-                    zone_info
-                )
-                
-                # Automatically download the PDF
-                pdf_buffer.seek(0)
-                pdf_data = pdf_buffer.getvalue()
+                # Built in the background, or reused from the store for the same inputs
+                report_args = (selected_location, selected_state, climate_zone, lat_selected, lon_selected, zone_info)
+                if report_clicked:
+                    st.session_state["report_job"] = ecbc_report_job(*report_args)
                 filename = f"Climate_Zone_Report_{selected_location}_{climate_zone}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-                
-                # The button appears automatically after report generation
-                col1, col2, col3 = st.columns([1, 1, 1])
-                with col1:
-                    st.download_button(
-                        label="Download PDF Report",
-                        data=pdf_data,
-                        file_name=filename,
-                        mime="application/pdf",
-                        key=f"pdf_download_{datetime.now().timestamp()}",
-                        use_container_width=True
-                    )
-                
-                st.success("✅ PDF report generated! Click the button above to download.")
-            else:
+                report_job_panel(ecbc_report_key(*report_args), filename, "Download PDF Report", 300,
+                                 "✅ PDF report generated! Click the button above to download.")
+            elif report_clicked:
                 st.error("Climate zone data not available for PDF generation.")
 
     with right_col:
@@ -0,0 +1,179 @@
+"""Alternative renderers for the station layer of the amCharts maps.
+
+The default amCharts path creates a Circle sprite, tooltip and event handlers
+per station. For large datasets the canvas layer below draws every station
+into one <canvas> stacked over the chart and answers hover queries through a
+screen-space grid index, so cost no longer grows with one sprite per station.
+Canvas 2D needs no GPU, so it works on every client.
+"""
+
+# Above this many stations the "auto" mode switches from sprites to canvas
+CANVAS_POINT_THRESHOLD = 2000
+
+RENDER_MODES = ("auto", "sprites", "canvas")
+
+
+def point_render_mode(station_count, render_mode="auto"):
+    """Resolve the render mode for a dataset of the given size"""
+    if render_mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode: {render_mode}")
+    if render_mode == "auto":
+        return "canvas" if station_count > CANVAS_POINT_THRESHOLD else "sprites"
+    return render_mode
+
+
+# Browser-side canvas layer. Expects the typed-array stations object produced
+# by decodeStations() in station_codec.STATION_DECODER_JS.
+CANVAS_POINT_LAYER_JS = """
+function StationCanvasLayer(root, chart, container, stations, options) {
+    var self = this;
+    var radius = options.radius || 5;
+    var cellSize = 16;
+    var dpr = window.devicePixelRatio || 1;
+
+    container.style.position = "relative";
+    var canvas = document.createElement("canvas");
+    canvas.style.cssText = "position:absolute;left:0;top:0;pointer-events:none;";
+    container.appendChild(canvas);
+    var ctx = canvas.getContext("2d");
+
+    var tooltip = document.createElement("div");
+    tooltip.style.cssText = "position:absolute;display:none;pointer-events:none;background:#fff;" +
+        "border:1px solid #999;border-radius:4px;padding:6px 8px;font:12px sans-serif;" +
+        "box-shadow:0 2px 4px rgba(0,0,0,0.2);white-space:nowrap;z-index:10;";
+    container.appendChild(tooltip);
+
+    var count = stations.count;
+    var xs = new Float32Array(count);
+    var ys = new Float32Array(count);
+    var visible = new Uint8Array(count);
+    var grid = {};
+    var lastView = null;
+    self.selected = null;
+
+    // Group station indices by zone so each zone is filled with one path
+    var byZone = stations.zones.map(function() { return []; });
+    for (var i = 0; i < count; i++) { byZone[stations.zone[i]].push(i); }
+
+    function viewKey() {
+        return [chart.get("rotationX", 0), chart.get("rotationY", 0), chart.get("zoomLevel", 1),
+                chart.get("translateX", 0), chart.get("translateY", 0),
+                container.clientWidth, container.clientHeight].join(",");
+    }
+
+    function project() {
+        var globe = options.globe;
+        var rad = Math.PI / 180;
+        var lon0 = -chart.get("rotationX", 0) * rad;
+        var lat0 = -chart.get("rotationY", 0) * rad;
+        var sinLat0 = Math.sin(lat0), cosLat0 = Math.cos(lat0);
+        var w = container.clientWidth, h = container.clientHeight;
+        grid = {};
+        for (var i = 0; i < count; i++) {
+            var lat = stations.lat[i] / stations.scale;
+            var lon = stations.lon[i] / stations.scale;
+            if (globe) {
+                // Hide stations on the far side of the orthographic globe
+                var la = lat * rad;
+                var cosC = sinLat0 * Math.sin(la) + cosLat0 * Math.cos(la) * Math.cos(lon * rad - lon0);
+                if (cosC <= 0) { visible[i] = 0; continue; }
+            }
+            var p = chart.convert({ latitude: lat, longitude: lon });
+            xs[i] = p.x; ys[i] = p.y;
+            visible[i] = (p.x >= -radius && p.y >= -radius && p.x <= w + radius && p.y <= h + radius) ? 1 : 0;
+            if (visible[i]) {
+                var key = Math.floor(p.x / cellSize) + ":" + Math.floor(p.y / cellSize);
+                (grid[key] || (grid[key] = [])).push(i);
+            }
+        }
+    }
+
+    self.redraw = function() {
+        var w = container.clientWidth, h = container.clientHeight;
+        if (canvas.width !== w * dpr || canvas.height !== h * dpr) {
+            canvas.width = w * dpr; canvas.height = h * dpr;
+            canvas.style.width = w + "px"; canvas.style.height = h + "px";
+        }
+        project();
+        ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+        ctx.clearRect(0, 0, w, h);
+        ctx.lineWidth = 1.3;
+        ctx.strokeStyle = "#ffffff";
+        byZone.forEach(function(indices, z) {
+            ctx.beginPath();
+            for (var k = 0; k < indices.length; k++) {
+                var i = indices[k];
+                if (!visible[i]) { continue; }
+                ctx.moveTo(xs[i] + radius, ys[i]);
+                ctx.arc(xs[i], ys[i], radius, 0, 2 * Math.PI);
+            }
+            ctx.fillStyle = stations.zones[z].color;
+            ctx.fill();
+            ctx.stroke();
+        });
+        if (self.selected) {
+            var p = chart.convert({ latitude: self.selected.lat, longitude: self.selected.lon });
+            ctx.beginPath();
+            ctx.arc(p.x, p.y, 10, 0, 2 * Math.PI);
+            ctx.fillStyle = "#ff0000";
+            ctx.lineWidth = 2;
+            ctx.fill();
+            ctx.stroke();
+        }
+    };
+
+    self.setSelected = function(selected) {
+        self.selected = selected;
+        lastView = null;
+    };
+
+    // Nearest visible station within the hover radius, looked up in the grid
+    self.hitTest = function(x, y) {
+        var cx = Math.floor(x / cellSize), cy = Math.floor(y / cellSize);
+        var best = -1, bestDist = (radius + 2) * (radius + 2);
+        for (var dx = -1; dx <= 1; dx++) {
+            for (var dy = -1; dy <= 1; dy++) {
+                var cell = grid[(cx + dx) + ":" + (cy + dy)];
+                if (!cell) { continue; }
+                for (var k = 0; k < cell.length; k++) {
+                    var i = cell[k];
+                    var d = (xs[i] - x) * (xs[i] - x) + (ys[i] - y) * (ys[i] - y);
+                    if (d <= bestDist) { best = i; bestDist = d; }
+                }
+            }
+        }
+        return best;
+    };
+
+    container.addEventListener("mousemove", function(ev) {
+        var rect = container.getBoundingClientRect();
+        var x = ev.clientX - rect.left, y = ev.clientY - rect.top;
+        var i = self.hitTest(x, y);
+        if (i < 0) { tooltip.style.display = "none"; return; }
+        var z = stations.zones[stations.zone[i]];
+        // Station data is set as text, never parsed as markup
+        var title = document.createElement("b");
+        title.textContent = stations.title(i);
+        tooltip.replaceChildren(title);
+        [stations.groups[stations.group[i]], "Zone: " + z.zone, z.name].forEach(function(line) {
+            if (!line) { return; }
+            tooltip.appendChild(document.createElement("br"));
+            tooltip.appendChild(document.createTextNode(line));
+        });
+        tooltip.style.left = (x + 12) + "px";
+        tooltip.style.top = (y + 12) + "px";
+        tooltip.style.display = "block";
+    });
+    container.addEventListener("mouseleave", function() { tooltip.style.display = "none"; });
+
+    // Redraw only on frames where the view actually changed
+    root.events.on("frameended", function() {
+        var key = viewKey();
+        if (key !== lastView) {
+            lastView = key;
+            tooltip.style.display = "none";
+            self.redraw();
+        }
+    });
+}
+"""
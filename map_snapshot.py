@@ -0,0 +1,108 @@
+"""Small static PNG snapshots of a selected station, rendered server side.
+
+A basemap layer -- the derived zone regions and every station of a dataset,
+drawn once with matplotlib in a plate carree projection -- is rendered per
+dataset and kept in memory. A snapshot is then only a crop of that layer
+around the selected station plus a marker, which takes a few milliseconds.
+Snapshots stand in for the interactive maps while they load and illustrate
+the PDF reports.
+
+The basemap is not a geographic map: there are no coastlines, borders or
+place names, only the zone regions derived from the stations over a plain
+ocean-coloured fill. It shows where the station sits among the climate
+zones, nothing more.
+"""
+import io
+
+from zone_boundaries import build_zone_regions, simplify_regions
+
+
+# Geographic extent (lon_min, lon_max, lat_min, lat_max) and scale of each basemap
+BASEMAPS = {
+    "ashrae": {"extent": (-180.0, 180.0, -60.0, 85.0), "px_per_deg": 6},
+    "nbc": {"extent": (66.0, 99.0, 5.0, 38.0), "px_per_deg": 24},
+}
+
+OCEAN_COLOR = "#dfe9f3"
+REGION_ALPHA = 0.35
+REGION_TOLERANCE = (0.3, 2)
+SNAPSHOT_SIZES = {"preview": (480, 300), "report": (900, 560)}
+# Snapshots are JPEG: previews are inlined in the map page, and ReportLab
+# embeds report snapshots without re-encoding
+SNAPSHOT_FORMATS = {"preview": ("JPEG", {"quality": 80}), "report": ("JPEG", {"quality": 85})}
+
+
+def render_basemap(dataset, df, catalog):
+    """Zone regions and stations of a dataset as an RGB PIL image"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from shapely.plotting import patch_from_polygon
+    from PIL import Image
+
+    spec = BASEMAPS[dataset]
+    lon_min, lon_max, lat_min, lat_max = spec["extent"]
+    width = int((lon_max - lon_min) * spec["px_per_deg"])
+    height = int((lat_max - lat_min) * spec["px_per_deg"])
+
+    fig = plt.figure(figsize=(width / 100, height / 100), dpi=100)
+    try:
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.set_axis_off()
+        ax.set_xlim(lon_min, lon_max)
+        ax.set_ylim(lat_min, lat_max)
+        fig.patch.set_facecolor(OCEAN_COLOR)
+
+        regions = simplify_regions(build_zone_regions(df, catalog), *REGION_TOLERANCE)
+        for zone, geom in regions.items():
+            for polygon in getattr(geom, "geoms", [geom]):
+                if polygon.geom_type == "Polygon" and not polygon.is_empty:
+                    ax.add_patch(patch_from_polygon(
+                        polygon, facecolor=catalog.color(zone), alpha=REGION_ALPHA, linewidth=0
+                    ))
+
+        df_valid = df.dropna(subset=["Latitude", "Longitude"])
+        ax.scatter(
+            df_valid["Longitude"], df_valid["Latitude"], s=4 if dataset == "ashrae" else 10,
+            c=[catalog.color(z) for z in df_valid["Climate Zone"]], linewidths=0,
+        )
+
+        buf = io.BytesIO()
+        fig.savefig(buf, dpi=100, facecolor=OCEAN_COLOR, format="png")
+    finally:
+        plt.close(fig)
+    buf.seek(0)
+    return Image.open(buf).convert("RGB")
+
+
+def snapshot_png(dataset, basemap, lat, lon, label="", size="preview"):
+    """Image bytes of the basemap cropped around (lat, lon), with the station marked
+
+    JPEG for the sizes listed in SNAPSHOT_FORMATS, PNG for any other size.
+    """
+    from PIL import ImageDraw
+
+    spec = BASEMAPS[dataset]
+    lon_min, _, _, lat_max = spec["extent"]
+    width, height = SNAPSHOT_SIZES.get(size, size)
+    width, height = min(width, basemap.width), min(height, basemap.height)
+
+    x = (lon - lon_min) * spec["px_per_deg"]
+    y = (lat_max - lat) * spec["px_per_deg"]
+    # Keep the crop inside the basemap; the marker moves off centre near the edges
+    left = int(max(0, min(basemap.width - width, x - width / 2)))
+    top = int(max(0, min(basemap.height - height, y - height / 2)))
+    image = basemap.crop((left, top, left + width, top + height))
+
+    draw = ImageDraw.Draw(image)
+    mx, my = x - left, y - top
+    draw.ellipse((mx - 8, my - 8, mx + 8, my + 8), fill="#ff0000", outline="#ffffff", width=2)
+    if label:
+        tx = mx + 12 if mx < width - 150 else mx - 12 - draw.textlength(label)
+        draw.text((tx + 1, my - 6 + 1), label, fill="#ffffff")
+        draw.text((tx, my - 6), label, fill="#222222")
+
+    out = io.BytesIO()
+    image_format, options = SNAPSHOT_FORMATS.get(size, ("PNG", {"optimize": True}))
+    image.save(out, format=image_format, **options)
+    return out.getvalue()
@@ -0,0 +1,469 @@
+"""PDF climate zone reports, composed from pre-rendered sections.
+
+The passive design strategy pages of a report depend only on the climate
+zone, so they are rendered once per zone and kept in memory. A report is
+then a small per-location cover (project information, station map, zone
+designation) plus a closing page, merged around the zone's pages at the
+PDF object level with pypdf; the strategy pages are never laid out again.
+The NBC (India) and ASHRAE 169 (world) reports share this pipeline.
+"""
+import io
+from datetime import datetime
+from functools import lru_cache
+
+from pypdf import PdfReader, PdfWriter
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table
+from PIL import Image as PILImage
+
+from climate_data import CLIMATE_ZONE_DATA, ASHRAE_STRATEGIES, get_climate_strategies
+from image_pipeline import report_image
+from report_cache import report_key
+from report_templates import report_styles, table_style, paragraph
+
+
+# Bump when a report layout changes, so cached reports are not reused
+NBC_REPORT_TEMPLATE_VERSION = 4
+ASHRAE_REPORT_TEMPLATE_VERSION = 2
+
+NBC_STANDARD = "National Building Code (NBC)"
+ASHRAE_STANDARD = "ASHRAE Standard 169-2013"
+
+
+def render_story(story, output=None):
+    """Lay out a list of flowables as a letter-size PDF and return its bytes
+
+    With output (a path or binary file), the PDF is written there instead.
+    """
+    pdf_buffer = io.BytesIO() if output is None else output
+    doc = SimpleDocTemplate(
+        pdf_buffer,
+        pagesize=letter,
+        rightMargin=0.5*inch,
+        leftMargin=0.5*inch,
+        topMargin=0.5*inch,
+        bottomMargin=0.5*inch
+    )
+    doc.build(story)
+    return pdf_buffer.getvalue() if output is None else None
+
+
+def location_table(rows):
+    """Two-column Property/Value table of a location"""
+    table = Table([['Property', 'Value']] + rows, colWidths=[2*inch, 3.5*inch])
+    table.setStyle(table_style("location"))
+    return table
+
+
+def map_story(map_png):
+    """Static map of the station, when one was rendered"""
+    if not map_png:
+        return []
+    map_width, map_height = PILImage.open(io.BytesIO(map_png)).size
+    return [
+        Image(io.BytesIO(map_png), width=5.5*inch, height=5.5*inch * map_height / map_width),
+        Spacer(1, 0.3*inch),
+    ]
+
+
+def strategy_story(strategies, image_size, image_profile="pdf"):
+    """Passive design strategies: title, image and description of each
+
+    strategies is a list of (image path, title, description). Images come
+    from the pre-optimized variants of image_profile; None embeds the
+    source files as they are. A strategy without an image path is text only.
+    """
+    story = [paragraph("Passive Design Strategies:", "heading")]
+
+    # Strategy images and descriptions
+    for img_path, title, description in strategies:
+        story.append(paragraph(f"{title}", "section_heading"))
+
+        if img_path:
+            try:
+                if image_profile:
+                    img = report_image(img_path, *image_size, image_profile)
+                else:
+                    img = Image(img_path, width=image_size[0], height=image_size[1])
+                story.append(img)
+                story.append(Spacer(1, 0.10*inch))
+            except Exception:
+                story.append(paragraph("[Image not available]"))
+                story.append(Spacer(1, 0.1*inch))
+
+        # Description
+        story.append(paragraph(description))
+        story.append(Spacer(1, 0.3*inch))
+    return story
+
+
+def footer_story(standard):
+    """Closing page with the generation time and classification standard.
+
+    The text changes every minute, so it is a plain Paragraph rather than a registry entry.
+    """
+    footer_text = f"""
+    <b>Report Generated On:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>
+    <b>Classification Standard:</b> {standard}<br/>
+    <br/>
+    <i>This report provides climate-specific design strategies for sustainable and energy-efficient buildings.
+    For more information, visit the Climate Zone Finder dashboard.</i>
+    """
+    return [Paragraph(footer_text, report_styles()["body"])]
+
+
+def compose_report(cover, section_pdf, standard, title, output=None):
+    """PDF bytes of cover flowables + pre-rendered section pages + closing page
+
+    With output (a path or binary file), the PDF is written there instead of
+    being returned, so no serialized copy of it is kept in memory (the
+    writer still holds the pages until then).
+    """
+    # Cover and closing page are the only per-location layout work
+    cover = PdfReader(io.BytesIO(render_story(cover + [PageBreak()] + footer_story(standard))))
+    section = PdfReader(io.BytesIO(section_pdf))
+    last = len(cover.pages) - 1
+
+    writer = PdfWriter()
+    writer.append(cover, pages=(0, last))
+    writer.append(section)
+    writer.append(cover, pages=(last, last + 1))
+    writer.add_metadata({"/Title": title})
+
+    if output is not None:
+        writer.write(output)
+        return None
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def nbc_cover_story(location_name, state_name, climate_zone, latitude, longitude, map_png=None):
+    """Title, project information, station map and zone designation of one location"""
+    story = []
+
+    # Title
+    story.append(paragraph("Climate Analysis", "title"))
+    story.append(Spacer(1, 0.2*inch))
+
+    # Report Header
+    story.append(paragraph("Project Information", "heading"))
+
+    # Table
+    story.append(location_table([
+        ['Location', location_name],
+        ['State', state_name],
+        ['Country', 'India'],
+        ['Latitude', f'{latitude:.2f}'],
+        ['Longitude', f'{longitude:.2f}'],
+        ['Climate Zone', climate_zone]
+    ]))
+    story.append(Spacer(1, 0.3*inch))
+    story += map_story(map_png)
+
+    # Climate Zone Information
+    story.append(paragraph("Climate Zone Designation", "heading"))
+
+    zone_info_text = f"""
+    This location falls under the <b>{climate_zone}</b> climate classification as per the
+    National Building Code (NBC) of India. Understanding the climatic characteristics
+    of this zone is essential for designing energy-efficient buildings by following the Passive Design Strategies.
+    """
+    story.append(paragraph(zone_info_text))
+    story.append(Spacer(1, 0.3*inch))
+    return story
+
+
+def nbc_strategy_story(zone_info, image_profile="pdf"):
+    """Passive design strategies of an NBC zone"""
+    if not zone_info or 'images' not in zone_info:
+        return strategy_story([], None)
+    strategies = zip(zone_info['images'], zone_info['titles'], zone_info['descriptions'])
+    return strategy_story(list(strategies), (3.5*inch, 2.5*inch), image_profile)
+
+
+def generate_nbc_pdf_report(location_name, state_name, climate_zone, latitude, longitude, zone_info, map_png=None,
+                            image_profile="pdf"):
+    """Generate a comprehensive PDF report for NBC climate zone in a single layout pass"""
+    story = nbc_cover_story(location_name, state_name, climate_zone, latitude, longitude, map_png)
+    story += nbc_strategy_story(zone_info, image_profile)
+    story.append(PageBreak())
+    story += footer_story(NBC_STANDARD)
+    return io.BytesIO(render_story(story))
+
+
+def nbc_report_key(location_name, state_name, climate_zone, dataset_version, latitude, longitude):
+    """Report cache key of an NBC report; shared by the app and the batch generator"""
+    return report_key(
+        "nbc", NBC_REPORT_TEMPLATE_VERSION, location=location_name, state=state_name, zone=climate_zone,
+        dataset=dataset_version, latitude=float(latitude), longitude=float(longitude),
+        strategies=CLIMATE_ZONE_DATA.get(climate_zone)
+    )
+
+
+@lru_cache(maxsize=None)
+def nbc_zone_section(climate_zone):
+    """PDF bytes of a zone's strategy pages, rendered once per process"""
+    return render_story(nbc_strategy_story(CLIMATE_ZONE_DATA.get(climate_zone)))
+
+
+def compose_nbc_report(location_name, state_name, climate_zone, latitude, longitude, map_png=None, output=None):
+    """NBC report PDF bytes: the location's cover, the zone's pre-rendered pages, the closing page"""
+    return compose_report(
+        nbc_cover_story(location_name, state_name, climate_zone, latitude, longitude, map_png),
+        nbc_zone_section(climate_zone),
+        NBC_STANDARD,
+        f"Climate Analysis - {location_name}",
+        output,
+    )
+
+
+def ashrae_cover_story(location_name, state_name, country_name, climate_zone, climate_zone_name, latitude, longitude,
+                       epw_available=False, map_png=None):
+    """Title, project information, station map and zone designation of one ASHRAE station"""
+    story = [
+        paragraph("Climate Analysis", "title"),
+        Spacer(1, 0.2*inch),
+        paragraph("Project Information", "heading"),
+        location_table([
+            ['Location', location_name],
+            ['State/Province', state_name or '-'],
+            ['Country', country_name],
+            # Some ASHRAE stations have no coordinates (NaN)
+            ['Latitude', f'{latitude:.2f}' if latitude == latitude else '-'],
+            ['Longitude', f'{longitude:.2f}' if longitude == longitude else '-'],
+            ['Climate Zone', climate_zone],
+            ['Climate Zone Name', climate_zone_name],
+            ['Weather File (EPW)', 'Available' if epw_available else 'Not available'],
+        ]),
+        Spacer(1, 0.3*inch),
+    ]
+    story += map_story(map_png)
+
+    # Climate Zone Information
+    story.append(paragraph("Climate Zone Designation", "heading"))
+    zone_info_text = f"""
+    This location falls under climate zone <b>{climate_zone} ({climate_zone_name})</b> as per
+    ASHRAE Standard 169. Understanding the climatic characteristics of this zone is essential for
+    designing energy-efficient buildings by following the Passive Design Strategies.
+    """
+    story.append(paragraph(zone_info_text))
+    story.append(Spacer(1, 0.3*inch))
+    return story
+
+
+def ashrae_strategy_story(strategies_data, image_profile="pdf"):
+    """Passive design strategies of an ASHRAE zone, from get_climate_strategies"""
+    if not strategies_data:
+        return [paragraph("Passive design strategies for this climate zone are not yet available.")]
+    strategies = [(s.get('image'), s['name'], s['description']) for s in strategies_data['strategies']]
+    return strategy_story(strategies, (3.5*inch, 2.5*inch), image_profile)
+
+
+def generate_ashrae_pdf_report(location_name, state_name, country_name, climate_zone, climate_zone_name, latitude,
+                               longitude, epw_available=False, map_png=None, image_profile="pdf"):
+    """Generate an ASHRAE 169 report in a single layout pass"""
+    story = ashrae_cover_story(
+        location_name, state_name, country_name, climate_zone, climate_zone_name, latitude, longitude,
+        epw_available, map_png
+    )
+    story += ashrae_strategy_story(get_climate_strategies(climate_zone_name), image_profile)
+    story.append(PageBreak())
+    story += footer_story(ASHRAE_STANDARD)
+    return io.BytesIO(render_story(story))
+
+
+def ashrae_report_key(location_name, state_name, country_name, climate_zone, climate_zone_name, dataset_version,
+                      latitude, longitude, epw_available):
+    """Report cache key of an ASHRAE report"""
+    return report_key(
+        "ashrae", ASHRAE_REPORT_TEMPLATE_VERSION, location=location_name, state=state_name, country=country_name,
+        zone=climate_zone, zone_name=climate_zone_name, dataset=dataset_version,
+        latitude=float(latitude), longitude=float(longitude), epw=bool(epw_available),
+        strategies=get_climate_strategies(climate_zone_name)
+    )
+
+
+@lru_cache(maxsize=None)
+def _ashrae_strategy_section(strategies_title):
+    strategies_data = next(
+        (s for s in ASHRAE_STRATEGIES.values() if s["title"] == strategies_title), None
+    )
+    return render_story(ashrae_strategy_story(strategies_data))
+
+
+def ashrae_zone_section(climate_zone_name):
+    """PDF bytes of a zone's strategy pages; zone names sharing a strategy set share one rendering"""
+    strategies_data = get_climate_strategies(climate_zone_name)
+    return _ashrae_strategy_section(strategies_data["title"] if strategies_data else None)
+
+
+def compose_ashrae_report(location_name, state_name, country_name, climate_zone, climate_zone_name, latitude,
+                          longitude, epw_available=False, map_png=None, output=None):
+    """ASHRAE report PDF bytes: the station's cover, the zone's pre-rendered pages, the closing page"""
+    return compose_report(
+        ashrae_cover_story(
+            location_name, state_name, country_name, climate_zone, climate_zone_name, latitude, longitude,
+            epw_available, map_png
+        ),
+        ashrae_zone_section(climate_zone_name),
+        ASHRAE_STANDARD,
+        f"Climate Analysis - {location_name}",
+        output,
+    )
+
+
+# Sites per chunk of the portfolio comparison table (one letter page). Each
+# chunk is laid out on its own, so ReportLab never holds or re-splits the
+# whole table.
+PORTFOLIO_ROWS_PER_CHUNK = 36
+
+
+def portfolio_section_key(standard, site):
+    """Strategy section a portfolio site needs, or None; sites sharing one get a single copy"""
+    if standard == "ashrae":
+        strategies_data = get_climate_strategies(site["zone_name"])
+        return strategies_data["title"] if strategies_data else None
+    return site["zone"] if site["zone"] in CLIMATE_ZONE_DATA else None
+
+
+@lru_cache(maxsize=None)
+def portfolio_zone_section(standard, section_key):
+    """PDF bytes of one zone's strategy pages under a zone heading, rendered once per process"""
+    if standard == "ashrae":
+        story = ashrae_strategy_story(
+            next(s for s in ASHRAE_STRATEGIES.values() if s["title"] == section_key)
+        )
+    else:
+        story = nbc_strategy_story(CLIMATE_ZONE_DATA[section_key])
+    return render_story([paragraph(f"Climate Zone: {section_key}", "title")] + story)
+
+
+def portfolio_table(rows, standard):
+    """Comparison table of one chunk of portfolio sites"""
+    region = 'State/Province' if standard == "ashrae" else 'State'
+    table = Table(
+        [['#', 'Location', region, 'Country', 'Climate Zone', 'Lat', 'Lon', 'EPW']] + rows,
+        colWidths=[0.4*inch, 1.9*inch, 1.2*inch, 0.9*inch, 1.45*inch, 0.55*inch, 0.6*inch, 0.5*inch],
+        repeatRows=1,
+    )
+    table.setStyle(table_style("portfolio"))
+    return table
+
+
+def _cell(value, width=28):
+    text = '-' if value is None or value != value or value == '' else str(value)
+    return text if len(text) <= width else text[:width - 1] + '…'
+
+
+def _portfolio_row(number, site, standard):
+    latitude, longitude = site["latitude"], site["longitude"]
+    zone = f'{site["zone"]} {site["zone_name"]}' if standard == "ashrae" else site["zone"]
+    return [
+        str(number), _cell(site["location"], 34), _cell(site.get("region"), 22), _cell(site.get("country"), 16),
+        _cell(zone, 26),
+        f'{latitude:.2f}' if latitude == latitude else '-',
+        f'{longitude:.2f}' if longitude == longitude else '-',
+        'Yes' if site.get("epw") else 'No',
+    ]
+
+
+def portfolio_summary_story(title, standard, zones, site_count, epw_count):
+    """Opening page of a portfolio: totals and the sites per climate zone"""
+    styles = report_styles()
+    story = [
+        Paragraph(title, styles["title"]),
+        Spacer(1, 0.2*inch),
+        paragraph("Portfolio Summary", "heading"),
+        Paragraph(
+            f"This portfolio compares <b>{site_count}</b> sites across <b>{len(zones)}</b> climate zones "
+            f"as per {NBC_STANDARD if standard == 'nbc' else ASHRAE_STANDARD}. "
+            f"Weather files (EPW) are available for <b>{epw_count}</b> of them. Passive design strategies "
+            f"follow the site table, once per climate zone.",
+            styles["body"],
+        ),
+        Spacer(1, 0.2*inch),
+    ]
+    rows = [
+        [_cell(zone, 30), str(z["sites"]), str(z["epw"]), _cell(z["section"] or "Not available", 24)]
+        for zone, z in sorted(zones.items())
+    ]
+    table = Table([['Climate Zone', 'Sites', 'With EPW', 'Strategies']] + rows,
+                  colWidths=[2.6*inch, 0.9*inch, 1.0*inch, 2.0*inch], repeatRows=1)
+    table.setStyle(table_style("summary"))
+    story.append(table)
+    return story
+
+
+def compose_portfolio_report(sites, standard="nbc", title="Climate Portfolio", output=None):
+    """One PDF comparing many sites, with one strategy section per distinct zone
+
+    sites is an iterable of dicts with location, region, country, zone,
+    zone_name (ASHRAE), latitude, longitude and epw (bool); it is consumed
+    once, so a generator works. The site table is laid out and appended
+    PORTFOLIO_ROWS_PER_CHUNK rows at a time and the summary page is
+    inserted in front at the end, so ReportLab never holds or re-splits the
+    whole table. Memory still grows with the site count: the PdfWriter
+    keeps every appended page until it writes the file (about 1.7 MB per
+    1,000 sites, see benchmarks/portfolio_report.py). Zone sections come
+    from portfolio_zone_section.
+
+    Writes to output (path or binary file) if given, else returns the bytes.
+    """
+    writer = PdfWriter()
+    zones = {}
+    section_order = []
+    site_count = epw_count = 0
+    rows = []
+    # (title, page) bookmarks, added once the summary is in front
+    outline = []
+
+    def flush(heading):
+        story = [paragraph("Sites", "heading")] if heading else []
+        if heading:
+            outline.append(("Sites", len(writer.pages)))
+        writer.append(PdfReader(io.BytesIO(render_story(story + [portfolio_table(rows, standard)]))))
+        rows.clear()
+
+    for site in sites:
+        site_count += 1
+        epw_count += bool(site.get("epw"))
+        zone = f'{site["zone"]} {site["zone_name"]}' if standard == "ashrae" else site["zone"]
+        if zone not in zones:
+            section = portfolio_section_key(standard, site)
+            zones[zone] = {"sites": 0, "epw": 0, "section": section}
+            if section is not None and section not in section_order:
+                section_order.append(section)
+        zones[zone]["sites"] += 1
+        zones[zone]["epw"] += bool(site.get("epw"))
+        rows.append(_portfolio_row(site_count, site, standard))
+        if len(rows) == PORTFOLIO_ROWS_PER_CHUNK:
+            flush(site_count == PORTFOLIO_ROWS_PER_CHUNK)
+    if rows or not site_count:
+        flush(site_count <= PORTFOLIO_ROWS_PER_CHUNK)
+
+    # Strategy pages, once per distinct zone, in first-seen order
+    for section in section_order:
+        outline.append((section, len(writer.pages)))
+        writer.append(PdfReader(io.BytesIO(portfolio_zone_section(standard, section))))
+
+    summary = render_story(
+        portfolio_summary_story(title, standard, zones, site_count, epw_count)
+        + [PageBreak()] + footer_story(NBC_STANDARD if standard == "nbc" else ASHRAE_STANDARD)
+    )
+    summary = PdfReader(io.BytesIO(summary))
+    last = len(summary.pages) - 1
+    writer.merge(0, summary, pages=(0, last))
+    writer.add_outline_item("Summary", 0)
+    for name, page in outline:
+        writer.add_outline_item(name, page + last)
+    writer.append(summary, pages=(last, last + 1))
+    writer.add_metadata({"/Title": title})
+
+    if output is not None:
+        writer.write(output)
+        return None
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
@@ -0,0 +1,59 @@
+"""Report builds the apps queue on the report job pool, one per report family.
+
+globe.py and main_report.py both offer the NBC/ASHRAE reports, so the
+cache key and the build share one definition here: the same station
+gives the same key, and the same stored PDF, in either app. Each app
+passes in its own cached basemap for the station map.
+"""
+import pandas as pd
+
+from map_snapshot import snapshot_png
+from pdf_reports import compose_ashrae_report, compose_nbc_report, ashrae_report_key, nbc_report_key
+from report_jobs import load_report_cache, load_report_jobs
+
+
+def nbc_report_job(location_name, state_name, climate_zone, dataset_version, latitude, longitude, *, basemap):
+    """Queue (or join) the NBC report build for a location and return its key"""
+    key = nbc_report_key(location_name, state_name, climate_zone, dataset_version, latitude, longitude)
+    cache = load_report_cache()
+
+    def build(job):
+        def write(f):
+            map_png = None
+            if pd.notna(latitude) and pd.notna(longitude):
+                job.update(0.2, "Rendering map")
+                map_png = snapshot_png("nbc", basemap, latitude, longitude, location_name, "report")
+            # Zone strategy pages are pre-rendered; only the cover is laid out per location
+            job.update(0.5, "Laying out report")
+            compose_nbc_report(location_name, state_name, climate_zone, latitude, longitude, map_png, f)
+        # Written straight into the report store and streamed from there
+        return cache.get_or_create_path(key, write)
+
+    load_report_jobs().submit(key, build, location_name)
+    return key
+
+
+def ashrae_report_job(location_name, state_name, country_name, climate_zone, climate_zone_name, dataset_version,
+                      latitude, longitude, epw_available, *, basemap):
+    """Queue (or join) the ASHRAE report build for a station and return its key"""
+    key = ashrae_report_key(
+        location_name, state_name, country_name, climate_zone, climate_zone_name, dataset_version,
+        latitude, longitude, epw_available
+    )
+    cache = load_report_cache()
+
+    def build(job):
+        def write(f):
+            map_png = None
+            if pd.notna(latitude) and pd.notna(longitude):
+                job.update(0.2, "Rendering map")
+                map_png = snapshot_png("ashrae", basemap, latitude, longitude, location_name, "report")
+            job.update(0.5, "Laying out report")
+            compose_ashrae_report(
+                location_name, state_name, country_name, climate_zone, climate_zone_name, latitude, longitude,
+                epw_available, map_png, f
+            )
+        return cache.get_or_create_path(key, write)
+
+    load_report_jobs().submit(key, build, location_name)
+    return key
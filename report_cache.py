@@ -0,0 +1,312 @@
+"""Persistent, content-addressed store for generated PDF reports.
+
+Reports are keyed by a hash of their inputs and template version, so the
+same location, zone and template always map to the same entry. Each report
+is written atomically to its own file; a small SQLite index next to the
+files records sizes and last access times for LRU eviction, plus hit/miss
+counters. SQLite handles the locking, so every Streamlit worker process on
+the host can share one store, and it survives restarts.
+
+Concurrent misses for one key are built once: threads of a process share
+the build through a singleflight group, and other processes wait on a
+lock file next to the report and then read the stored result.
+
+    python report_cache.py stats
+    python report_cache.py clear
+
+Environment:
+    CZF_REPORT_CACHE_DIR        cache directory (default ./cache/reports)
+    CZF_REPORT_CACHE_MAX_BYTES  size bound before eviction (default 512 MB)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from singleflight import flight_group
+
+
+REPORT_CACHE_DIR = os.environ.get(
+    "CZF_REPORT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "reports"),
+)
+REPORT_CACHE_MAX_BYTES = int(os.environ.get("CZF_REPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# A build lock older than this is taken to belong to a process that died
+BUILD_LOCK_TIMEOUT = 120
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS metrics (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def report_key(kind, template_version, **inputs):
+    """Stable hash of a report's kind, template version and inputs"""
+    canonical = json.dumps(
+        {"kind": kind, "template": template_version, "inputs": inputs},
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """Size-bounded LRU store of report bytes, shared by every process on the host"""
+
+    def __init__(self, directory=REPORT_CACHE_DIR, max_bytes=REPORT_CACHE_MAX_BYTES, suffix=".pdf"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            # WAL lets readers in other processes proceed while one writes
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """One transaction on the index, committed on success"""
+        db = sqlite3.connect(os.path.join(self.directory, "index.sqlite"), timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def _count(self, db, name, amount=1):
+        db.execute(
+            "INSERT INTO metrics (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def _record_lookup(self, key, size, count=True):
+        """Count a hit (refreshing the entry's last access) or, with size None, a miss.
+
+        With count False only the index is updated: used when a stored
+        report is read again for delivery rather than looked up for a build.
+        """
+        with self._connect() as db:
+            if size is None:
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                if count:
+                    self._count(db, "misses")
+            else:
+                # Upsert, so a file whose index row was lost is tracked again
+                now = time.time()
+                db.execute(
+                    "INSERT INTO entries (key, size, created, last_access) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET last_access = excluded.last_access",
+                    (key, size, now, now),
+                )
+                if count:
+                    self._count(db, "hits")
+
+    def get(self, key, count=True):
+        """Stored bytes for key, or None; count=False skips the hit/miss metrics"""
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = None
+        self._record_lookup(key, None if data is None else len(data), count)
+        return data
+
+    def get_path(self, key, count=True):
+        """Path of the stored file for key, or None; for streaming it without loading it"""
+        path = self._path(key)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            path = size = None
+        self._record_lookup(key, size, count)
+        return path
+
+    def put(self, key, data):
+        """Store data under key (atomically) and evict down to the size bound"""
+        self.put_file(key, lambda f: f.write(data))
+
+    def put_file(self, key, write):
+        """Store what write(f) writes to a binary file under key; returns the stored path"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                write(f)
+            size = os.path.getsize(tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries (key, size, created, last_access) VALUES (?, ?, ?, ?)",
+                (key, size, now, now),
+            )
+            self._count(db, "bytes_written", size)
+        self.evict(keep=key)
+        return path
+
+    def get_or_create(self, key, build):
+        """Stored bytes for key, calling build() and storing its result on a miss"""
+        data = self.get(key)
+        if data is None:
+            data = self.create(key, build)
+        return data
+
+    def get_or_create_path(self, key, write):
+        """Path of the stored file for key, storing what write(f) writes on a miss.
+
+        Reports are written straight to the store and can be streamed from
+        it, so a stored PDF is never read back into memory.
+        """
+        return self.get_path(key) or self.create_path(key, write)
+
+    def create(self, key, build):
+        """Build and store the bytes of key (see create_path)"""
+        with open(self.create_path(key, lambda f: f.write(build())), "rb") as f:
+            return f.read()
+
+    def create_path(self, key, write):
+        """Store what write(f) writes under key and return its path; concurrent
+        builds of one key, in this process or another, share a single write()
+        call and count as "coalesced"."""
+        path, shared = flight_group("report_cache").do(key, lambda: self._build_once(key, write))
+        if shared:
+            with self._connect() as db:
+                self._count(db, "coalesced")
+        return path
+
+    def _build_once(self, key, write):
+        """Build and store key under a cross-process lock, unless another process does it first"""
+        path = self._path(key)
+        lock = path + ".lock"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Identifies this holder, so a lock taken over as stale is not released by it
+        token = f"{os.getpid()}:{threading.get_ident()}:{os.urandom(8).hex()}".encode()
+        waited = False
+        while True:
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                try:
+                    os.write(fd, token)
+                finally:
+                    os.close(fd)
+                break
+            except FileExistsError:
+                waited = True
+                try:
+                    if time.time() - os.path.getmtime(lock) > BUILD_LOCK_TIMEOUT:
+                        os.remove(lock)
+                except FileNotFoundError:
+                    pass
+                time.sleep(0.05)
+        try:
+            if waited and os.path.exists(path):
+                # Another process built it while this one waited
+                with self._connect() as db:
+                    self._count(db, "coalesced")
+                return path
+            start = time.perf_counter()
+            self.put_file(key, write)
+            with self._connect() as db:
+                self._count(db, "build_ms", int((time.perf_counter() - start) * 1000))
+            return path
+        finally:
+            self._release(lock, token)
+
+    @staticmethod
+    def _release(lock, token):
+        """Remove the build lock only while it is still the one this holder wrote"""
+        try:
+            with open(lock, "rb") as f:
+                if f.read() != token:
+                    return
+            os.remove(lock)
+        except FileNotFoundError:
+            pass
+
+    def evict(self, keep=None):
+        """Remove least recently used entries (except keep) until the store fits in max_bytes"""
+        with self._connect() as db:
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            removed = 0
+            for key, size in db.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    # Still open elsewhere (Windows); retried on the next eviction
+                    continue
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                removed += 1
+            self._count(db, "evictions", removed)
+        return removed
+
+    def clear(self):
+        """Remove every entry; metrics are kept"""
+        with self._connect() as db:
+            for (key,) in db.execute("SELECT key FROM entries").fetchall():
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+            db.execute("DELETE FROM entries")
+
+    def stats(self):
+        """Entry count, stored bytes and the hit/miss/eviction counters"""
+        with self._connect() as db:
+            entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            metrics = dict(db.execute("SELECT name, value FROM metrics").fetchall())
+        lookups = metrics.get("hits", 0) + metrics.get("misses", 0)
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": metrics.get("hits", 0),
+            "misses": metrics.get("misses", 0),
+            "hit_rate": metrics.get("hits", 0) / lookups if lookups else 0.0,
+            "evictions": metrics.get("evictions", 0),
+            "bytes_written": metrics.get("bytes_written", 0),
+            "build_ms": metrics.get("build_ms", 0),
+            "coalesced": metrics.get("coalesced", 0),
+        }
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    cache = ReportCache()
+    if command == "stats":
+        for name, value in cache.stats().items():
+            print(f"{name}: {value:.1%}" if name == "hit_rate" else f"{name}: {value:,}")
+    elif command == "clear":
+        cache.clear()
+        print(f"cleared {cache.directory}")
+    else:
+        sys.exit(f"usage: python {sys.argv[0]} [stats | clear]")
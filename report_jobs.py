@@ -0,0 +1,193 @@
+"""Background queue for PDF report builds.
+
+The apps submit a report build here instead of running ReportLab on the
+Streamlit script thread, then poll the returned job for its progress and
+result. Jobs are keyed by the report cache key, so identical requests --
+a double click, or two sessions asking for the same station -- join the
+job already queued or running rather than building the report twice.
+Finished jobs are kept for a while so every waiting session can collect
+the result (the report's path in the report cache), but a new submission
+always starts a new job: the report may have been evicted since, and a
+build of a report still in the cache returns it straight away. report_job_panel()
+shows a session's job on the page, shared by the map and report apps.
+
+Environment:
+    CZF_REPORT_WORKERS  concurrent report builds per process (default 2)
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from assets import asset_server_reachable
+from asset_server import report_url
+from report_cache import ReportCache
+
+
+REPORT_WORKERS = int(os.environ.get("CZF_REPORT_WORKERS", "2"))
+
+# Seconds a finished job stays available to waiting sessions
+JOB_TTL_SECONDS = 600
+
+
+class ReportJob:
+    """State of one report build, updated by a worker and read by the UI.
+
+    A pool thread writes the state while script threads read it, so every
+    change goes through the methods below under the job's lock.
+    """
+
+    def __init__(self, key, label=""):
+        self._lock = threading.Lock()
+        self.key = key
+        self.label = label
+        self.status = "queued"
+        self.progress = 0.0
+        self.stage = "Waiting for a worker"
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+
+    @property
+    def done(self):
+        with self._lock:
+            return self.status in ("done", "failed")
+
+    def snapshot(self):
+        """(status, progress, stage, result, error) read together"""
+        with self._lock:
+            return self.status, self.progress, self.stage, self.result, self.error
+
+    def update(self, progress, stage):
+        """Report build progress (0-1) and the current stage, called from the build"""
+        with self._lock:
+            self.progress = progress
+            self.stage = stage
+
+    def start(self):
+        with self._lock:
+            self.status = "running"
+            self.progress = 0.05
+            self.stage = "Starting"
+
+    def finish(self, result=None, error=None):
+        """Mark the job done with its result, or failed with error"""
+        with self._lock:
+            if error is None:
+                self.result = result
+                self.progress = 1.0
+                self.stage = "Ready"
+                self.status = "done"
+            else:
+                self.error = error
+                self.status = "failed"
+            self.finished = time.time()
+
+
+class ReportJobs:
+    """Thread pool running report builds, coalescing identical requests by key"""
+
+    def __init__(self, workers=REPORT_WORKERS, ttl=JOB_TTL_SECONDS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.ttl = ttl
+        self.coalesced = 0
+
+    def submit(self, key, build, label=""):
+        """Job building the report for key with build(job); joins a live job for the same key"""
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(key)
+            if job is not None and not job.done:
+                self.coalesced += 1
+                return job
+            job = self._jobs[key] = ReportJob(key, label)
+        self._pool.submit(self._run, job, build)
+        return job
+
+    def _run(self, job, build):
+        job.start()
+        try:
+            result = build(job)
+        except Exception as exc:
+            job.finish(error=f"{type(exc).__name__}: {exc}")
+        else:
+            job.finish(result)
+
+    def get(self, key):
+        """Job for key, or None when none was submitted or it has expired"""
+        with self._lock:
+            return self._jobs.get(key)
+
+    def _prune(self):
+        now = time.time()
+        expired = [key for key, job in self._jobs.items() if job.finished and now - job.finished > self.ttl]
+        for key in expired:
+            del self._jobs[key]
+
+    def stats(self):
+        """Job counts by status, plus how many submissions joined an existing job"""
+        with self._lock:
+            counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+            for job in self._jobs.values():
+                counts[job.snapshot()[0]] += 1
+        counts["coalesced"] = self.coalesced
+        return counts
+
+
+# Reports persist on disk across restarts and are shared by all worker processes
+@st.cache_resource
+def load_report_cache():
+    return ReportCache()
+
+
+# Report builds run on a background pool; the script thread only polls them
+@st.cache_resource
+def load_report_jobs():
+    return ReportJobs()
+
+
+def report_job_panel(key, file_name, label="Download Report", width=200, message=None):
+    """Progress of the session's report job for key, then its download button"""
+    if st.session_state.get("report_job") != key:
+        return
+    job = load_report_jobs().get(key)
+    if job is None:
+        return
+    # The fragment reads the same job object, so compare against its state now
+    was_done = job.done
+
+    # Poll only while the job is in progress; a full rerun stops the polling
+    @st.fragment(run_every=None if was_done else 0.5)
+    def panel():
+        current = load_report_jobs().get(key)
+        if current is None:
+            return
+        status, progress, stage, _, error = current.snapshot()
+        if status == "failed":
+            st.error(f"Report generation failed: {error}")
+        elif status != "done":
+            st.progress(progress, text=stage, width=width)
+        elif asset_server_reachable():
+            # Streamed from the report store by the asset server, not through the session
+            st.link_button(label, report_url(key, file_name), type="primary", width=width)
+            if message:
+                st.success(message)
+        elif load_report_cache().get_path(key, count=False) is None:
+            st.warning("The report has expired from the cache. Please generate it again.")
+        else:
+            # No public asset server: read from the store only when the button is clicked
+            st.download_button(
+                label, lambda: load_report_cache().get(key, count=False), file_name, "application/pdf",
+                type="primary", width=width
+            )
+            if message:
+                st.success(message)
+        if status in ("done", "failed") and not was_done:
+            st.rerun()
+
+    panel()
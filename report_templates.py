@@ -0,0 +1,165 @@
+"""Compiled ReportLab styles, table styles and static paragraphs for the reports.
+
+Every report family (NBC, ASHRAE 169, ECBC) draws from the same registry:
+paragraph and table styles are built once per process per theme, and
+paragraphs whose text does not depend on the location -- headings, zone
+designations, strategy descriptions, the footer -- are parsed once and
+handed out as copies. A copy shares the parsed text and the line breaks
+already computed for a frame width, and keeps its own layout state, so
+concurrent report builds can use the same template.
+
+    python -m benchmarks.report_templates
+"""
+import copy
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import Paragraph, TableStyle
+
+
+# Colors per report family; NBC and ASHRAE share the default look
+THEMES = {
+    "default": {"title": colors.black, "header": colors.whitesmoke, "header_text": colors.black, "box": True},
+    "ecbc": {
+        "title": colors.HexColor('#02a0c5'), "header": colors.HexColor('#02a0c5'),
+        "header_text": colors.whitesmoke, "box": False,
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def report_styles(theme="default"):
+    """Paragraph styles shared by every section of the reports"""
+    styles = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=28,
+            textColor=THEMES[theme]["title"],
+            spaceAfter=12,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        "heading": ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=18,
+            textColor=colors.HexColor('#1f1f1f'),
+            spaceAfter=10,
+            spaceBefore=10,
+            fontName='Helvetica-Bold'
+        ),
+        "section_heading": ParagraphStyle(
+            'SectionHeading',
+            parent=styles['Heading3'],
+            fontSize=14,
+            textColor=colors.HexColor('#333333'),
+            spaceAfter=8,
+            spaceBefore=8,
+            fontName='Helvetica-Bold'
+        ),
+        "body": ParagraphStyle(
+            'CustomBody',
+            parent=styles['BodyText'],
+            fontSize=11,
+            alignment=TA_JUSTIFY,
+            spaceAfter=8,
+            leading=14
+        ),
+    }
+
+
+def _location_table_style(theme):
+    commands = [
+        ('BACKGROUND', (0, 0), (-1, 0), theme["header"]),
+        ('TEXTCOLOR', (0, 0), (-1, 0), theme["header_text"]),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')]),
+    ]
+    if theme["box"]:
+        commands.append(('BOX', (0, 0), (-1, -1), 2, colors.grey))
+    return commands
+
+
+def _portfolio_table_style(theme):
+    return [
+        ('BACKGROUND', (0, 0), (-1, 0), theme["header"]),
+        ('TEXTCOLOR', (0, 0), (-1, 0), theme["header_text"]),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (5, 1), (6, -1), 'RIGHT'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')]),
+    ]
+
+
+def _summary_table_style(theme):
+    return [
+        ('BACKGROUND', (0, 0), (-1, 0), theme["header"]),
+        ('TEXTCOLOR', (0, 0), (-1, 0), theme["header_text"]),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')]),
+    ]
+
+
+TABLE_STYLES = {
+    "location": _location_table_style,
+    "portfolio": _portfolio_table_style,
+    "summary": _summary_table_style,
+}
+
+
+@lru_cache(maxsize=None)
+def table_style(name, theme="default"):
+    """Compiled TableStyle of a registered table; Table.setStyle only reads it"""
+    return TableStyle(TABLE_STYLES[name](THEMES[theme]))
+
+
+class StaticParagraph(Paragraph):
+    """Paragraph whose line breaks are computed once per frame width and shared by its copies"""
+
+    # Paragraph.split() builds each half with self.__class__(None, style, bulletText=..., frags=...)
+    def __init__(self, text, style=None, *args, **kwargs):
+        super().__init__(text, style, *args, **kwargs)
+        self._layouts = {}
+
+    def wrap(self, availWidth, availHeight):
+        layout = self._layouts.get(availWidth)
+        if layout is None:
+            before = dict(self.__dict__)
+            size = super().wrap(availWidth, availHeight)
+            state = {k: v for k, v in self.__dict__.items() if k not in before or before[k] is not v}
+            layout = self._layouts[availWidth] = (size, state)
+        size, state = layout
+        self.__dict__.update(state)
+        return size
+
+
+@lru_cache(maxsize=2048)
+def _static_paragraph(text, style_name, theme):
+    return StaticParagraph(text, report_styles(theme)[style_name])
+
+
+def paragraph(text, style_name="body", theme="default"):
+    """Paragraph of text parsed (and laid out) once per process; each call gets its own copy"""
+    return copy.copy(_static_paragraph(text, style_name, theme))
+
+
+def clear_templates():
+    """Drop every compiled style and paragraph (the benchmark's cold start)"""
+    report_styles.cache_clear()
+    table_style.cache_clear()
+    _static_paragraph.cache_clear()
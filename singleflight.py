@@ -0,0 +1,103 @@
+"""Duplicate suppression for concurrent identical computations (singleflight).
+
+When several threads ask a group for the same key at once -- a class of
+sessions all opening Delhi, say -- the first one runs the computation and
+the others wait for its result instead of repeating it. Nothing is kept
+once the call returns; caching stays with the callers. Every named group
+counts its calls, executions and shared results, and flight_stats()
+returns those counters for the whole process.
+"""
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.finished = threading.Event()
+        self.value = None
+        self.error = None
+        self.abandoned = False
+
+
+class SingleFlight:
+    """Runs one computation per key at a time; concurrent callers share its result"""
+
+    def __init__(self, name=""):
+        self.name = name
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.calls = 0
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key, fn):
+        """(fn() result, shared) for key; shared is True when another caller computed it.
+
+        An exception raised by fn is re-raised in every waiting caller.
+        """
+        while True:
+            with self._lock:
+                self.calls += 1
+                call = self._inflight.get(key)
+                leader = call is None
+                if leader:
+                    call = self._inflight[key] = _Call()
+                    self.executions += 1
+                else:
+                    self.shared += 1
+            if leader:
+                return self._lead(key, call, fn), False
+            call.finished.wait()
+            if call.abandoned:
+                # The leader was interrupted (e.g. a Streamlit rerun): try again
+                with self._lock:
+                    self.calls -= 1
+                    self.shared -= 1
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+    def _lead(self, key, call, fn):
+        try:
+            call.value = fn()
+            return call.value
+        except Exception as exc:
+            call.error = exc
+            raise
+        except BaseException:
+            call.abandoned = True
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.finished.set()
+
+    def stats(self):
+        """Calls, executions and duplicate calls that shared another's result"""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "shared": self.shared,
+                "in_flight": len(self._inflight),
+            }
+
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def flight_group(name):
+    """Process-wide SingleFlight registered under name"""
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = _groups[name] = SingleFlight(name)
+        return group
+
+
+def flight_stats():
+    """Counters of every registered group, by name"""
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.stats() for group in groups}
@@ -0,0 +1,232 @@
+"""Compact columnar binary encoding of station datasets for the map components.
+
+Layout (little-endian, every section padded to a 4-byte boundary so the
+browser can view it through typed arrays without copying):
+
+    magic      4 bytes   b"CZS1"
+    count      uint32    number of stations
+    scale      uint32    coordinate quantization factor
+    lat        int32[count]   round(latitude * scale)
+    lon        int32[count]   round(longitude * scale)
+    zone       uint16[count]  index into meta["zones"]
+    group      uint16[count]  index into meta["groups"] (country or state)
+    offsets    uint32[count + 1]  byte offsets into the title blob
+    titles     utf-8 blob of all station names
+    meta_len   uint32
+    meta       utf-8 JSON with the shared zone legend and group tables
+"""
+import json
+import struct
+
+import pandas as pd
+
+
+CODEC_MAGIC = b"CZS1"
+
+# 1e-5 degree is roughly one metre, far below the precision of the source data
+COORD_SCALE = 100000
+
+
+def _pad4(buf):
+    buf.extend(b"\x00" * (-len(buf) % 4))
+
+
+def _index_table(values):
+    """Return (table, indices) where table holds each distinct value once"""
+    table = []
+    lookup = {}
+    indices = []
+    for value in values:
+        if value not in lookup:
+            lookup[value] = len(table)
+            table.append(value)
+        indices.append(lookup[value])
+    return table, indices
+
+
+def encode_stations(df, group_column, zone_list, zone_color_map, zone_name_map=None, default_color="#444444"):
+    """Encode the station rows of df into the compact binary wire format"""
+    df_valid = df.dropna(subset=["Latitude", "Longitude"])
+
+    zone_index = {z: i for i, z in enumerate(zone_list)}
+    zones = [
+        {
+            "zone": z,
+            "name": (zone_name_map or {}).get(z, ""),
+            "color": zone_color_map.get(z, default_color),
+        }
+        for z in zone_list
+    ]
+
+    groups, group_idx = _index_table(df_valid[group_column].astype(str).tolist())
+    titles = [str(t).encode("utf-8") for t in df_valid["Location"].tolist()]
+    count = len(titles)
+
+    buf = bytearray()
+    buf += CODEC_MAGIC
+    buf += struct.pack("<II", count, COORD_SCALE)
+    buf += struct.pack(f"<{count}i", *[round(float(v) * COORD_SCALE) for v in df_valid["Latitude"]])
+    buf += struct.pack(f"<{count}i", *[round(float(v) * COORD_SCALE) for v in df_valid["Longitude"]])
+    buf += struct.pack(f"<{count}H", *[zone_index[z] for z in df_valid["Climate Zone"]])
+    buf += struct.pack(f"<{count}H", *group_idx)
+    _pad4(buf)
+
+    offsets = [0]
+    for t in titles:
+        offsets.append(offsets[-1] + len(t))
+    buf += struct.pack(f"<{count + 1}I", *offsets)
+    buf += b"".join(titles)
+    _pad4(buf)
+
+    meta = json.dumps({"zones": zones, "groups": groups}, separators=(",", ":")).encode("utf-8")
+    buf += struct.pack("<I", len(meta))
+    buf += meta
+    return bytes(buf)
+
+
+def decode_stations(data):
+    """Decode the binary wire format back into a DataFrame (used by benchmarks and checks)"""
+    if data[:4] != CODEC_MAGIC:
+        raise ValueError("Not a station payload")
+    count, scale = struct.unpack_from("<II", data, 4)
+    pos = 12
+    lat = struct.unpack_from(f"<{count}i", data, pos); pos += 4 * count
+    lon = struct.unpack_from(f"<{count}i", data, pos); pos += 4 * count
+    zone = struct.unpack_from(f"<{count}H", data, pos); pos += 2 * count
+    group = struct.unpack_from(f"<{count}H", data, pos); pos += 2 * count
+    pos += -pos % 4
+    offsets = struct.unpack_from(f"<{count + 1}I", data, pos); pos += 4 * (count + 1)
+    blob = data[pos:pos + offsets[-1]]
+    pos += offsets[-1]
+    pos += -pos % 4
+    (meta_len,) = struct.unpack_from("<I", data, pos)
+    meta = json.loads(data[pos + 4:pos + 4 + meta_len].decode("utf-8"))
+
+    return pd.DataFrame({
+        "Latitude": [v / scale for v in lat],
+        "Longitude": [v / scale for v in lon],
+        "Location": [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(count)],
+        "Group": [meta["groups"][g] for g in group],
+        "Climate Zone": [meta["zones"][z]["zone"] for z in zone],
+    })
+
+
+# Browser-side decoder. decodeStations() returns typed arrays over the payload
+# buffer; stationRecords() expands them into the objects amCharts series expect.
+STATION_DECODER_JS = """
+function base64ToBuffer(b64) {
+    var bin = atob(b64);
+    var bytes = new Uint8Array(bin.length);
+    for (var i = 0; i < bin.length; i++) { bytes[i] = bin.charCodeAt(i); }
+    return bytes.buffer;
+}
+
+function decodeStations(buffer) {
+    var view = new DataView(buffer);
+    var count = view.getUint32(4, true);
+    var scale = view.getUint32(8, true);
+    var pos = 12;
+    var lat = new Int32Array(buffer, pos, count); pos += 4 * count;
+    var lon = new Int32Array(buffer, pos, count); pos += 4 * count;
+    var zone = new Uint16Array(buffer, pos, count); pos += 2 * count;
+    var group = new Uint16Array(buffer, pos, count); pos += 2 * count;
+    pos += (4 - pos % 4) % 4;
+    var offsets = new Uint32Array(buffer, pos, count + 1); pos += 4 * (count + 1);
+    var blob = new Uint8Array(buffer, pos, offsets[count]); pos += offsets[count];
+    pos += (4 - pos % 4) % 4;
+    var metaLen = view.getUint32(pos, true);
+    var decoder = new TextDecoder("utf-8");
+    var meta = JSON.parse(decoder.decode(new Uint8Array(buffer, pos + 4, metaLen)));
+    return {
+        count: count, scale: scale, lat: lat, lon: lon, zone: zone, group: group,
+        zones: meta.zones, groups: meta.groups,
+        title: function(i) { return decoder.decode(blob.subarray(offsets[i], offsets[i + 1])); }
+    };
+}
+
+// Station payloads persisted in IndexedDB across visits, one record per key.
+// The page embeds the current version, so an unchanged dataset costs no request.
+var PAYLOAD_DB = "czf-payloads";
+
+function openPayloadStore() {
+    return new Promise(function(resolve, reject) {
+        var request = indexedDB.open(PAYLOAD_DB, 1);
+        request.onupgradeneeded = function() { request.result.createObjectStore("payloads"); };
+        request.onsuccess = function() { resolve(request.result); };
+        request.onerror = function() { reject(request.error); };
+    });
+}
+
+function fetchPayload(url) {
+    return fetch(url).then(function(resp) {
+        if (!resp.ok) { throw new Error("payload " + url + ": HTTP " + resp.status); }
+        return resp.arrayBuffer();
+    });
+}
+
+function loadPayload(key, version, url) {
+    if (!window.indexedDB) { return fetchPayload(url); }
+    return openPayloadStore().then(function(db) {
+        return new Promise(function(resolve) {
+            var get = db.transaction("payloads").objectStore("payloads").get(key);
+            get.onsuccess = function() { resolve(get.result); };
+            get.onerror = function() { resolve(null); };
+        }).then(function(cached) {
+            if (cached && cached.version === version) { return cached.buffer; }
+            return fetchPayload(url).then(function(buffer) {
+                // Replaces the previous version of the same key
+                db.transaction("payloads", "readwrite").objectStore("payloads")
+                    .put({ version: version, buffer: buffer }, key);
+                return buffer;
+            });
+        });
+    }).catch(function() {
+        // Storage blocked (private mode, sandboxed frame): plain HTTP fetch
+        return fetchPayload(url);
+    });
+}
+
+function stationRecords(stations, groupKey) {
+    var records = new Array(stations.count);
+    for (var i = 0; i < stations.count; i++) {
+        var z = stations.zones[stations.zone[i]];
+        var rec = {
+            lat: stations.lat[i] / stations.scale,
+            lon: stations.lon[i] / stations.scale,
+            title: stations.title(i),
+            zone: z.zone,
+            zone_name: z.name,
+            color: z.color
+        };
+        rec[groupKey] = stations.groups[stations.group[i]];
+        records[i] = rec;
+    }
+    return records;
+}
+"""
+
+
+# Inlined in each map page ahead of the helper script, so a payload or a helper
+# script that fails to load is reported on the map instead of leaving it empty.
+STATION_LOADER_JS = """
+function loadStations(key, version, url) {
+    if (typeof loadPayload !== "function") {
+        return Promise.reject(new Error("the map scripts did not load"));
+    }
+    return loadPayload(key, version, url).then(function(buffer) {
+        return decodeStations(buffer);
+    });
+}
+
+function showStationError(err) {
+    var chartdiv = document.getElementById("chartdiv");
+    var box = document.getElementById("station-error") || document.createElement("div");
+    box.id = "station-error";
+    box.style.cssText = "position:absolute;left:12px;right:12px;top:12px;z-index:10;padding:8px 12px;" +
+        "background:#fff3f3;color:#b00020;border:1px solid #f5c2c7;border-radius:4px;font:13px sans-serif;";
+    box.textContent = "Stations could not be loaded (" + ((err && err.message) || err) +
+        "). Reload the page to try again.";
+    chartdiv.style.position = "relative";
+    chartdiv.appendChild(box);
+}
+"""
@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+import html_report
+from html_report import NBC_DATASET, html_report_url, nbc_stations, parse_nbc_report_query
+
+
+@pytest.fixture
+def reachable(monkeypatch):
+    monkeypatch.setattr(html_report, "asset_server_reachable", lambda: True)
+
+
+def nbc_rows():
+    return pd.read_excel(NBC_DATASET)
+
+
+def test_no_report_link_for_a_station_without_coordinates(reachable):
+    missing = nbc_rows()
+    missing = missing[missing["Latitude"].isna() | missing["Longitude"].isna()]
+    assert not missing.empty
+    for state, location in zip(missing["State"], missing["Location"]):
+        assert html_report_url(location, state) is None
+        with pytest.raises(LookupError):
+            parse_nbc_report_query(html_report.nbc_report_query(location, state))
+
+
+def test_report_link_resolves_to_the_dataset_station(reachable):
+    (state, location), (zone, lat, lon) = next(iter(nbc_stations().items()))
+    url = html_report_url(location, state)
+    assert url is not None
+    assert parse_nbc_report_query(url.split("?", 1)[1]) == (location, state, zone, lat, lon)
+
+
+def test_no_report_link_without_an_asset_server(monkeypatch):
+    monkeypatch.setattr(html_report, "asset_server_reachable", lambda: False)
+    state, location = next(iter(nbc_stations()))
+    assert html_report_url(location, state) is None
@@ -0,0 +1,53 @@
+import time
+
+from report_cache import ReportCache
+from report_jobs import ReportJobs
+
+
+def wait(job, timeout=10):
+    deadline = time.time() + timeout
+    while not job.done:
+        assert time.time() < deadline, "report job did not finish"
+        time.sleep(0.01)
+    return job
+
+
+def test_resubmit_after_eviction_rebuilds(tmp_path):
+    cache = ReportCache(str(tmp_path))
+    jobs = ReportJobs(workers=1)
+    key = "a" * 64
+    builds = []
+
+    def build(job):
+        def write(f):
+            builds.append(key)
+            f.write(b"%PDF-1.4")
+        return cache.get_or_create_path(key, write)
+
+    first = wait(jobs.submit(key, build))
+    assert first.status == "done" and cache.get_path(key, count=False) == first.result
+
+    cache.clear()
+    assert cache.get_path(key, count=False) is None
+
+    second = wait(jobs.submit(key, build))
+    assert second is not first
+    assert second.status == "done"
+    assert cache.get_path(key, count=False) == second.result
+    assert len(builds) == 2
+
+
+def test_submit_joins_a_running_job(tmp_path):
+    jobs = ReportJobs(workers=1)
+    started = []
+
+    def build(job):
+        started.append(job)
+        time.sleep(0.2)
+        return "path"
+
+    first = jobs.submit("k", build)
+    second = jobs.submit("k", build)
+    assert second is first
+    wait(first)
+    assert len(started) == 1 and jobs.coalesced == 1
@@ -0,0 +1,37 @@
+import io
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Spacer
+
+from report_templates import paragraph, _static_paragraph
+
+LONG_TEXT = " ".join(f"Passive design strategy sentence number {i} for the split test." for i in range(60))
+
+
+def build(story):
+    out = io.BytesIO()
+    doc = SimpleDocTemplate(out, pagesize=letter)
+    doc.build(story)
+    return doc.page
+
+
+def test_registry_paragraph_splits_across_a_frame():
+    # Spacers that leave a few lines of the first frame, so the paragraph breaks across the page
+    for spacer in (7.5, 8.0, 8.3, 8.6):
+        pages = build([Spacer(1, spacer * inch), paragraph(LONG_TEXT)])
+        assert pages >= 2
+
+
+def test_split_leaves_the_registry_copy_reusable():
+    build([Spacer(1, 8.5 * inch), paragraph(LONG_TEXT)])
+    build([paragraph(LONG_TEXT)])
+    assert _static_paragraph.cache_info().hits >= 1
+
+
+def test_timestamped_footer_is_not_registered():
+    from pdf_reports import footer_story
+
+    before = _static_paragraph.cache_info().currsize
+    footer_story("NBC")
+    assert _static_paragraph.cache_info().currsize == before
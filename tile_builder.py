@@ -0,0 +1,265 @@
+"""Offline z/x/y raster tile pyramid of the climate zone station maps.
+
+Renders the ASHRAE and NBC station sets into Web Mercator tiles with
+matplotlib, in parallel across cores. Each tile's inputs are hashed and
+recorded in a per-dataset manifest, so a rebuild after a dataset change
+only re-renders the tiles whose stations actually changed.
+
+    python tile_builder.py                      # both datasets, default zooms
+    python tile_builder.py nbc --max-zoom 9 --format webp
+    python tile_builder.py all --force          # ignore the manifest
+
+Tiles are transparent overlays written under static/build/tiles/<dataset>
+and served by asset_server.py; tiles without stations are not written, and
+tiles a rebuild no longer lists (including those of a previous format) are
+removed. The manifest is replaced atomically, and its mtime is the version
+callers key cached mosaics on (tile_manifest_version). tile_mosaic()
+stitches the tiles into a single image for low-bandwidth views and reports.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from assets import BUILD_DIR
+
+
+TILE_SIZE = 256
+TILES_DIR = os.path.join(BUILD_DIR, "tiles")
+MAX_MERCATOR_LAT = 85.05112878
+
+# Bump when the rendering changes so every tile is regenerated
+STYLE_VERSION = 1
+
+DATASETS = {
+    "ashrae": {"path": "ASHRAE-ClimateZoneMapping.xlsx", "standard": "ASHRAE", "zooms": (0, 6)},
+    "nbc": {"path": "INDIA-WeatherMapping.xlsx", "standard": "NBC", "zooms": (3, 8)},
+}
+
+
+def marker_radius(zoom):
+    """Station marker radius in pixels at a zoom level"""
+    return 1.5 + 0.6 * zoom
+
+
+def lonlat_to_pixel(lon, lat, zoom):
+    """Global Web Mercator pixel coordinates at a zoom level"""
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    scale = TILE_SIZE * (2 ** zoom)
+    x = (lon + 180.0) / 360.0 * scale
+    sin_lat = math.sin(math.radians(lat))
+    y = (0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * scale
+    return x, y
+
+
+def load_stations(dataset):
+    """[(lon, lat, color), ...] for a dataset, using its zone catalog colors"""
+    import pandas as pd
+    from zone_catalog import normalize_zones, build_ashrae_catalog, build_nbc_catalog
+
+    spec = DATASETS[dataset]
+    df = normalize_zones(pd.read_excel(spec["path"])).dropna(subset=["Latitude", "Longitude"])
+    build = build_ashrae_catalog if spec["standard"] == "ASHRAE" else build_nbc_catalog
+    catalog = build(df)
+    return [
+        (float(lon), float(lat), catalog.color(zone))
+        for lon, lat, zone in zip(df["Longitude"], df["Latitude"], df["Climate Zone"])
+    ]
+
+
+def plan_tiles(stations, min_zoom, max_zoom):
+    """{(z, x, y): [(px, py, color), ...]} with positions relative to each tile"""
+    tiles = {}
+    for z in range(min_zoom, max_zoom + 1):
+        r = marker_radius(z)
+        limit = 2 ** z
+        for lon, lat, color in stations:
+            px, py = lonlat_to_pixel(lon, lat, z)
+            for tx in range(int((px - r) // TILE_SIZE), int((px + r) // TILE_SIZE) + 1):
+                for ty in range(int((py - r) // TILE_SIZE), int((py + r) // TILE_SIZE) + 1):
+                    if 0 <= tx < limit and 0 <= ty < limit:
+                        tiles.setdefault((z, tx, ty), []).append(
+                            (px - tx * TILE_SIZE, py - ty * TILE_SIZE, color)
+                        )
+    return tiles
+
+
+def tile_hash(zoom, points, fmt):
+    """Hash of everything that determines a tile's pixels"""
+    digest = hashlib.sha256(f"{STYLE_VERSION}|{fmt}|{marker_radius(zoom)}".encode())
+    for px, py, color in sorted(points):
+        digest.update(f"|{px:.2f},{py:.2f},{color}".encode())
+    return digest.hexdigest()[:16]
+
+
+_figure = None
+
+
+def _render_tile(job):
+    """Render one tile in a worker process; the figure is reused between tiles"""
+    global _figure
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    path, zoom, points, fmt = job
+    if _figure is None:
+        _figure = plt.figure(figsize=(1, 1), dpi=TILE_SIZE)
+        _figure.add_axes([0, 0, 1, 1])
+    ax = _figure.axes[0]
+    ax.clear()
+    ax.set_axis_off()
+    ax.set_xlim(0, TILE_SIZE)
+    ax.set_ylim(TILE_SIZE, 0)
+
+    r = marker_radius(zoom)
+    # scatter sizes are in points^2; one tile pixel is 72/TILE_SIZE points
+    size = (2 * r * 72 / TILE_SIZE) ** 2
+    ax.scatter(
+        [p[0] for p in points], [p[1] for p in points], s=size, c=[p[2] for p in points],
+        edgecolors="white", linewidths=1.2 * 72 / TILE_SIZE,
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    _figure.savefig(tmp, dpi=TILE_SIZE, transparent=True, format=fmt)
+    os.replace(tmp, path)
+    return path
+
+
+def build_tiles(dataset, min_zoom=None, max_zoom=None, fmt="png", workers=None, force=False):
+    """Build or incrementally update the tile pyramid of a dataset; returns stats"""
+    spec = DATASETS[dataset]
+    min_zoom = spec["zooms"][0] if min_zoom is None else min_zoom
+    max_zoom = spec["zooms"][1] if max_zoom is None else max_zoom
+    out_dir = os.path.join(TILES_DIR, dataset)
+    manifest_path = os.path.join(out_dir, "manifest.json")
+
+    previous = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous.get("format") != fmt:
+            previous = {}
+    old_tiles = previous.get("tiles", {})
+
+    start = time.perf_counter()
+    planned = plan_tiles(load_stations(dataset), min_zoom, max_zoom)
+    hashes = {}
+    jobs = []
+    for (z, x, y), points in planned.items():
+        key = f"{z}/{x}/{y}"
+        hashes[key] = tile_hash(z, points, fmt)
+        path = os.path.join(out_dir, str(z), str(x), f"{y}.{fmt}")
+        if old_tiles.get(key) != hashes[key] or not os.path.exists(path):
+            jobs.append((path, z, points, fmt))
+
+    if jobs:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_render_tile, jobs, chunksize=max(1, len(jobs) // (8 * workers))))
+
+    os.makedirs(out_dir, exist_ok=True)
+    tmp = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "format": fmt,
+            "min_zoom": min_zoom,
+            "max_zoom": max_zoom,
+            "tile_size": TILE_SIZE,
+            "tiles": hashes,
+        }, f)
+    os.replace(tmp, manifest_path)
+
+    # Tiles whose stations all disappeared, outside the zoom range or in another format
+    removed = prune_tiles(out_dir, {f"{key}.{fmt}" for key in hashes})
+
+    return {
+        "dataset": dataset,
+        "tiles": len(hashes),
+        "rendered": len(jobs),
+        "removed": removed,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def prune_tiles(out_dir, keep):
+    """Remove tile files under out_dir whose z/x/y.ext path is not in keep; returns the count"""
+    removed = 0
+    for dirpath, dirnames, filenames in os.walk(out_dir, topdown=False):
+        for name in filenames:
+            rel = os.path.relpath(os.path.join(dirpath, name), out_dir).replace(os.sep, "/")
+            if rel.endswith((".png", ".webp", ".tmp")) and rel not in keep:
+                os.remove(os.path.join(dirpath, name))
+                removed += 1
+        if dirpath != out_dir and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return removed
+
+
+def tile_manifest_version(dataset):
+    """mtime of the dataset's tile manifest, or None when no tiles were built"""
+    try:
+        return os.stat(os.path.join(TILES_DIR, dataset, "manifest.json")).st_mtime_ns
+    except OSError:
+        return None
+
+
+def load_tile_manifest(dataset):
+    """The tile manifest of a dataset, or None when no tiles were built"""
+    path = os.path.join(TILES_DIR, dataset, "manifest.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def tile_mosaic(dataset, lat, lon, zoom, width=640, height=420, background="#f5f5dc", marker=True):
+    """Stitch prebuilt tiles around (lat, lon) into one PIL image, or None without tiles"""
+    from PIL import Image, ImageDraw
+
+    manifest = load_tile_manifest(dataset)
+    if manifest is None:
+        return None
+    zoom = max(manifest["min_zoom"], min(manifest["max_zoom"], zoom))
+    fmt = manifest["format"]
+
+    cx, cy = lonlat_to_pixel(lon, lat, zoom)
+    left, top = cx - width / 2, cy - height / 2
+    image = Image.new("RGBA", (width, height), background)
+    limit = 2 ** zoom
+    for tx in range(int(left // TILE_SIZE), int((left + width) // TILE_SIZE) + 1):
+        for ty in range(int(top // TILE_SIZE), int((top + height) // TILE_SIZE) + 1):
+            if not 0 <= ty < limit:
+                continue
+            key = f"{zoom}/{tx % limit}/{ty}"
+            if key not in manifest["tiles"]:
+                continue
+            path = os.path.join(TILES_DIR, dataset, f"{key}.{fmt}")
+            with Image.open(path) as tile:
+                tile = tile.convert("RGBA")
+                image.alpha_composite(tile, (int(tx * TILE_SIZE - left), int(ty * TILE_SIZE - top)))
+
+    if marker:
+        draw = ImageDraw.Draw(image)
+        x, y = width / 2, height / 2
+        draw.ellipse((x - 9, y - 9, x + 9, y + 9), fill="#ff0000", outline="#ffffff", width=2)
+    return image.convert("RGB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the climate zone tile pyramid")
+    parser.add_argument("dataset", nargs="?", default="all", choices=["all"] + list(DATASETS))
+    parser.add_argument("--min-zoom", type=int)
+    parser.add_argument("--max-zoom", type=int)
+    parser.add_argument("--format", default="png", choices=["png", "webp"])
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--force", action="store_true", help="re-render every tile")
+    args = parser.parse_args()
+
+    for name in (DATASETS if args.dataset == "all" else [args.dataset]):
+        stats = build_tiles(name, args.min_zoom, args.max_zoom, args.format, args.workers, args.force)
+        print(f"{stats['dataset']}: {stats['tiles']} tiles, {stats['rendered']} rendered, "
+              f"{stats['removed']} removed in {stats['seconds']:.1f}s")
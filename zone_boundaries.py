@@ -0,0 +1,138 @@
+"""Climate zone regions derived from the stations, at several levels of detail.
+
+Each station's Voronoi cell is clipped to a disc around the station (so
+oceans and empty interiors stay uncovered) and the cells are dissolved per
+zone with shapely. The dissolved regions are then simplified at a range of
+tolerances; the map only fetches the level suited to its current zoom.
+"""
+import json
+
+import numpy as np
+import shapely
+from shapely.geometry import mapping
+
+
+# Radius, in degrees, of the area a single station can claim
+STATION_REACH_DEG = 1.5
+
+# (simplification tolerance in degrees, coordinate decimals, minimum map zoom)
+# ordered from coarsest to finest
+DETAIL_LEVELS = (
+    (0.8, 1, 1),
+    (0.3, 2, 2),
+    (0.1, 2, 4),
+    (0.02, 3, 8),
+)
+
+
+def build_zone_regions(df, catalog):
+    """{zone: dissolved shapely geometry} for the stations of a dataset"""
+    df_valid = df.dropna(subset=["Latitude", "Longitude"]).drop_duplicates(subset=["Latitude", "Longitude"])
+    points = shapely.points(df_valid["Longitude"].to_numpy(), df_valid["Latitude"].to_numpy())
+    cells = shapely.voronoi_polygons(
+        shapely.multipoints(points), extend_to=shapely.box(-180, -90, 180, 90), ordered=True
+    )
+    cells = np.array(cells.geoms)
+    reach = shapely.buffer(points, STATION_REACH_DEG, quad_segs=4)
+    clipped = shapely.intersection(cells, reach)
+
+    zones = df_valid["Climate Zone"].to_numpy()
+    return {z: shapely.union_all(clipped[zones == z]) for z in catalog.zones if (zones == z).any()}
+
+
+def simplify_regions(regions, tolerance, decimals):
+    """Simplified copies of the regions with coordinates rounded for transfer"""
+    return {
+        z: shapely.transform(
+            shapely.simplify(geom, tolerance, preserve_topology=True),
+            lambda coords: np.round(coords, decimals),
+        )
+        for z, geom in regions.items()
+    }
+
+
+def regions_geojson(regions, catalog):
+    """Compact GeoJSON FeatureCollection of zone regions, colored from the catalog"""
+    return json.dumps({
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "id": z,
+                "properties": {"zone": z, "name": catalog.name(z), "color": catalog.color(z)},
+                "geometry": mapping(geom),
+            }
+            for z, geom in regions.items()
+            if not geom.is_empty
+        ],
+    }, separators=(",", ":"))
+
+
+def build_detail_levels(df, catalog):
+    """[(min_zoom, geojson text, vertex count)] for every detail level, coarsest first"""
+    regions = build_zone_regions(df, catalog)
+    levels = []
+    for tolerance, decimals, min_zoom in DETAIL_LEVELS:
+        simplified = simplify_regions(regions, tolerance, decimals)
+        vertices = int(sum(shapely.get_num_coordinates(g) for g in simplified.values()))
+        levels.append((min_zoom, regions_geojson(simplified, catalog), vertices))
+    return levels
+
+
+# Browser-side loader: swaps the zone polygon series to the level for the zoom
+ZONE_OVERLAY_JS = """
+function ZoneOverlay(root, chart, levels) {
+    // Directly above the country polygons, below the station points
+    var series = chart.series.insertIndex(1, am5map.MapPolygonSeries.new(root, {}));
+    series.mapPolygons.template.setAll({
+        templateField: "polygonSettings",
+        strokeOpacity: 0,
+        fillOpacity: 0.35,
+        tooltipText: "Zone {zone}: {name}"
+    });
+    var cache = {};
+    var current = -1;
+
+    function levelFor(zoom) {
+        var level = 0;
+        for (var i = 0; i < levels.length; i++) { if (zoom >= levels[i].minZoom) { level = i; } }
+        return level;
+    }
+
+    function show(level) {
+        if (level === current) { return; }
+        current = level;
+        var apply = function(geo) {
+            if (current !== level) { return; }
+            geo.features.forEach(function(f) {
+                f.properties.polygonSettings = { fill: am5.color(f.properties.color) };
+            });
+            series.set("geoJSON", geo);
+        };
+        if (cache[level]) { apply(cache[level]); return; }
+        fetch(levels[level].url)
+            .then(function(resp) { return resp.json(); })
+            .then(function(geo) { cache[level] = geo; apply(geo); });
+    }
+
+    chart.on("zoomLevel", function(zoom) { show(levelFor(zoom)); });
+    show(levelFor(chart.get("zoomLevel", 1)));
+    this.series = series;
+}
+
+// Average frame time over a window, logged to the console for benchmarking
+function probeFrameTime(root, label, seconds) {
+    var frames = 0, start = performance.now(), last = start, worst = 0;
+    var dispose = root.events.on("frameended", function() {
+        var now = performance.now();
+        worst = Math.max(worst, now - last);
+        last = now;
+        frames++;
+        if (now - start > seconds * 1000) {
+            dispose.dispose();
+            console.log("[frame-probe] " + label + ": " + frames + " frames, avg " +
+                ((now - start) / frames).toFixed(2) + " ms, worst " + worst.toFixed(2) + " ms");
+        }
+    });
+}
+"""
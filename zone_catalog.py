@@ -0,0 +1,109 @@
+"""Immutable climate zone catalog, built once per dataset at load time.
+
+The catalog holds everything the maps, legends and reports need to know
+about the zones of a dataset -- deterministic colors, display names,
+station counts and the pre-rendered legend markup -- so none of it is
+recomputed on a rerun.
+"""
+import hashlib
+import html
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import pandas as pd
+
+
+DEFAULT_ZONE_COLOR = "#444444"
+
+# ASHRAE zones are colored by their position in the sorted zone list
+ASHRAE_PALETTE = (
+    "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+    "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf",
+    "#005f99", "#cc5500", "#009933", "#990000", "#663399",
+    "#00b3b3", "#b30047", "#ff66b2", "#66ff66", "#ffd966"
+)
+
+NBC_ZONE_COLORS = MappingProxyType({
+    "Cold": "#02a0c5",
+    "Composite": "#dec45e",
+    "Hot-Dry": "#c60102",
+    "Temperate": "#f89cc9",
+    "Warm-Humid": "#e59704",
+})
+
+
+@dataclass(frozen=True)
+class ZoneCatalog:
+    """Zones of one dataset with their colors, names, counts and legend markup"""
+    standard: str
+    version: str
+    zones: tuple
+    colors: MappingProxyType
+    names: MappingProxyType
+    counts: MappingProxyType
+    legend_html: str
+
+    def color(self, zone):
+        return self.colors.get(str(zone).strip(), DEFAULT_ZONE_COLOR)
+
+    def name(self, zone):
+        return self.names.get(str(zone).strip(), "")
+
+
+def normalize_zones(df):
+    """Strip the Climate Zone column in place; done once when a dataset is loaded"""
+    df["Climate Zone"] = df["Climate Zone"].astype(str).str.strip()
+    return df
+
+
+def dataset_version(df):
+    """Content hash of a dataset snapshot, used to key caches and published payloads"""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).values
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()[:12]
+
+
+def _legend_html(zones, colors, labels):
+    return "".join(
+        f'<div class="legend-item">'
+        f'<div class="legend-color" style="background:{colors[z]};"></div>'
+        f'<span class="legend-text">{html.escape(labels[z])}</span>'
+        f'</div>'
+        for z in zones
+    )
+
+
+def build_ashrae_catalog(df):
+    """Catalog for the ASHRAE 169 station dataset"""
+    grouped = df.groupby("Climate Zone", sort=True)
+    zones = tuple(grouped.groups.keys())
+    names = grouped["Climate Zone Name"].first().to_dict()
+    counts = grouped.size().to_dict()
+    colors = {z: ASHRAE_PALETTE[i % len(ASHRAE_PALETTE)] for i, z in enumerate(zones)}
+    labels = {z: f"{z} - {names.get(z, '')}" for z in zones}
+    return ZoneCatalog(
+        standard="ASHRAE",
+        version=dataset_version(df),
+        zones=zones,
+        colors=MappingProxyType(colors),
+        names=MappingProxyType(names),
+        counts=MappingProxyType({z: int(n) for z, n in counts.items()}),
+        legend_html=_legend_html(zones, colors, labels),
+    )
+
+
+def build_nbc_catalog(df):
+    """Catalog for the NBC India station dataset"""
+    grouped = df.groupby("Climate Zone", sort=True)
+    zones = tuple(grouped.groups.keys())
+    counts = grouped.size().to_dict()
+    colors = {z: NBC_ZONE_COLORS.get(z, DEFAULT_ZONE_COLOR) for z in zones}
+    names = {z: z for z in zones}
+    return ZoneCatalog(
+        standard="NBC",
+        version=dataset_version(df),
+        zones=zones,
+        colors=MappingProxyType(colors),
+        names=MappingProxyType(names),
+        counts=MappingProxyType({z: int(n) for z, n in counts.items()}),
+        legend_html=_legend_html(zones, colors, names),
+    )